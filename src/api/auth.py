@@ -1,6 +1,7 @@
 import time
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime, timedelta
 import threading
@@ -33,6 +34,13 @@ class KisAuth:
         project_root = Path(__file__).resolve().parents[2]
         self._data_dir = project_root / "data"
         self._data_dir.mkdir(parents=True, exist_ok=True)
+        # KIS REST 공용 세션(order/quote/auth): keep-alive로 호출마다 TCP/TLS 핸드셰이크 반복 방지
+        # - 엔진의 병렬 조회(시세/손절 감시 워커)를 고려해 호스트당 연결 풀을 넉넉히 둔다.
+        # - 재시도는 각 API의 기존 루프(EGW00201/토큰 만료)에 맡긴다(주문 POST 중복 방지).
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
 
     def get_token(self, mode=None):
         """
@@ -106,7 +114,7 @@ class KisAuth:
 
         try:
             log.info("토큰 발급 요청 중...")
-            res = requests.post(url, headers=headers, data=json.dumps(body), timeout=20)
+            res = self.http.post(url, headers=headers, data=json.dumps(body), timeout=20)
             
             if res.status_code == 200:
                 data = res.json()
@@ -1,4 +1,3 @@
-import requests
 import json
 import time
 from datetime import datetime
@@ -224,7 +223,7 @@ class KisOrder:
         # 초당 제한(EGW00201) 대응: 짧게 재시도
         for attempt in range(3):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 3):
@@ -361,7 +360,7 @@ class KisOrder:
         # 초당 제한(EGW00201) 대응: 짧게 재시도
         for attempt in range(3):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 3):
@@ -494,7 +493,7 @@ class KisOrder:
 
         for attempt in range(5):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 5):
@@ -614,7 +613,7 @@ class KisOrder:
         
         for attempt in range(2):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 2):
@@ -735,7 +734,7 @@ class KisOrder:
         for attempt in range(3):
             try:
                 log.info(f"[Order] 주문 요청: {side} {symbol} {quantity}주 @ {price} ({order_type})")
-                res = requests.post(url, headers=headers, data=json.dumps(body), timeout=20)
+                res = kis_auth.http.post(url, headers=headers, data=json.dumps(body), timeout=20)
 
                 if res.status_code == 200:
                     data = res.json()
@@ -868,7 +867,7 @@ class KisOrder:
 
         for attempt in range(2):
             try:
-                res = requests.post(url, headers=headers, data=json.dumps(body), timeout=20)
+                res = kis_auth.http.post(url, headers=headers, data=json.dumps(body), timeout=20)
                 if res.status_code != 200:
                     if res.status_code == 500:
                         try:
@@ -1041,7 +1040,7 @@ class KisOrder:
         # - 엔진에서 "2회 재시도 후 스킵" 정책을 쓰므로, 여기서도 2회까지만 재시도한다.
         for attempt in range(2):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 2):
@@ -1216,7 +1215,7 @@ class KisOrder:
                 # 초당 제한(EGW00201) 발생 시 짧게 재시도
                 data = None
                 for attempt in range(3):
-                    res = requests.get(url, headers=headers, params=params, timeout=20)
+                    res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                     if res.status_code == 500:
                         # 초당 제한은 500으로 내려오는 케이스가 많음
                         try:
@@ -1365,7 +1364,7 @@ class KisOrder:
             }
 
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code != 200:
                     log.error(f"[Order] 기간손익 API 호출 오류: {res.status_code} - {res.text}")
                     return None
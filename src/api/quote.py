@@ -1,4 +1,3 @@
-import requests
 import json
 import time
 from src.config.config_manager import config_manager
@@ -89,7 +88,7 @@ class KisQuote:
         # 초당 제한(EGW00201) 발생 시 짧게 재시도(사용자 경험 개선)
         for attempt in range(3):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 3):
@@ -202,7 +201,7 @@ class KisQuote:
         # 초당 제한(EGW00201) 발생 시 짧게 재시도
         for attempt in range(3):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 3):
@@ -278,7 +277,7 @@ class KisQuote:
         # 초당 제한(EGW00201) 발생 시 짧게 재시도
         for attempt in range(3):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 3):
@@ -390,7 +389,7 @@ class KisQuote:
 
         for attempt in range(3):
             try:
-                res = requests.get(url, headers=headers, params=params, timeout=20)
+                res = kis_auth.http.get(url, headers=headers, params=params, timeout=20)
                 if res.status_code == 200:
                     data = res.json()
                     if _retry_on_expired_token(data, mode, attempt, 3):
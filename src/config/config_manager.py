@@ -2,10 +2,13 @@ import os
 import yaml
 from src.utils.logger import logger
 from pathlib import Path
+from src.utils.fs import replace_file
 
 class ConfigManager:
     _instance = None
     _config = None
+    # 설정이 (재)로드/저장될 때마다 증가 - 설정값 기반 캐시 무효화 기준
+    revision = 0
 
     PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     CONFIG_FILE = os.path.join(PROJECT_ROOT, 'config', 'settings.yaml')
@@ -157,6 +160,7 @@ class ConfigManager:
         except Exception as e:
             logger.error(f"[Config] 설정 로드 실패: {e}")
             self._config = {}
+        self.revision += 1
 
     def save_config(self, config: dict | None = None) -> None:
         """
@@ -172,7 +176,8 @@ class ConfigManager:
             tmp = path.with_suffix(path.suffix + ".tmp")
             with open(tmp, "w", encoding="utf-8") as f:
                 yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
-            tmp.replace(path)  # Windows 포함 원자적 교체
+            replace_file(tmp, path)  # Windows 포함 원자적 교체
+            self.revision += 1
         except Exception as e:
             logger.error(f"[Config] 설정 저장 실패: {e}")
             raise
@@ -1,6 +1,16 @@
+import heapq
+import random
+import re
 import requests
+import sys
+from requests.adapters import HTTPAdapter
+import threading
 import time as time_module
-from datetime import datetime, time, timedelta, timezone
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from zoneinfo import ZoneInfo
 from src.config.config_manager import config_manager
@@ -9,12 +19,411 @@ from src.api.quote import kis_quote
 from src.api.auth import kis_auth
 from src.api.exchange import normalize_analysis_exchange
 from src.utils.logger import logger, get_mode_logger, set_engine_api_logging
-from src.utils.fx_rate import get_usd_krw_rate
+from src.utils.fx_rate import get_cached_usd_krw_rate, get_usd_krw_rate
 from src.engine.position_store import PositionStore
 from src.engine.run_state_store import RunStateStore
-from src.engine.execution_history_store import ExecutionHistoryStore
+from src.engine.execution_history_store import ExecutionHistoryStore, OrderAttempt
+from typing import NamedTuple
 from uuid import uuid4
 
+try:
+    # 선택 의존성: 분석서버 폴링 응답(JSON) 파싱 가속. 미설치 시 requests 기본 파서 사용
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# 매도 주문 병렬 처리 워커 수(정규 매매 전략 매도 + 장중 손절 감시 공용, KIS 초당 호출 제한 고려)
+_ORDER_MAX_WORKERS = 4
+# 장중 손절 감시: 직전 잔고의 모든 종목이 임계치에서 이 폭(%p) 이상 떨어져 있으면 잔고 재조회를 생략
+_STOP_WATCH_SKIP_MARGIN_PCT = 2.0
+# 위 생략을 허용하는 직전 잔고의 최대 나이(초, 감시 주기 1분 + 지연 여유).
+# - 생략은 실제 조회 직후 1틱만 허용(생략 시 스냅샷 소비) → 손절 감지 지연은 최악 2틱(약 120초)
+#   (직전 조회 직후 임계치를 넘거나, 웹에서 신규 매수해 스냅샷에 없는 종목 포함)
+_STOP_WATCH_BALANCE_MAX_AGE_SEC = 90.0
+# 매수 후보 현재가 병렬 조회 워커 수(각 조회는 _kis_limiter를 통과하므로 초당 호출 수는 한도 내로 유지)
+_BUY_QUOTE_MAX_WORKERS = 4
+# 선조회한 현재가를 그대로 쓰는 최대 나이(초). 앞 종목 주문(호가 단계 대기 등)으로 이보다 오래되면 재조회
+_BUY_QUOTE_MAX_AGE_SEC = 3.0
+# 매수 루프 KIS 호출 페이스(초당 호출 수): EGW00201(초당 거래건수 초과) 완화용
+_KIS_ORDER_RATE_PER_SEC = 4.0
+# 호가 단계 매수: 직전 매수가능수량 조회가 이 비율 미만의 가격 차이면 v1_014 재조회 생략(0.005 = 0.5%)
+_LADDER_REQUERY_PCT = 0.005
+
+# 장 운영시간 판정용 타임존(ZoneInfo 생성/tzdata 조회는 모듈 로드 시 1회)
+_KST = ZoneInfo("Asia/Seoul")
+_NY = ZoneInfo("America/New_York")
+
+# 분석 결과 폴링: 전체 대기 상한 / 간격(초)
+_ANALYSIS_POLL_TIMEOUT_SEC = 1200.0
+_ANALYSIS_POLL_BASE_DELAY_SEC = 1.0
+_ANALYSIS_POLL_MAX_DELAY_SEC = 10.0
+
+# 같은 종목 반복 매도 방지 쿨다운(초)
+_SELL_COOLDOWN_SEC = 300.0
+
+# 호가 상향(ask ladder) 매수 trace 이벤트명
+_EV_LADDER_LEVEL_BEGIN = "buy.ladder.level.begin"
+_EV_LADDER_GUARD = "buy.ladder.guard_triggered"
+_EV_LADDER_QTY_INSUFFICIENT = "buy.ladder.qty_insufficient"
+_EV_LADDER_SUBMIT = "buy.ladder.order.submit"
+_EV_LADDER_NO_ORDER_NO = "buy.ladder.order.no_order_no"
+_EV_LADDER_FILLED = "buy.ladder.filled_or_removed"
+_EV_LADDER_LAST_LEVEL_LEFT = "buy.ladder.unfilled_last_level_left"
+_EV_LADDER_UNFILLED = "buy.ladder.unfilled"
+_EV_LADDER_CANCEL = "buy.ladder.cancel"
+_EV_LADDER_CANCEL_FAILED = "buy.ladder.cancel_failed"
+_EV_LADDER_LEVEL_NEXT = "buy.ladder.level.next"
+
+
+# 분석 서버 응답(top_stocks) 필드 후보 키: 서버 구현별로 한글/영문 키가 섞여 온다.
+_CODE_KEYS = ("종목코드", "ticker", "code", "symbol")
+_EXCHANGE_KEYS = ("exchange", "시장구분", "market", "excd")
+_NAME_KEYS = ("종목명", "name", "stock_name")
+_PRICE_KEYS = ("현재가", "price", "current_price")
+_SCORE_KEYS = ("최종점수", "score", "final_score")
+_PROB_KEYS = ("상승확률", "prob", "up_prob", "prob_up")
+_MARKET_CAP_KEYS = ("시가총액", "market_cap", "marketCap", "mktcap")
+
+# 분석일 문자열: 첫 숫자 덩어리(4자리 연도) + 구분자 + 월(1~2자리) + 구분자 + 일(1~2자리)
+_DATE_RE = re.compile(r"\D*(\d{4})\D+(\d{1,2})\D+(\d{1,2})(?!\d)")
+
+# 분석 서버 플래그(analysis_running 등) 문자열 참 값
+_TRUE_STRS = frozenset(("true", "1", "y", "yes", "t"))
+
+
+def _first(row: dict, keys: tuple):
+    """row에서 keys 순서대로 첫 truthy 값 반환(`a or b or c`와 동일: 없으면 마지막 키의 값)"""
+    v = None
+    for k in keys:
+        v = row.get(k)
+        if v:
+            return v
+    return v
+
+
+# 주문체결내역(v1_007) 행 필드 후보 키
+_HIST_PDNO_KEYS = ("pdno", "PDNO", "ovrs_pdno")
+_HIST_DATE_KEYS = ("ccld_dt", "CCLD_DT", "ord_dt", "ORD_DT", "trad_day", "TRAD_DAY")  # 체결일 우선
+_HIST_SIDE_CD_KEYS = ("sll_buy_dvsn_cd", "SLL_BUY_DVSN_CD", "sll_buy_dvsn", "SLL_BUY_DVSN")
+_HIST_SIDE_NAME_KEYS = ("sll_buy_dvsn_name", "sll_buy_dvsn_cd_name")
+_HIST_FILLED_QTY_KEYS = (
+    "ft_ccld_qty",
+    "ccld_qty",
+    "CCLD_QTY",
+    "ccld_qty1",
+    "ccld_qty2",
+    "tot_ccld_qty",
+    "tot_ccld_qty1",
+    "ft_ord_qty",
+)
+
+
+# 일자 구분자 제거용 변환 테이블(replace 연쇄 대신 translate 1회)
+_DATE_STRIP = str.maketrans("", "", "-./ ")
+
+# 매도호가 키(pask1..pask10) 사전 생성
+_ASK_KEYS = tuple(f"pask{i}" for i in range(1, 11))
+
+
+def _as_yyyymmdd(v: str | None) -> str | None:
+    if not v:
+        return None
+    vv = str(v).strip()
+    # v1_007 응답은 대부분 이미 YYYYMMDD → 변환 생략
+    if len(vv) == 8 and vv.isdigit():
+        return vv
+    vv = vv.translate(_DATE_STRIP)
+    return vv if len(vv) == 8 and vv.isdigit() else None
+
+
+def _by_ccy(rows) -> dict:
+    """통화별 행 맵 {crcy_cd: row} (같은 통화가 여러 행이면 첫 행 유지 - 기존 첫 매칭 break와 동일)"""
+    out = {}
+    for r in rows if isinstance(rows, list) else [rows]:
+        if isinstance(r, dict):
+            out.setdefault(str(r.get("crcy_cd") or "").strip().upper(), r)
+    return out
+
+
+def _to_float(v, default: float | None = 0.0) -> float | None:
+    """
+    KIS 응답 숫자 필드 파싱(문자열/숫자 혼재, 천단위 콤마 허용).
+    - 숫자는 그대로, 일반 숫자 문자열은 float() 1회로 처리하고 콤마 제거는 실패 시에만 시도
+    - None/빈 문자열/파싱 실패는 default
+    """
+    if v is None:
+        return default
+    if isinstance(v, (int, float)):
+        return float(v)
+    if v == "":
+        # KIS 응답의 빈 칸은 흔하므로 예외 경로(2회)를 타지 않고 바로 default
+        return default
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        try:
+            return float(str(v).replace(",", ""))
+        except Exception:
+            return default
+
+
+def _unfilled_qty_by_odno(exchange: str, mode: str) -> dict[str, int]:
+    """미체결 내역 1회 조회 → {주문번호: 미체결 잔량} (실패 시 빈 dict = 모두 잔량 0 취급)"""
+    out: dict[str, int] = {}
+    try:
+        rows = kis_order.get_unfilled_orders(exchange=exchange, mode=mode, caller="ENGINE") or []
+        rows = rows if isinstance(rows, list) else [rows]
+    except Exception:
+        return out
+    for r in rows:
+        if not isinstance(r, dict):
+            continue
+        odno = str(r.get("odno") or "").strip()
+        if not odno or odno in out:
+            continue
+        try:
+            out[odno] = int(_to_float(r.get("nccs_qty")))
+        except Exception:
+            out[odno] = 0
+    return out
+
+
+def _extract_asks(ob: dict) -> list[float]:
+    # 해외주식-033 output2는 array로 내려오지만 실질 payload는 1개 dict인 케이스가 흔함.
+    out2 = ob.get("output2") if isinstance(ob, dict) else None
+    d = None
+    if isinstance(out2, list) and out2:
+        d = out2[0] if isinstance(out2[0], dict) else None
+    elif isinstance(out2, dict):
+        d = out2
+    if not d:
+        return []
+    asks = []
+    for k in _ASK_KEYS:
+        v = d.get(k)
+        if v is None or v == "":
+            continue
+        p = _to_float(v)
+        if p > 0:
+            asks.append(p)
+    return asks
+
+
+def _profit_rate(stock: dict) -> float:
+    """잔고 행의 평가손익률(evlu_pfls_rt, %) (파싱 실패=0)"""
+    return _to_float(stock.get("evlu_pfls_rt"))
+
+
+def _hist_is_buy(row: dict) -> bool:
+    # 가이드: sll_buy_dvsn_cd = 02 (매수)
+    cd = str(_first(row, _HIST_SIDE_CD_KEYS) or "").strip()
+    if cd in ("02", "2"):
+        return True
+    v = str(_first(row, _HIST_SIDE_NAME_KEYS) or "").strip().lower()
+    return ("buy" in v) or ("매수" in v)
+
+
+def _hist_filled_qty(row: dict) -> float:
+    for k in _HIST_FILLED_QTY_KEYS:
+        if k in row and row.get(k) is not None:
+            q = _to_float(row.get(k), None)
+            if q is not None:
+                return q
+    return 0.0
+
+
+class _ModeConfig(NamedTuple):
+    strategy: dict
+    auto_enabled: bool
+    schedule_time: str
+    intraday: dict
+
+
+@lru_cache(maxsize=4)
+def _get_mode_config(mode: str, revision: int) -> _ModeConfig:
+    """
+    모드별 설정 묶음. revision(config_manager.revision)이 캐시 키에 포함되어
+    설정 로드/저장 시 자동으로 새로 읽는다.
+    - 모드 섹션을 1회 조회한 뒤 하위 키는 dict.get으로 읽는다(점 경로 분해 반복 생략)
+    """
+    cfg = config_manager.get(mode, {})
+    if not isinstance(cfg, dict):
+        cfg = {}
+    return _ModeConfig(
+        strategy=cfg.get("strategy", {}) or {},
+        auto_enabled=bool(cfg.get("auto_trading_enabled", False)),
+        schedule_time=cfg.get("schedule_time", "00:00") or "00:00",
+        intraday=cfg.get("intraday_stop_loss", {}) or {},
+    )
+
+
+@lru_cache(maxsize=4)
+def _is_dst_ny(epoch_hour: int) -> bool:
+    """뉴욕 서머타임 여부(UTC 1시간 단위 캐시 - 전환 시각이 정시이므로 버킷 내 결과 동일)"""
+    dst = datetime.fromtimestamp(epoch_hour * 3600, _NY).dst()
+    return bool(dst) and dst != timedelta(0)
+
+
+@lru_cache(maxsize=256)
+def _parse_yyyymmdd(s: str) -> date:
+    """YYYYMMDD -> date (strptime 대신 정수 슬라이싱, 보유 종목 open_date는 거의 바뀌지 않아 캐시)"""
+    if len(s) != 8 or not s.isdigit():
+        raise ValueError(f"invalid yyyymmdd: {s!r}")
+    return date(int(s[:4]), int(s[4:6]), int(s[6:8]))
+
+
+def _json_body(resp):
+    """HTTP 응답 JSON 파싱(orjson 우선). 파싱 실패 시 예외는 호출부 처리 그대로 전파"""
+    if _orjson is not None:
+        return _orjson.loads(resp.content)
+    return resp.json()
+
+
+def _norm_symbol(raw) -> str:
+    """
+    종목코드 정규화(공백 제거 + 대문자).
+    - KIS 응답 티커는 대부분 이미 대문자/공백 없음 → 그대로 반환해 문자열 재생성 생략
+    """
+    if not raw:
+        return ""
+    if isinstance(raw, str) and raw.isascii() and raw.isupper() and not (raw[0].isspace() or raw[-1].isspace()):
+        return raw
+    return str(raw).strip().upper()
+
+
+_iso_sec_cache = (None, "")  # (epoch 초, ISO 문자열)
+
+
+def _iso_now_second() -> str:
+    """현재 시각 ISO 문자열(초 단위). 같은 초 안에서는 직전 포맷 결과 재사용"""
+    global _iso_sec_cache
+    sec = int(time_module.time())
+    cached = _iso_sec_cache
+    if cached[0] == sec:
+        return cached[1]
+    text = datetime.fromtimestamp(sec).isoformat(timespec="seconds")
+    _iso_sec_cache = (sec, text)
+    return text
+
+
+def _odno(out) -> str | None:
+    """주문 응답(output)에서 주문번호 추출(대/소문자 키 모두 대응)"""
+    if not out:
+        return None
+    return out.get("ODNO") or out.get("odno")
+
+
+def _yyyymmdd(dt: datetime) -> str:
+    """datetime -> YYYYMMDD (strftime보다 가벼운 포맷)"""
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}"
+
+
+class TTLCooldown:
+    """
+    종목별 매도 쿨다운(만료 시각 기반 TTL 맵).
+    - {symbol: expire_at} + (expire_at, symbol) min-heap
+    - 조회/기록 시 heap 선두의 만료 항목만 정리하므로 장기 실행에도 크기가 유지된다.
+    - 만료 시각은 time.monotonic() 초 단위(NTP/DST 등 시계 변경 영향 없음)
+    - 정규 매매(_run_core)와 장중 감시(stop_loss_watch 워커 스레드)가 공유하므로 내부 잠금 사용
+    - max_size 초과 시 만료가 가장 이른 종목부터 제거(상한 보장), 재기록으로 남은 heap 잔여 항목은 주기적으로 압축
+    """
+
+    def __init__(self, ttl_sec: float, max_size: int = 256):
+        self._ttl = float(ttl_sec)
+        self._max_size = max(1, int(max_size))
+        self._expire = {}  # symbol -> expire_at(monotonic sec)
+        self._heap = []  # (expire_at, symbol)
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expire_at, symbol = heapq.heappop(heap)
+            # 재기록으로 만료 시각이 갱신된 종목의 예전 heap 항목은 무시
+            if self._expire.get(symbol) == expire_at:
+                del self._expire[symbol]
+
+    def mark(self, symbol: str, now: float | None = None) -> None:
+        if now is None:
+            now = time_module.monotonic()
+        expire_at = now + self._ttl
+        with self._lock:
+            self._prune(now)
+            self._expire[symbol] = expire_at
+            heapq.heappush(self._heap, (expire_at, symbol))
+            # 상한 초과: 만료가 가장 이른(가장 오래전에 기록된) 종목부터 제거
+            heap = self._heap
+            while len(self._expire) > self._max_size and heap:
+                old_at, old_sym = heapq.heappop(heap)
+                if self._expire.get(old_sym) == old_at:
+                    del self._expire[old_sym]
+            # 같은 종목 재기록이 반복되면 heap에 예전 항목이 쌓이므로 살아있는 항목만으로 재구성
+            if len(heap) > 2 * len(self._expire) + 64:
+                self._heap = [(at, sym) for sym, at in self._expire.items()]
+                heapq.heapify(self._heap)
+
+    def __contains__(self, symbol: str) -> bool:
+        with self._lock:
+            self._prune(time_module.monotonic())
+            return symbol in self._expire
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune(time_module.monotonic())
+            return len(self._expire)
+
+
+class TokenBucket:
+    """
+    KIS 호출 간격 제어용 토큰 버킷(동기).
+    - 초당 rate개 토큰이 채워지고 최대 burst개까지 쌓인다.
+    - acquire()는 토큰이 없을 때 부족분만큼만 대기 → 직전 API 응답이 느렸다면 대기 없이 바로 진행
+      (고정 sleep처럼 응답 시간과 무관하게 매번 쉬지 않는다)
+    - 정규 매매/장중 감시 스레드가 공유할 수 있어 내부 잠금 사용
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = float(rate)
+        self._capacity = float(max(1, int(burst)))
+        self._tokens = self._capacity
+        self._updated = time_module.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time_module.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = (-self._tokens / self._rate) if self._tokens < 0 else 0.0
+        if wait > 0:
+            time_module.sleep(wait)
+
+
+class TraceRing:
+    """
+    실행 trace 버퍼(최대 capacity건, 초과 시 가장 오래된 항목부터 버림).
+    - 주문 경로에서는 (시각, step, meta) 튜플만 적재하고 dict 변환은 이력 저장 시 1회 수행
+    - 시각은 초 단위 캐시 문자열(_iso_now_second)을 그대로 보관
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._buf = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def append(self, step: str, meta: dict) -> None:
+        buf = self._buf
+        if len(buf) == buf.maxlen:
+            self.dropped += 1
+        buf.append((_iso_now_second(), step, meta))
+
+    def to_list(self) -> list:
+        return [
+            {"ts": ts, "step": step, **meta}
+            for ts, step, meta in self._buf
+        ]
+
+
 class TradingEngine:
     def __init__(self):
         self.is_running = False
@@ -22,15 +431,72 @@ class TradingEngine:
         self.last_error = None
         self.last_stop_watch_at = None
         self.last_stop_watch_error = None
-        self._stop_loss_cooldown = {}  # symbol -> datetime
+        # 실제 1회 실행이 시작될 때 호출(스케줄러의 is_executing 하트비트용, 인자 없음)
+        self.on_run_start = None
+        self._stop_loss_cooldown = TTLCooldown(_SELL_COOLDOWN_SEC)  # 같은 종목 반복 매도 방지
+        # 매수 루프 KIS 호출 간격(EGW00201 완화): 기존 고정 0.25초 sleep과 같은 초당 4회 페이스
+        self._kis_limiter = TokenBucket(rate=_KIS_ORDER_RATE_PER_SEC, burst=1)
         self._last_scheduled_run_day = {}  # mode -> YYYYMMDD
         self._run_state_store = {}  # mode -> RunStateStore
+        self._schedule_cache = (None, 0, 0)  # (schedule_time 원문, hh, mm)
+        self._market_open_cache = (None, False)  # (epoch 분, 개장 여부)
+        # 분석 서버 호출: 연결 재사용(Session) + 엔드포인트 탐색/health 동시 조회용 소형 풀
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._http_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="analysis-http")
+        # 매도 주문 제출용 상주 풀(실행/틱마다 스레드를 새로 띄우지 않음)
+        # - 정규 매매와 장중 감시는 동시에 돌지 않으므로(is_running 가드) 하나를 공유
+        self._order_pool = ThreadPoolExecutor(max_workers=_ORDER_MAX_WORKERS, thread_name_prefix="kis-order")
+        # KIS 조회 단기 캐시: key -> (monotonic 저장 시각, 응답). 한 번의 실행 안에서 같은 조회 중복 방지
+        self._rpc_cache: dict[tuple, tuple[float, object]] = {}
+        # 장중 감시 직전 잔고 요약: (monotonic 조회 시각, mode, threshold_pct, 종목별 수익률 튜플)
+        self._last_balance = None
+
+    def _cached_rpc(self, key: tuple, ttl: float, fn):
+        """ttl(초) 안에 같은 key로 조회한 응답이 있으면 재사용. 실패(None/빈 응답)는 캐시하지 않는다."""
+        hit = self._rpc_cache.get(key)
+        if hit is not None and (time_module.monotonic() - hit[0]) < ttl:
+            return hit[1]
+        val = fn()
+        if val:
+            self._rpc_cache[key] = (time_module.monotonic(), val)
+        return val
+
+    def _get_present_balance(self, mode: str):
+        """체결기준현재잔고(v1_008, USD) 조회. 매도 후 재조회/환율 확보/예산 산정이 3초 안에 겹치면 1회만 호출"""
+        return self._cached_rpc(
+            ("present_balance", "000", "00", "00", "02", mode),
+            3.0,
+            lambda: kis_order.get_present_balance(
+                natn_cd="000",
+                tr_mket_cd="00",
+                inqr_dvsn_cd="00",
+                wcrc_frcr_dvsn_cd="02",
+                caller="ENGINE",
+                mode=mode,
+            ),
+        )
 
     def _get_run_state_store(self, mode: str) -> RunStateStore:
         if mode not in self._run_state_store:
             self._run_state_store[mode] = RunStateStore(mode=mode)
         return self._run_state_store[mode]
 
+    def _parse_schedule_time(self, schedule_time) -> tuple[int, int]:
+        """'HH:MM' -> (hh, mm). 원문이 같으면 직전 파싱 결과 재사용(실패 시 00:00)"""
+        cached = self._schedule_cache
+        if cached[0] == schedule_time:
+            return cached[1], cached[2]
+        try:
+            hh, mm = str(schedule_time).split(":")
+            hh = int(hh); mm = int(mm)
+        except Exception:
+            hh, mm = 0, 0
+        self._schedule_cache = (schedule_time, hh, mm)
+        return hh, mm
+
     def _get_last_scheduled_run_day(self, mode: str) -> str | None:
         # 메모리 캐시 우선, 없으면 파일에서 로드
         if mode in self._last_scheduled_run_day:
@@ -102,19 +568,17 @@ class TradingEngine:
         if poll_sec <= 0:
             poll_sec = 5
 
+        # 캐시(10분)에 환율이 있으면 v1_008 조회 없이 바로 사용
+        cached = get_cached_usd_krw_rate()
+        if cached and cached.rate and cached.rate > 0:
+            return cached
+
         deadline = datetime.now() + timedelta(seconds=timeout_sec)
         first = True
         last_fx = None
         while datetime.now() <= deadline:
             try:
-                present = kis_order.get_present_balance(
-                    natn_cd="000",
-                    tr_mket_cd="00",
-                    inqr_dvsn_cd="00",
-                    wcrc_frcr_dvsn_cd="02",
-                    caller="ENGINE",
-                    mode=mode,
-                )
+                present = self._get_present_balance(mode)
                 fx = get_usd_krw_rate(mode=mode, kis_present=(present or {}))
                 last_fx = fx
                 if fx and fx.rate and fx.rate > 0:
@@ -140,13 +604,22 @@ class TradingEngine:
         - 따라서 자정(00:00)~마감(end) 구간은 '전날'의 weekday로 판단한다.
 
         ※ 휴장일(미국 공휴일)까지는 반영하지 않음.
+        ※ 개장/마감 경계가 분 단위이므로 같은 분 안에서는 직전 판정 결과를 재사용한다.
         """
+        minute = int(time_module.time() // 60)
+        cached = self._market_open_cache
+        if cached[0] == minute:
+            return cached[1]
+        is_open = self._compute_market_open()
+        self._market_open_cache = (minute, is_open)
+        return is_open
+
+    def _compute_market_open(self) -> bool:
         now_utc = datetime.now(timezone.utc)
-        now_kst = now_utc.astimezone(ZoneInfo("Asia/Seoul"))
-        now_ny = now_utc.astimezone(ZoneInfo("America/New_York"))
+        now_kst = now_utc.astimezone(_KST)
 
         # 서머타임 여부만 반영(휴장일은 반영 X)
-        is_dst = bool(now_ny.dst()) and (now_ny.dst() != timedelta(0))
+        is_dst = _is_dst_ny(int(now_utc.timestamp() // 3600))
         start_time = time(22, 30) if is_dst else time(23, 30)
         end_time = time(5, 0) if is_dst else time(6, 0)
 
@@ -166,12 +639,28 @@ class TradingEngine:
 
         return True
 
-    def get_analysis_data(self, trace_cb=None):
+    def seconds_until_market_open(self) -> float:
+        """
+        다음 정규장 시작까지 남은 초(장중이면 0)
+        - 주말/휴장일은 따로 계산하지 않고 '다음 세션 시작 시각'만 계산한다(그 시각에 다시 판정).
+        """
+        if self.is_market_open():
+            return 0.0
+        now_utc = datetime.now(timezone.utc)
+        now_kst = now_utc.astimezone(_KST)
+        is_dst = _is_dst_ny(int(now_utc.timestamp() // 3600))
+        start = now_kst.replace(hour=22 if is_dst else 23, minute=30, second=0, microsecond=0)
+        if start <= now_kst:
+            start = start + timedelta(days=1)
+        return (start - now_kst).total_seconds()
+
+    def get_analysis_data(self, trace_cb=None, cancel_event: threading.Event | None = None):
         """
         분석 서버에서 매수/매도 리스트 가져오기
         - 요구사항: 분석서버의 '실시간 분석 실행'을 호출한 뒤 결과를 받는다.
           (분석서버 구현체에 따라 /api/start_analysis 또는 /v1/analysis/run)
         - 결과 폴링: /v1/analysis 또는 /v1/analysis/result (서버별 상이) 지원
+        - cancel_event: set 되면 다음 폴링 대기 시점에 빈 결과로 중단(UI 미리보기 취소용)
         """
         def _trace(step: str, **meta):
             try:
@@ -180,10 +669,24 @@ class TradingEngine:
             except Exception:
                 pass
 
-        log = get_mode_logger(config_manager.get("common.mode", "mock"), "ENGINE")
+        # common 섹션은 1회만 조회(이후 설정값은 로컬 dict에서 읽음)
+        common = config_manager.get("common", {})
+        if not isinstance(common, dict):
+            common = {}
 
-        host = config_manager.get("common.analysis_host", "localhost")
-        port = config_manager.get("common.analysis_port", 5500)
+        # mock 모드는 URL 구성/로거 생성 등 어떤 준비 작업보다 먼저 반환(네트워크 호출 없음)
+        if bool(common.get("analysis_mock_enabled", False)):
+            # 설정파일에 없더라도 코드에서 안전하게 토글 가능
+            _trace("analysis.mock_enabled")
+            return {
+                "buy": [{"code": "TSLA", "exchange": "NAS"}],
+                "sell": []
+            }
+
+        log = get_mode_logger(common.get("mode", "mock"), "ENGINE")
+
+        host = common.get("analysis_host", "localhost")
+        port = common.get("analysis_port", 5500)
         base_url = f"http://{host}:{int(port)}" if (host and port) else None
         # 서버별 엔드포인트 호환:
         # - start: /api/start_analysis(비동기 시작) 또는 /v1/analysis/run(동기 실행일 수 있음)
@@ -198,16 +701,7 @@ class TradingEngine:
             # 사용자 환경에서 /v1/analysis 로 바뀐 경우가 있어 우선순위로 둠
             result_urls = [f"{base_url}/v1/analysis", f"{base_url}/v1/analysis/result"]
         health_url = f"{base_url}/health" if base_url else None
-        legacy_url = config_manager.get("common.analysis_url")
-        mock_enabled = bool(config_manager.get("common.analysis_mock_enabled", False))
-
-        if mock_enabled:
-            # 설정파일에 없더라도 코드에서 안전하게 토글 가능
-            _trace("analysis.mock_enabled")
-            return {
-                "buy": [{"code": "TSLA", "exchange": "NAS"}],
-                "sell": []
-            }
+        legacy_url = common.get("analysis_url")
 
         def _normalize_payload_to_buy_sell(payload: dict):
             # kiwoomDeepLearning 포맷:
@@ -222,23 +716,14 @@ class TradingEngine:
                 for r in rows:
                     if not isinstance(r, dict):
                         continue
-                    code = (
-                        r.get("종목코드")
-                        or r.get("ticker")
-                        or r.get("code")
-                        or r.get("symbol")
-                    )
+                    code = _first(r, _CODE_KEYS)
                     if not code:
                         continue
-                    code = str(code).strip().upper()
+                    # 종목코드는 보유/이력 dict·set 키로 반복 사용되므로 intern
+                    code = sys.intern(str(code).strip().upper())
                     if not code:
                         continue
-                    exchange_raw = (
-                        r.get("exchange")
-                        or r.get("시장구분")
-                        or r.get("market")
-                        or r.get("excd")
-                    )
+                    exchange_raw = _first(r, _EXCHANGE_KEYS)
                     exchange = normalize_analysis_exchange(exchange_raw)
                     if not exchange:
                         log.warning(f"[Engine] 분석 exchange 파싱 실패 → 기본 NAS 사용: raw={exchange_raw}")
@@ -247,11 +732,11 @@ class TradingEngine:
                         "code": code,
                         "exchange": exchange,
                         # UI/미리보기용 메타 (엔진 로직은 code/exchange만 사용)
-                        "name": r.get("종목명") or r.get("name") or r.get("stock_name"),
-                        "price": r.get("현재가") or r.get("price") or r.get("current_price"),
-                        "score": r.get("최종점수") or r.get("score") or r.get("final_score"),
-                        "prob": r.get("상승확률") or r.get("prob") or r.get("up_prob") or r.get("prob_up"),
-                        "market_cap": r.get("시가총액") or r.get("market_cap") or r.get("marketCap") or r.get("mktcap"),
+                        "name": _first(r, _NAME_KEYS),
+                        "price": _first(r, _PRICE_KEYS),
+                        "score": _first(r, _SCORE_KEYS),
+                        "prob": _first(r, _PROB_KEYS),
+                        "market_cap": _first(r, _MARKET_CAP_KEYS),
                     })
 
                 # UI/미리보기에서 분석 정보를 표시할 수 있도록 meta를 함께 반환
@@ -276,13 +761,15 @@ class TradingEngine:
                 return True
             if v is False or v is None:
                 return False
+            if isinstance(v, str):
+                # 흔한 형태("true"/"false")는 그대로 조회, 아니면 정규화 후 조회
+                return (v in _TRUE_STRS) or (v.strip().lower() in _TRUE_STRS)
             try:
                 if isinstance(v, (int, float)):
                     return bool(int(v))
             except Exception:
                 pass
-            s = str(v).strip().lower()
-            return s in ("true", "1", "y", "yes", "t")
+            return str(v).strip().lower() in _TRUE_STRS
 
         def _normalize_date(v: str | None) -> str | None:
             """
@@ -296,42 +783,31 @@ class TradingEngine:
             if not s:
                 return None
             # 1) YYYYMMDD
-            digits = "".join([ch for ch in s if ch.isdigit()])
-            if len(digits) == 8:
-                return f"{digits[0:4]}-{digits[4:6]}-{digits[6:8]}"
-            # 2) YYYY-MM-DD (또는 YYYY.MM.DD 등)
-            if len(s) >= 8:
-                # 숫자/구분자만 남겨서 파싱 시도
-                parts = []
-                cur = ""
-                for ch in s:
-                    if ch.isdigit():
-                        cur += ch
-                    else:
-                        if cur:
-                            parts.append(cur)
-                            cur = ""
-                if cur:
-                    parts.append(cur)
-                if len(parts) >= 3 and len(parts[0]) == 4:
-                    y = parts[0]
-                    m = parts[1].zfill(2)
-                    d = parts[2].zfill(2)
-                    if len(y) == 4 and len(m) == 2 and len(d) == 2:
-                        return f"{y}-{m}-{d}"
+            if len(s) == 8 and s.isdigit():
+                return f"{s[0:4]}-{s[4:6]}-{s[6:8]}"
+            # 2) YYYY-MM-DD (또는 YYYY.MM.DD / YYYY년 MM월 DD일 등)
+            m = _DATE_RE.match(s)
+            if m:
+                return f"{m[1]}-{m[2].zfill(2)}-{m[3].zfill(2)}"
             return None
 
+        http = self._http
+        # 폴링 대기는 sleep 대신 이벤트 대기(취소 시 즉시 깨어남)
+        cancel = cancel_event if cancel_event is not None else threading.Event()
         try:
             _trace("analysis.start", base_url=base_url)
             analysis_date = datetime.now().strftime("%Y-%m-%d")
 
             # 실제로 존재하는 result 엔드포인트를 먼저 선택한다.
             # (사용자 환경에서 /v1/analysis 는 없고 /v1/analysis/result 만 있는 케이스가 흔함)
+            # - 후보 URL은 동시에 조회하되, 선택은 기존 우선순위(/v1/analysis/result 먼저)를 유지한다.
             chosen_result_url = None
             if base_url:
-                for ru in [f"{base_url}/v1/analysis/result", f"{base_url}/v1/analysis"]:
+                probe_urls = [f"{base_url}/v1/analysis/result", f"{base_url}/v1/analysis"]
+                probes = [self._http_pool.submit(http.get, ru, timeout=2) for ru in probe_urls]
+                for ru, fut in zip(probe_urls, probes):
                     try:
-                        rr0 = requests.get(ru, timeout=2)
+                        rr0 = fut.result()
                         if rr0.status_code in (200, 404):
                             chosen_result_url = ru
                             break
@@ -346,9 +822,9 @@ class TradingEngine:
             baseline = {"analysis_date": None, "buy_sell": None}
             if chosen_result_url:
                 try:
-                    brr = requests.get(chosen_result_url, timeout=3)
+                    brr = http.get(chosen_result_url, timeout=3)
                     if brr.status_code == 200:
-                        bp = brr.json() or {}
+                        bp = _json_body(brr) or {}
                         # baseline date
                         try:
                             got = None
@@ -369,13 +845,13 @@ class TradingEngine:
             for su in start_urls:
                 try:
                     # /v1/analysis/run 은 동기 수행일 수 있어 타임아웃이 정상일 수 있음 -> 무시하고 폴링로 진행
-                    sr = requests.post(su, json={"analysis_date": analysis_date}, timeout=3)
+                    sr = http.post(su, json={"analysis_date": analysis_date}, timeout=3)
                     if sr.status_code in (200, 202, 409):
                         start_ok = True
                         # /v1/analysis/run 이 즉시 결과를 반환하는 구현이면 여기서 바로 처리
                         if sr.status_code == 200:
                             try:
-                                payload = sr.json() or {}
+                                payload = _json_body(sr) or {}
                                 out = _normalize_payload_to_buy_sell(payload)
                                 if out is not None:
                                     return out
@@ -385,7 +861,7 @@ class TradingEngine:
                         # 일부 분석서버 구현은 "이미 분석 실행 중"을 400으로 반환한다.
                         # (예: {"error":"이미 분석이 실행 중입니다..."})
                         try:
-                            j = sr.json() or {}
+                            j = _json_body(sr) or {}
                             msg = str(j.get("error") or j.get("message") or "")
                             if ("이미" in msg) and ("실행" in msg):
                                 start_ok = True
@@ -404,12 +880,12 @@ class TradingEngine:
             if (not start_ok) and start_not_found and base_url:
                 su = f"{base_url}/v1/analysis/run"
                 try:
-                    sr = requests.post(su, json={"analysis_date": analysis_date}, timeout=3)
+                    sr = http.post(su, json={"analysis_date": analysis_date}, timeout=3)
                     if sr.status_code in (200, 202, 409):
                         start_ok = True
                         if sr.status_code == 200:
                             try:
-                                payload = sr.json() or {}
+                                payload = _json_body(sr) or {}
                                 out = _normalize_payload_to_buy_sell(payload)
                                 if out is not None:
                                     return out
@@ -417,7 +893,7 @@ class TradingEngine:
                                 pass
                     elif sr.status_code == 400:
                         try:
-                            j = sr.json() or {}
+                            j = _json_body(sr) or {}
                             msg = str(j.get("error") or j.get("message") or "")
                             if ("이미" in msg) and ("실행" in msg):
                                 start_ok = True
@@ -436,22 +912,47 @@ class TradingEngine:
             _trace("analysis.poll.start", url=chosen_result_url)
             poll_started = datetime.now()
             last_trace_sec = -999999.0
-            for _ in range(600):  # 20분(2초 * 600)
+            # 폴링 간격: 1초에서 시작해 1.5배씩 늘려 최대 10초(분석 실행 중에는 서버 호출 수 절감)
+            # - 전체 대기 상한은 횟수가 아니라 절대 시각(20분)으로 제한
+            # - 429(과호출)는 간격을 2배로 늘리고 ±20% 지터를 준다.
+            deadline = time_module.monotonic() + _ANALYSIS_POLL_TIMEOUT_SEC
+            poll_attempt = 0
+            # 조건부 요청: 서버가 ETag를 주면 다음 폴링에 If-None-Match를 보내 304(빈 본문)로 응답받는다.
+            result_headers = None
+            last_payload = None
+
+            def _poll_sleep(throttled: bool = False) -> None:
+                nonlocal poll_attempt
+                delay = min(_ANALYSIS_POLL_MAX_DELAY_SEC, _ANALYSIS_POLL_BASE_DELAY_SEC * (1.5 ** poll_attempt))
+                if throttled:
+                    delay = min(_ANALYSIS_POLL_MAX_DELAY_SEC, delay * 2.0) * random.uniform(0.8, 1.2)
+                poll_attempt += 1
+                cancel.wait(max(0.0, min(delay, deadline - time_module.monotonic())))
+
+            while time_module.monotonic() < deadline and not cancel.is_set():
                 try:
-                    rr = requests.get(chosen_result_url, timeout=3)
-                    if rr.status_code != 200:
-                        time_module.sleep(2)
+                    # health와 result를 동시에 조회(폴링 1회당 왕복 지연 1회분)
+                    health_fut = self._http_pool.submit(http.get, health_url, timeout=2) if health_url else None
+                    rr = http.get(chosen_result_url, headers=result_headers, timeout=3)
+                    if rr.status_code == 304 and last_payload is not None:
+                        # 결과 미변경(ETag 일치): 본문 전송/파싱 없이 직전 payload 재사용
+                        payload = last_payload
+                    elif rr.status_code != 200:
+                        _poll_sleep(throttled=(rr.status_code == 429))
                         continue
-
-                    payload = rr.json() or {}
+                    else:
+                        payload = _json_body(rr) or {}
+                        last_payload = payload
+                        etag = rr.headers.get("ETag")
+                        result_headers = {"If-None-Match": etag} if etag else None
 
                     # running 판단: /health가 있으면 그것을 우선 사용(서버별 result 응답에 running이 없거나 부정확할 수 있음)
                     running = False
                     try:
-                        if health_url:
-                            hr = requests.get(health_url, timeout=2)
+                        if health_fut is not None:
+                            hr = health_fut.result()
                             if hr.status_code == 200:
-                                hj = hr.json() or {}
+                                hj = _json_body(hr) or {}
                                 running = _to_bool(hj.get("analysis_running"))
                         if (not running) and isinstance(payload, dict):
                             running = _to_bool(payload.get("analysis_running"))
@@ -468,9 +969,11 @@ class TradingEngine:
                                 _trace("analysis.poll.waiting", elapsed_sec=int(elapsed))
                         except Exception:
                             pass
-                        time_module.sleep(2)
+                        _poll_sleep()
                         continue
 
+                    # 실행 중이 아니면(시작 대기/완료 직후) 빠른 간격으로 복귀
+                    poll_attempt = 0
                     out = _normalize_payload_to_buy_sell(payload)
                     if out is None:
                         # 포맷이 예상과 다르면 잠시 대기 후 재시도
@@ -481,7 +984,7 @@ class TradingEngine:
                                 _trace("analysis.poll.unexpected_format", elapsed_sec=int(elapsed))
                         except Exception:
                             pass
-                        time_module.sleep(2)
+                        _poll_sleep()
                         continue
 
                     # 날짜가 서버/데이터 특성상 "최근 거래일"로 내려오는 경우가 있어,
@@ -524,8 +1027,12 @@ class TradingEngine:
                 except Exception:
                     pass
 
-                time_module.sleep(2)
+                _poll_sleep()
 
+            if cancel.is_set():
+                log.info("[Engine] 분석 결과 폴링 취소됨")
+                _trace("analysis.poll.cancelled")
+                return {"buy": [], "sell": []}
             _trace("analysis.poll.timeout")
             return {"buy": [], "sell": []}
         except Exception as e:
@@ -534,7 +1041,11 @@ class TradingEngine:
             return {"buy": [], "sell": []}
 
     def _run_core(self, mode: str, analysis_data: dict | None, ignore_auto_enabled: bool):
-        """주기적으로 실행될 메인 로직"""
+        """
+        주기적으로 실행될 메인 로직
+        - analysis_data가 주어지면(즉시실행/미리보기/매도전용) 그대로 사용하며 분석서버에는 접근하지 않는다.
+          get_analysis_data()(시작 호출/결과 폴링)는 analysis_data가 None일 때만 호출된다.
+        """
         log = get_mode_logger(mode, "ENGINE")
         if self.is_running:
             log.warning("[Engine] 이전 작업이 아직 진행 중입니다.")
@@ -542,7 +1053,7 @@ class TradingEngine:
 
         # 실행 이력(상세) 수집: 실패/예외 포함해서 1회 실행 단위로 저장한다.
         run_id = str(uuid4())
-        started_at = datetime.now().isoformat(timespec="seconds")
+        started_at = _iso_now_second()
         history: dict = {
             "run_id": run_id,
             "mode": mode,
@@ -564,16 +1075,15 @@ class TradingEngine:
             "excluded": {"buy": [], "sell": []},
         }
 
+        trace_ring = TraceRing()
+
         def _trace(step: str, **meta):
             try:
-                history["trace"].append({
-                    "ts": datetime.now().isoformat(timespec="seconds"),
-                    "step": step,
-                    **(meta or {}),
-                })
+                trace_ring.append(step, meta)
             except Exception:
                 pass
-        strategy = config_manager.get(f'{mode}.strategy', {})
+        mode_cfg = _get_mode_config(mode, config_manager.revision)
+        strategy = mode_cfg.strategy
         last_step = "init"
         last_context: dict = {}
 
@@ -595,21 +1105,21 @@ class TradingEngine:
                 history["errors"].append({"kind": kind, **payload})
             except Exception:
                 pass
-        auto_enabled = config_manager.get(f'{mode}.auto_trading_enabled', False)
-        schedule_time = config_manager.get(f"{mode}.schedule_time", "00:00") or "00:00"
+        auto_enabled = mode_cfg.auto_enabled
+        schedule_time = mode_cfg.schedule_time
 
         # 자동매매 OFF면 실행 자체를 하지 않음 (last_run_at도 갱신하지 않음)
         if (not ignore_auto_enabled) and (not auto_enabled):
             return
 
+        # 실행 시각 스냅샷: 스케줄 판정/이력/보유기간 계산에 공통으로 사용한다(시계 조회 1회).
+        now = datetime.now()
+        today = _yyyymmdd(now)
+        today_date = now.date()
+
         # 실행시간 스케줄(1일 1회): 자동매매 ON이면 항상 지정 시각에만 실행
         if (not ignore_auto_enabled):
-            now = datetime.now()
-            try:
-                hh, mm = str(schedule_time).split(":")
-                hh = int(hh); mm = int(mm)
-            except Exception:
-                hh, mm = 0, 0
+            hh, mm = self._parse_schedule_time(schedule_time)
 
             # 1분 주기 체크는 프로세스/네트워크 상황에 따라 약간 지연될 수 있어
             # 지정 시각 ±1분 범위를 허용한다(키움 샘플과 동일한 안정성 의도).
@@ -624,17 +1134,27 @@ class TradingEngine:
                 if not (now.hour == hh and now.minute == mm):
                     return
 
-            today = now.strftime("%Y%m%d")
             # 서버 재시작에도 중복 실행 방지: 파일 기반 상태 우선
             if self._get_last_scheduled_run_day(mode) == today:
                 return
 
         # 여기부터는 "실제 1회 실행"에 해당 (상태 갱신)
         self.is_running = True
-        self.last_run_at = datetime.now()
+        self.last_run_at = now
         self.last_error = None
+        if self.on_run_start is not None:
+            try:
+                self.on_run_start()
+            except Exception:
+                pass
         set_engine_api_logging(mode, True)
         try:
+            # 1. 거래 가능 시간 체크: 장외 시간이면 토큰 대기/환율 조회 등 어떤 작업도 하지 않고 종료
+            if not self.is_market_open():
+                log.info("[Engine] 현재 거래 가능 시간이 아닙니다. (22:00 ~ 07:00)")
+                _trace("market.closed")
+                return
+
             # (B) 자동매매는 토큰 확보 후 진행 (토큰 발급 제한(EGW00133) 대응)
             if not self._wait_for_token(mode=mode, timeout_sec=70, poll_sec=10):
                 self.last_error = "token_issue_timeout"
@@ -664,43 +1184,26 @@ class TradingEngine:
             # reserve_cash: 구버전(USD) 하위호환
             reserve_cash_krw = float(strategy.get("reserve_cash_krw", 0) or 0.0)
             reserve_cash_usd_legacy = float(strategy.get("reserve_cash", 0) or 0.0)
-            # USD/KRW 환율(원/달러): 토큰처럼 "확보 후 진행"이 더 안전하다.
-            # - reserve_cash_krw를 사용(>0)하는 경우에만 환율 확보를 기다린다.
-            if reserve_cash_krw > 0:
-                fx = self._wait_for_fx_rate(mode=mode, timeout_sec=60, poll_sec=5)
-            else:
-                fx = get_usd_krw_rate(mode=mode)
-            usd_krw_rate = fx.rate or 0.0
-            usd_krw_rate_source = fx.source
-            usd_krw_rate_error = getattr(fx, "error", None)
-
-            # 환율 자동조회가 실패하면 "매수는 취소, 매도만 실행" 정책 적용
-            # (주의) 환율 실패(0/None) 상태에서 reserve_cash_krw/usd_krw_rate를 먼저 계산하면 0나누기 예외로 프로세스가 죽는다.
-            allow_buy = True
-            if usd_krw_rate <= 0:
-                allow_buy = False
-                history["errors"].append(f"fx_rate_unavailable: source={usd_krw_rate_source}, error={usd_krw_rate_error}")
-                _trace("fx.unavailable", source=usd_krw_rate_source, error=usd_krw_rate_error)
-            else:
-                _trace("fx.ready", usd_krw_rate=usd_krw_rate, source=usd_krw_rate_source)
-
-            # reserve_cash 계산(USD): 환율이 유효할 때만 KRW→USD 변환
-            if reserve_cash_krw > 0:
-                if usd_krw_rate > 0:
-                    reserve_cash = (reserve_cash_krw / usd_krw_rate)
-                else:
-                    # 환율이 없으면 매수는 스킵되므로 reserve_cash는 0(또는 legacy)로 안전하게 둔다.
-                    reserve_cash = reserve_cash_usd_legacy if reserve_cash_usd_legacy > 0 else 0.0
-            else:
-                reserve_cash = reserve_cash_usd_legacy
+            # USD/KRW 환율은 매수 예산 산정에만 쓰이므로 실제 매수 후보가 있을 때 조회한다(5. 매수 실행).
+            # - 매수 후보가 없거나 매도 전용 실행이면 환율 조회(KIS/FDR 네트워크)를 생략한다.
+            usd_krw_rate = 0.0
+            usd_krw_rate_source = None
+            usd_krw_rate_error = None
+            reserve_cash = reserve_cash_usd_legacy
             max_hold_days = int(strategy.get("max_hold_days", 0) or 0)
             # 시장가에 가깝게 체결시키기 위한 슬리피지(%) - 지정가만 사용하는 구조에서 체결률을 높이기 위함
             slippage_pct = float(strategy.get("slippage_pct", 0.5) or 0.5)
+            # 매수 방식(키움 참고):
+            # - mock: 호가 API 미지원이므로 기존처럼 (현재가 + 슬리피지) 지정가
+            # - real: 매도 1호가부터 단계적으로 지정가 매수(미체결이면 다음 호가), 가드(최대 허용 프리미엄%) 적용
+            # (종목 루프마다 재조회하지 않도록 실행 시작 시 1회만 파싱)
+            buy_order_method = (strategy.get("buy_order_method") or ("limit_ask_ladder" if mode == "real" else "limit_slippage")).strip()
+            limit_buy_max_premium_pct = float(strategy.get("limit_buy_max_premium_pct", 1.0) or 1.0)
+            limit_buy_max_levels = int(strategy.get("limit_buy_max_levels", 5) or 5)
+            limit_buy_step_wait_sec = float(strategy.get("limit_buy_step_wait_sec", 1.0) or 1.0)
             
             log.info(f"=== 자동매매 엔진 실행 시작 ({mode} 모드) ===")
-            log.info(f"전략: top_n={top_n}, reserve_cash_usd≈${reserve_cash:.2f} (reserve_cash_krw={reserve_cash_krw:.0f}, usd_krw_rate={usd_krw_rate} [{usd_krw_rate_source}]), 익절 {take_profit_pct}%, 손절 {stop_loss_pct}%")
-            if not allow_buy:
-                log.warning(f"[Engine] USD/KRW 환율 자동조회 실패 → 매수는 취소(스킵)하고 매도 조건만 실행합니다. source={usd_krw_rate_source}, error={usd_krw_rate_error}")
+            log.info(f"전략: top_n={top_n}, reserve_cash_krw={reserve_cash_krw:.0f}, 익절 {take_profit_pct}%, 손절 {stop_loss_pct}%")
 
             # 실행 스냅샷(해외주식 기준: USD 예산/환율/주문방식이 핵심)
             history["snapshot"] = {
@@ -714,24 +1217,20 @@ class TradingEngine:
                     "slippage_pct": slippage_pct,
                     "reserve_cash_krw": reserve_cash_krw,
                     "reserve_cash_usd": reserve_cash,
-                    "buy_order_method": (strategy.get("buy_order_method") or ("limit_ask_ladder" if mode == "real" else "limit_slippage")).strip(),
-                    "limit_buy_max_premium_pct": float(strategy.get("limit_buy_max_premium_pct", 1.0) or 1.0),
-                    "limit_buy_max_levels": int(strategy.get("limit_buy_max_levels", 5) or 5),
-                    "limit_buy_step_wait_sec": float(strategy.get("limit_buy_step_wait_sec", 1.0) or 1.0),
+                    "buy_order_method": buy_order_method,
+                    "limit_buy_max_premium_pct": limit_buy_max_premium_pct,
+                    "limit_buy_max_levels": limit_buy_max_levels,
+                    "limit_buy_step_wait_sec": limit_buy_step_wait_sec,
                 },
+                # 환율은 매수 단계에서 조회 후 갱신(매수 후보가 없으면 not_fetched로 남는다)
                 "fx": {
-                    "usd_krw_rate": usd_krw_rate,
-                    "source": usd_krw_rate_source,
-                    "error": usd_krw_rate_error,
-                    "allow_buy": allow_buy,
+                    "usd_krw_rate": None,
+                    "source": "not_fetched",
+                    "error": None,
+                    "allow_buy": None,
                 },
             }
 
-            # 1. 거래 가능 시간 체크
-            if not self.is_market_open():
-                log.info("[Engine] 현재 거래 가능 시간이 아닙니다. (22:00 ~ 07:00)")
-                return
-
             # 2. 잔고 조회
             balance_info = kis_order.get_balance(mode=mode, caller="ENGINE")
             if not balance_info:
@@ -748,40 +1247,48 @@ class TradingEngine:
             store = PositionStore(mode)
             history_store = ExecutionHistoryStore(mode=mode)
             held_symbols = []
-            for stock in output1:
-                if not stock['ovrs_pdno']: continue
+            # 잔고 기반 보유/누락 갱신은 종목 수만큼 저장하지 않고 batch 종료 시 1회 저장
+            with store.batch():
+                for stock in output1:
+                    if not stock['ovrs_pdno']: continue
                 
-                symbol = stock['ovrs_pdno']
-                try:
-                    qty = int(float(stock.get('ovrs_cblc_qty') or 0))
-                except Exception:
-                    qty = 0
-                try:
-                    ord_psbl_qty = int(float(stock.get('ord_psbl_qty') or 0))
-                except Exception:
-                    ord_psbl_qty = 0
-                profit_rate = float(stock['evlu_pfls_rt'])
-                exch = stock.get("ovrs_excg_cd") or "NASD"
+                    # 종목코드 intern: my_stocks/held_set/이력 매칭에서 같은 객체를 공유해 비교 비용 절감
+                    symbol = stock['ovrs_pdno']
+                    if isinstance(symbol, str):
+                        symbol = sys.intern(symbol)
+                    try:
+                        qty = int(float(stock.get('ovrs_cblc_qty') or 0))
+                    except Exception:
+                        qty = 0
+                    try:
+                        ord_psbl_qty = int(float(stock.get('ord_psbl_qty') or 0))
+                    except Exception:
+                        ord_psbl_qty = 0
+                    profit_rate = float(stock['evlu_pfls_rt'])
+                    exch = stock.get("ovrs_excg_cd") or "NASD"
+                    # 잔고 응답의 현재가(now_pric2): 매도 지정가 폴백 시 시세 재조회 없이 사용
+                    now_px = _to_float(stock.get("now_pric2"))
                 
-                if qty > 0:
-                    held_symbols.append(symbol)
-                    my_stocks[symbol] = {
-                        'qty': qty,
-                        'ord_psbl_qty': ord_psbl_qty,
-                        'profit_rate': profit_rate,
-                        'name': stock['ovrs_item_name'],
-                        'exchange': exch,
-                    }
-
-                # 보유기간 추적(최초 감지일/추가매수 시점 기록)
-                store.upsert(symbol=symbol, qty=qty, exchange=exch)
-
-            # 잔고에 없는 종목은 store에서도 정리(일시 누락 유예)
-            for sym in store.all_symbols():
-                if sym not in my_stocks:
-                    miss = store.mark_missing(sym)
-                    if miss >= 2:
-                        store.upsert(symbol=sym, qty=0)
+                    if qty > 0:
+                        held_symbols.append(symbol)
+                        my_stocks[symbol] = {
+                            'qty': qty,
+                            'ord_psbl_qty': ord_psbl_qty,
+                            'profit_rate': profit_rate,
+                            'name': stock['ovrs_item_name'],
+                            'exchange': exch,
+                            'price': now_px,
+                        }
+
+                    # 보유기간 추적(최초 감지일/추가매수 시점 기록)
+                    store.upsert(symbol=symbol, qty=qty, exchange=exch)
+
+                # 잔고에 없는 종목은 store에서도 정리(일시 누락 유예)
+                for sym in store.all_symbols():
+                    if sym not in my_stocks:
+                        miss = store.mark_missing(sym)
+                        if miss >= 2:
+                            store.upsert(symbol=sym, qty=0)
 
             # 보유기간 보정: v1_007(주문체결내역) 동기화는 실전만 수행
             # - mock에서는 ExecutionHistoryStore로 보유기간을 계산하므로 불필요 호출을 생략한다.
@@ -813,7 +1320,7 @@ class TradingEngine:
                     import json
                     cache_path.parent.mkdir(parents=True, exist_ok=True)
                     payload = {
-                        "updated_at": datetime.now().isoformat(timespec="seconds"),
+                        "updated_at": _iso_now_second(),
                         "dates": dates,
                     }
                     tmp = cache_path.with_suffix(cache_path.suffix + ".tmp")
@@ -825,26 +1332,24 @@ class TradingEngine:
             cache_dates = _read_last_buy_cache()
             try:
                 if mode != "mock":
-                    today = datetime.now().strftime("%Y%m%d")
-                    now_dt = datetime.now()
                     # api_sync_day가 오늘이어도, open_date가 detect(임시값)로 남아있으면 다시 동기화한다.
                     needs_sync = False
                     if held_symbols and (store.get_api_sync_day() != today):
                         needs_sync = True
                     if held_symbols and (not needs_sync):
-                        for sym in held_symbols:
-                            try:
-                                if (store.get_open_date_source(sym) or "detect") != "api":
-                                    needs_sync = True
-                                    break
-                            except Exception:
-                                continue
+                        try:
+                            sources = store.get_open_date_sources()
+                            needs_sync = any(
+                                (sources.get(_norm_symbol(sym)) or "detect") != "api" for sym in held_symbols
+                            )
+                        except Exception:
+                            pass
 
                     retry_at = store.get_api_retry_at()
                     retry_due = False
                     if retry_at:
                         try:
-                            retry_due = now_dt >= datetime.fromisoformat(retry_at)
+                            retry_due = now >= datetime.fromisoformat(retry_at)
                         except Exception:
                             retry_due = True
                     if (not needs_sync) and held_symbols and retry_due:
@@ -855,7 +1360,7 @@ class TradingEngine:
                         rows = []
                         for lookback_days in (60, 30, 14):
                             end = today
-                            start = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y%m%d")
+                            start = _yyyymmdd(now - timedelta(days=lookback_days))
                             hist = kis_order.get_order_history(
                                 start_date=start,
                                 end_date=end,
@@ -869,143 +1374,92 @@ class TradingEngine:
                                 rows = rows if isinstance(rows, list) else [rows]
                                 break
 
-                        def _as_yyyymmdd(v: str | None) -> str | None:
-                            if not v:
-                                return None
-                            vv = str(v).strip().replace("-", "").replace(".", "")
-                            return vv if len(vv) == 8 and vv.isdigit() else None
-
-                        def _is_buy(row: dict) -> bool:
-                            # 가이드: sll_buy_dvsn_cd = 02 (매수)
-                            cd = str(
-                                row.get("sll_buy_dvsn_cd")
-                                or row.get("SLL_BUY_DVSN_CD")
-                                or row.get("sll_buy_dvsn")
-                                or row.get("SLL_BUY_DVSN")
-                                or ""
-                            ).strip()
-                            if cd in ("02", "2"):
-                                return True
-                            v = str(
-                                row.get("sll_buy_dvsn_name")
-                                or row.get("sll_buy_dvsn_cd_name")
-                                or row.get("sll_buy_dvsn_name")
-                                or ""
-                            ).strip().lower()
-                            if ("buy" in v) or ("매수" in v):
-                                return True
-                            return False
-
-                        def _filled_qty(row: dict) -> float:
-                            for k in (
-                                "ft_ccld_qty",
-                                "ccld_qty",
-                                "CCLD_QTY",
-                                "ccld_qty1",
-                                "ccld_qty2",
-                                "tot_ccld_qty",
-                                "tot_ccld_qty1",
-                                "ft_ord_qty",
-                            ):
-                                if k in row and row.get(k) is not None:
-                                    try:
-                                        return float(str(row.get(k)).replace(",", ""))
-                                    except Exception:
-                                        pass
-                            return 0.0
-
                         last_buy_date: dict[str, str] = {}
                         held_set = set(held_symbols)
                         for r in rows:
                             if not isinstance(r, dict):
                                 continue
-                            sym = (r.get("pdno") or r.get("PDNO") or r.get("ovrs_pdno") or "").strip().upper()
-                            if not sym or sym not in held_set:
+                            # 보유하지 않은 종목 행은 정규화 전에 걸러낸다(응답 티커는 대부분 이미 정규화된 값)
+                            raw_sym = _first(r, _HIST_PDNO_KEYS)
+                            sym = raw_sym if raw_sym in held_set else _norm_symbol(raw_sym)
+                            if sym not in held_set:
                                 continue
-                            if _filled_qty(r) <= 0:
+                            sym = sys.intern(sym)
+                            # 문자열 비교만 하는 매수 판정/일자 파싱을 먼저, 수량 float 변환은 마지막에
+                            if not _hist_is_buy(r):
                                 continue
-                            if not _is_buy(r):
-                                continue
-                            # 가이드: ord_dt(주문일자)를 우선 사용
-                            d = _as_yyyymmdd(
-                                r.get("ccld_dt")
-                                or r.get("CCLD_DT")
-                                or r.get("ord_dt")
-                                or r.get("ORD_DT")
-                                or r.get("trad_day")
-                                or r.get("TRAD_DAY")
-                            )
+                            d = _as_yyyymmdd(_first(r, _HIST_DATE_KEYS))
                             if not d:
                                 continue
+                            if _hist_filled_qty(r) <= 0:
+                                continue
                             cur = last_buy_date.get(sym)
                             if (cur is None) or (d > cur):
                                 last_buy_date[sym] = d
 
                         if hist is not None:
                             updated_any = False
-                            for sym, d in last_buy_date.items():
-                                store.set_open_date(symbol=sym, open_date=d, source="api")
-                                updated_any = True
+                            with store.batch():
+                                for sym, d in last_buy_date.items():
+                                    store.set_open_date(symbol=sym, open_date=d, source="api")
+                                    updated_any = True
+                                # 동기화가 실제로 성공(업데이트 발생)했을 때만 api_sync_day 갱신
+                                if updated_any:
+                                    store.set_api_sync_day(today)
+                                store.clear_api_retry()
                             last_buy_date_map = last_buy_date
                             if last_buy_date:
                                 cache_dates.update(last_buy_date)
                                 _write_last_buy_cache(cache_dates)
-                            # 동기화가 실제로 성공(업데이트 발생)했을 때만 api_sync_day 갱신
-                            if updated_any:
-                                store.set_api_sync_day(today)
-                            store.clear_api_retry()
                             # 일부 종목 누락 시 개별 조회로 보강 (페이지 제한/정렬 문제 대응)
                             missing = set(held_symbols) - set(last_buy_date.keys())
                             if missing:
-                                for sym in sorted(missing):
-                                    fetched = None
-                                    for lookback_days in (60, 30, 14):
-                                        end = today
-                                        start = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y%m%d")
-                                        h2 = kis_order.get_order_history(
-                                            start_date=start,
-                                            end_date=end,
-                                            pdno=sym,
-                                            sll_buy_dvsn="02",
-                                            ccld_nccs_dvsn="01",
-                                            mode=mode,
-                                            caller="ENGINE",
-                                        )
-                                        if h2 is None:
-                                            continue
-                                        r2 = h2.get("output") or h2.get("output1") or []
-                                        r2 = r2 if isinstance(r2, list) else [r2]
-                                        for rr in r2:
-                                            if not isinstance(rr, dict):
-                                                continue
-                                            d2 = _as_yyyymmdd(
-                                                rr.get("ccld_dt")
-                                                or rr.get("CCLD_DT")
-                                                or rr.get("ord_dt")
-                                                or rr.get("ORD_DT")
-                                                or rr.get("trad_day")
-                                                or rr.get("TRAD_DAY")
+                                # 종목별 보강 결과는 루프 종료 시 1회 저장
+                                with store.batch():
+                                    for sym in sorted(missing):
+                                        fetched = None
+                                        for lookback_days in (60, 30, 14):
+                                            end = today
+                                            start = _yyyymmdd(now - timedelta(days=lookback_days))
+                                            h2 = kis_order.get_order_history(
+                                                start_date=start,
+                                                end_date=end,
+                                                pdno=sym,
+                                                sll_buy_dvsn="02",
+                                                ccld_nccs_dvsn="01",
+                                                mode=mode,
+                                                caller="ENGINE",
                                             )
-                                            if d2 and ((fetched is None) or (d2 > fetched)):
-                                                fetched = d2
+                                            if h2 is None:
+                                                continue
+                                            r2 = h2.get("output") or h2.get("output1") or []
+                                            r2 = r2 if isinstance(r2, list) else [r2]
+                                            for rr in r2:
+                                                if not isinstance(rr, dict):
+                                                    continue
+                                                d2 = _as_yyyymmdd(_first(rr, _HIST_DATE_KEYS))
+                                                if d2 and ((fetched is None) or (d2 > fetched)):
+                                                    fetched = d2
+                                            if fetched:
+                                                break
                                         if fetched:
-                                            break
-                                    if fetched:
-                                        store.set_open_date(symbol=sym, open_date=fetched, source="api")
-                                        last_buy_date_map[sym] = fetched
-                                        cache_dates[sym] = fetched
+                                            store.set_open_date(symbol=sym, open_date=fetched, source="api")
+                                            last_buy_date_map[sym] = fetched
+                                            cache_dates[sym] = fetched
                                 if missing:
                                     _write_last_buy_cache(cache_dates)
                         else:
                             # 실패: 다음 재시도 스케줄
-                            store.set_api_last_error("v1_007_failed")
-                            store.set_api_retry_at((now_dt + timedelta(minutes=20)).isoformat(timespec="seconds"))
+                            with store.batch():
+                                store.set_api_last_error("v1_007_failed")
+                                store.set_api_retry_at((now + timedelta(minutes=20)).isoformat(timespec="seconds"))
             except Exception:
                 pass
             if (mode != "mock") and (not last_buy_date_map) and cache_dates:
                 last_buy_date_map = cache_dates
 
             # 3. 분석 데이터 수신 (즉시실행/미리보기에서 전달되면 그것을 사용)
+            # (계약) 분석서버 호출은 analysis_data 미전달 시에만: 전달된 데이터가 있으면 네트워크 없이 진행
             if analysis_data is None:
                 _trace("analysis.fetch.start")
                 analysis_data = self.get_analysis_data(trace_cb=_trace)
@@ -1024,7 +1478,7 @@ class TradingEngine:
             # (C) '오늘 실행 마킹'은 핵심 사전조건(시장 오픈 + 잔고 조회 + 분석 수신) 이후에 수행
             # - 토큰만 확보한 상태에서 실패하면 "오늘 실행됨"으로 기록되어 하루가 통째로 스킵될 수 있어 위험.
             if (not ignore_auto_enabled):
-                self._mark_scheduled_run_day(mode, datetime.now().strftime("%Y%m%d"))
+                self._mark_scheduled_run_day(mode, today)
                 _trace("run_day.marked")
 
             # run 내부 중복 방지용 상태
@@ -1048,6 +1502,7 @@ class TradingEngine:
                 실전: 특정 종목의 미체결 주문을 선취소하여 다음 주문(특히 매수)을 확보한다.
                 - side_filter: "buy"|"sell"|None
                 - 주의: 자동매매가 사용자 수동주문을 취소할 수 있으므로, 티커 단위로만 제한한다.
+                - 조회/취소 오류는 내부에서 처리하고 취소 건수만 반환한다(예외를 올리지 않음).
                 """
                 if mode != "real":
                     return 0
@@ -1077,23 +1532,28 @@ class TradingEngine:
                     if not odno:
                         continue
                     try:
-                        nccs = int(float(str(r.get("nccs_qty") or r.get("NCCS_QTY") or 0).replace(",", "")))
+                        nccs = int(_to_float(r.get("nccs_qty") or r.get("NCCS_QTY")))
                     except Exception:
                         nccs = 0
                     if nccs <= 0:
                         continue
 
                     _trace("unfilled.cancel.try", exchange=ex2, symbol=sym2, order_no=odno, qty=nccs, side=side_cd)
-                    cncl = kis_order.revise_cancel_order(
-                        exchange=ex2,
-                        symbol=sym2,
-                        origin_order_no=odno,
-                        qty=int(nccs),
-                        price=0,
-                        action="cancel",
-                        mode=mode,
-                        caller="ENGINE",
-                    )
+                    try:
+                        cncl = kis_order.revise_cancel_order(
+                            exchange=ex2,
+                            symbol=sym2,
+                            origin_order_no=odno,
+                            qty=int(nccs),
+                            price=0,
+                            action="cancel",
+                            mode=mode,
+                            caller="ENGINE",
+                        )
+                    except Exception as e:
+                        # 선취소 실패는 다음 주문을 막지 않는다(호출부에서 별도 예외 처리 불필요)
+                        _trace("unfilled.cancel.error", exchange=ex2, symbol=sym2, order_no=odno, error=str(e))
+                        continue
                     _trace("unfilled.cancel.done", exchange=ex2, symbol=sym2, order_no=odno, ok=bool(cncl))
                     if cncl:
                         cancelled += 1
@@ -1141,7 +1601,7 @@ class TradingEngine:
                                 if rsym != sym:
                                     continue
                                 try:
-                                    ccld_qty = int(float(str(r.get("ft_ccld_qty") or 0).replace(",", "")))
+                                    ccld_qty = int(_to_float(r.get("ft_ccld_qty")))
                                 except Exception:
                                     ccld_qty = 0
                                 if ccld_qty >= qty:
@@ -1170,8 +1630,11 @@ class TradingEngine:
                     return out, 0.0, "market_0"
 
                 # 2) 폴백: 현재가 기반 지정가(체결 우선: -슬리피지)
-                px = kis_quote.get_current_price(exchange, symbol, mode=mode, caller="ENGINE") or {}
-                sell_price = float(px.get("last", 0) or 0)
+                # - 잔고 조회 시 받은 현재가를 우선 사용, 없을 때만 종목별 시세 조회
+                sell_price = float((my_stocks.get(symbol) or {}).get("price") or 0)
+                if sell_price <= 0:
+                    px = kis_quote.get_current_price(exchange, symbol, mode=mode, caller="ENGINE") or {}
+                    sell_price = float(px.get("last", 0) or 0)
                 if sell_price <= 0:
                     return None, 0.0, "price_unavailable"
                 sell_price = sell_price * (1.0 - (slippage_pct / 100.0))
@@ -1182,20 +1645,24 @@ class TradingEngine:
             # 4-1. 익절/손절 감시
             sell_orders_sent = 0
             sell_orders = []
-            for symbol, info in my_stocks.items():
-                profit_rate = info['profit_rate']
-                qty = info.get('ord_psbl_qty', 0)
-                exchange = info.get("exchange", "NASD")
+            buy_orders_sent = 0  # 접수 성공(ok) 매수 주문 수(상태 요약용)
+            # 보유 종목을 (원문 코드, 정규화 코드, 주문가능수량, 거래소, 수익률) 튜플로 1회 정리
+            # - 분석 sell 리스트는 정책상 무시하므로 매도 대상은 잔고(my_stocks)뿐이며 키가 곧 중복 제거 기준
+            sell_rows = [
+                (symbol, _norm_symbol(symbol), info.get('ord_psbl_qty', 0), info.get("exchange", "NASD"), info['profit_rate'])
+                for symbol, info in my_stocks.items()
+            ]
+            # 매도 판정(네트워크 호출 없음)과 주문 실행을 분리: 판정 결과를 sell_intents에 모은 뒤 일괄 주문
+            # (symbol, symu, qty, exchange, reason, 로그 라벨, 가격 산출 실패 skip 사유, 이력 추가 필드)
+            sell_intents = []
+            for symbol, symu, qty, exchange, profit_rate in sell_rows:
 
                 # 런 내부 중복 매도 방지 + 장중 손절 감시(StopWatch)와의 충돌 방지(공통 쿨다운)
                 try:
-                    symu = (symbol or "").strip().upper()
                     if symu in sold_symbols:
                         history["skips"].append({"side": "sell", "symbol": symu, "reason": "already_sold_in_run"})
                         continue
-                    now_dt = datetime.now()
-                    last_sw = self._stop_loss_cooldown.get(symu)
-                    if last_sw and (now_dt - last_sw) < timedelta(minutes=5):
+                    if symu in self._stop_loss_cooldown:
                         history["skips"].append({"side": "sell", "symbol": symu, "reason": "sell_cooldown_recent"})
                         continue
                 except Exception:
@@ -1209,72 +1676,19 @@ class TradingEngine:
                 # 익절 조건
                 if profit_rate >= take_profit_pct:
                     log.info(f"[Engine] 익절 조건 만족: {symbol} ({profit_rate}% >= {take_profit_pct}%)")
-                    try:
-                        _cancel_unfilled_for_symbol(exchange, symbol)
-                    except Exception:
-                        pass
-                    out, sell_price, method = _submit_sell_market_first(symbol, qty, exchange, "take_profit")
-                    if not out and method == "price_unavailable":
-                        log.warning(f"[Engine] {symbol} 매도가 산출 실패(현재가 0)로 익절 매도 스킵")
-                        history["skips"].append({"side": "sell", "symbol": symbol, "reason": "take_profit_price_unavailable"})
-                    else:
-                        history["sell_attempts"].append({
-                            "symbol": symbol,
-                            "exchange": exchange,
-                            "qty": qty,
-                            "price": sell_price,
-                            "reason": "take_profit",
-                            "profit_rate": profit_rate,
-                            "take_profit_pct": take_profit_pct,
-                            "stop_loss_pct": stop_loss_pct,
-                            "method": method,
-                            "order_no": (out or {}).get("ODNO") or (out or {}).get("odno"),
-                            "ok": bool(out),
-                        })
-                        if out:
-                            sell_orders_sent += 1
-                            sell_orders.append({"symbol": symbol, "qty": qty})
-                            try:
-                                sold_symbols.add((symbol or "").strip().upper())
-                                self._stop_loss_cooldown[(symbol or "").strip().upper()] = datetime.now()
-                            except Exception:
-                                pass
-                    # 매도했으므로 my_stocks에서 제거해야 중복 매도 방지되나, API 호출 텀이 있으므로 생략
+                    sell_intents.append((
+                        symbol, symu, qty, exchange, "take_profit", "익절", "take_profit_price_unavailable",
+                        {"profit_rate": profit_rate, "take_profit_pct": take_profit_pct, "stop_loss_pct": stop_loss_pct},
+                    ))
                     continue
                     
                 # 손절 조건: 입력값 그대로 비교 (stop_loss_pct는 보통 음수)
                 if profit_rate <= stop_loss_pct:
                     log.info(f"[Engine] 손절 조건 만족: {symbol} ({profit_rate}% <= {stop_loss_pct}%)")
-                    try:
-                        _cancel_unfilled_for_symbol(exchange, symbol)
-                    except Exception:
-                        pass
-                    out, sell_price, method = _submit_sell_market_first(symbol, qty, exchange, "stop_loss")
-                    if not out and method == "price_unavailable":
-                        log.warning(f"[Engine] {symbol} 매도가 산출 실패(현재가 0)로 손절 매도 스킵")
-                        history["skips"].append({"side": "sell", "symbol": symbol, "reason": "stop_loss_price_unavailable"})
-                    else:
-                        history["sell_attempts"].append({
-                            "symbol": symbol,
-                            "exchange": exchange,
-                            "qty": qty,
-                            "price": sell_price,
-                            "reason": "stop_loss",
-                            "profit_rate": profit_rate,
-                            "take_profit_pct": take_profit_pct,
-                            "stop_loss_pct": stop_loss_pct,
-                            "method": method,
-                            "order_no": (out or {}).get("ODNO") or (out or {}).get("odno"),
-                            "ok": bool(out),
-                        })
-                        if out:
-                            sell_orders_sent += 1
-                            sell_orders.append({"symbol": symbol, "qty": qty})
-                            try:
-                                sold_symbols.add((symbol or "").strip().upper())
-                                self._stop_loss_cooldown[(symbol or "").strip().upper()] = datetime.now()
-                            except Exception:
-                                pass
+                    sell_intents.append((
+                        symbol, symu, qty, exchange, "stop_loss", "손절", "stop_loss_price_unavailable",
+                        {"profit_rate": profit_rate, "take_profit_pct": take_profit_pct, "stop_loss_pct": stop_loss_pct},
+                    ))
                     continue
 
                 # 보유기간 초과 강제매도
@@ -1287,7 +1701,6 @@ class TradingEngine:
                         open_date = None
                     # ExecutionHistoryStore에 없으면 fallback (실전: v1_007 API 결과, 모의: 재시도)
                     if not open_date:
-                        symu = (symbol or "").strip().upper()
                         if mode != "mock":
                             open_date = last_buy_date_map.get(symu)
                         else:
@@ -1300,39 +1713,63 @@ class TradingEngine:
                         continue
                     if open_date and len(open_date) == 8:
                         try:
-                            od = datetime.strptime(open_date, "%Y%m%d").date()
-                            days_held = (datetime.now().date() - od).days
+                            od = _parse_yyyymmdd(open_date)
+                            days_held = (today_date - od).days
                             if days_held >= max_hold_days:
                                 log.info(f"[Engine] 보유기간 초과 매도: {symbol} ({days_held}d >= {max_hold_days}d)")
-                                try:
-                                    _cancel_unfilled_for_symbol(exchange, symbol)
-                                except Exception:
-                                    pass
-                                out, sell_price, method = _submit_sell_market_first(symbol, qty, exchange, "max_hold_days")
-                                if not out and method == "price_unavailable":
-                                    log.warning(f"[Engine] {symbol} 매도가 산출 실패(현재가 0)로 보유기간 매도 스킵")
-                                    history["skips"].append({"side": "sell", "symbol": symbol, "reason": "max_hold_price_unavailable"})
-                                else:
-                                    history["sell_attempts"].append({
-                                        "symbol": symbol,
-                                        "exchange": exchange,
-                                        "qty": qty,
-                                        "price": sell_price,
-                                        "reason": "max_hold_days",
-                                        "holding_days": days_held,
-                                        "max_hold_days": max_hold_days,
-                                        "method": method,
-                                        "order_no": (out or {}).get("ODNO") or (out or {}).get("odno"),
-                                        "ok": bool(out),
-                                    })
-                                    if out:
-                                        sell_orders_sent += 1
-                                        sell_orders.append({"symbol": symbol, "qty": qty})
-                                        try:
-                                            sold_symbols.add((symbol or "").strip().upper())
-                                            self._stop_loss_cooldown[(symbol or "").strip().upper()] = datetime.now()
-                                        except Exception:
-                                            pass
+                                sell_intents.append((
+                                    symbol, symu, qty, exchange, "max_hold_days", "보유기간", "max_hold_price_unavailable",
+                                    {"holding_days": days_held, "max_hold_days": max_hold_days},
+                                ))
+                        except Exception:
+                            pass
+
+            # 4-2. 매도 주문 일괄 실행
+            # - 종목별 매도는 서로 독립이므로 소수 워커로 병렬 처리하고, 호출 간격은 매수와 같은 토큰 버킷으로 제한
+            # - 이력/쿨다운/카운터 기록은 워커 밖에서 판정 순서대로 수행
+            if sell_intents:
+                # 미체결 선취소용 거래소별 목록을 먼저 채워 워커 간 중복 조회 방지(실전만 조회)
+                for ex in {it[3] for it in sell_intents}:
+                    try:
+                        _get_unfilled_cached(ex)
+                    except Exception:
+                        pass
+
+                def _sell_intent(symbol: str, qty: int, exchange: str, reason: str):
+                    _cancel_unfilled_for_symbol(exchange, symbol)
+                    self._kis_limiter.acquire()
+                    return _submit_sell_market_first(symbol, qty, exchange, reason)
+
+                # 전부 제출한 뒤 결과는 판정 순서대로 수거(체결 대기 전 모든 주문 응답 확보)
+                sell_futs = [self._order_pool.submit(_sell_intent, it[0], it[2], it[3], it[4]) for it in sell_intents]
+                for (symbol, symu, qty, exchange, reason, label, price_skip, extra), fut in zip(sell_intents, sell_futs):
+                    try:
+                        out, sell_price, method = fut.result()
+                    except Exception as e:
+                        log.error(f"[Engine] {symbol} {label} 매도 주문 오류: {e}")
+                        history["skips"].append({"side": "sell", "symbol": symbol, "reason": f"{reason}_order_error"})
+                        continue
+                    if not out and method == "price_unavailable":
+                        log.warning(f"[Engine] {symbol} 매도가 산출 실패(현재가 0)로 {label} 매도 스킵")
+                        history["skips"].append({"side": "sell", "symbol": symbol, "reason": price_skip})
+                        continue
+                    history["sell_attempts"].append(OrderAttempt(
+                        symbol=symbol,
+                        exchange=exchange,
+                        qty=qty,
+                        price=sell_price,
+                        reason=reason,
+                        method=method,
+                        order_no=_odno(out),
+                        ok=bool(out),
+                        **extra,
+                    ))
+                    if out:
+                        sell_orders_sent += 1
+                        sell_orders.append({"symbol": symbol, "qty": qty})
+                        try:
+                            sold_symbols.add(symu)
+                            self._stop_loss_cooldown.mark(symu)
                         except Exception:
                             pass
 
@@ -1344,14 +1781,7 @@ class TradingEngine:
                 _wait_for_sell_execution(sell_orders, max_wait_time=30)
                 time_module.sleep(5.0)
                 try:
-                    present_after_sell = kis_order.get_present_balance(
-                        natn_cd="000",
-                        tr_mket_cd="00",
-                        inqr_dvsn_cd="00",
-                        wcrc_frcr_dvsn_cd="02",
-                        caller="ENGINE",
-                        mode=mode
-                    )
+                    present_after_sell = self._get_present_balance(mode)
                 except Exception:
                     present_after_sell = None
 
@@ -1359,7 +1789,49 @@ class TradingEngine:
             if not buy_list:
                 log.info("[Engine] 매수 대상 종목이 없습니다.")
             else:
+                # USD/KRW 환율(원/달러): 토큰처럼 "확보 후 진행"이 더 안전하다.
+                # - reserve_cash_krw를 사용(>0)하는 경우에만 환율 확보를 기다린다.
+                if reserve_cash_krw > 0:
+                    fx = self._wait_for_fx_rate(mode=mode, timeout_sec=60, poll_sec=5)
+                else:
+                    # 환율 캐시가 없으면 KIS(v1_008)에서 추출: 예산 산정과 같은 v1_008 응답을 공유(중복 호출 방지)
+                    fx = get_cached_usd_krw_rate() or get_usd_krw_rate(mode=mode, kis_present=(self._get_present_balance(mode) or {}))
+                usd_krw_rate = fx.rate or 0.0
+                usd_krw_rate_source = fx.source
+                usd_krw_rate_error = getattr(fx, "error", None)
+
+                # 환율 자동조회가 실패하면 "매수는 취소, 매도만 실행" 정책 적용
+                # (주의) 환율 실패(0/None) 상태에서 reserve_cash_krw/usd_krw_rate를 먼저 계산하면 0나누기 예외로 프로세스가 죽는다.
+                allow_buy = True
+                if usd_krw_rate <= 0:
+                    allow_buy = False
+                    history["errors"].append(f"fx_rate_unavailable: source={usd_krw_rate_source}, error={usd_krw_rate_error}")
+                    _trace("fx.unavailable", source=usd_krw_rate_source, error=usd_krw_rate_error)
+                else:
+                    _trace("fx.ready", usd_krw_rate=usd_krw_rate, source=usd_krw_rate_source)
+
+                # reserve_cash 계산(USD): 환율이 유효할 때만 KRW→USD 변환
+                if reserve_cash_krw > 0:
+                    if usd_krw_rate > 0:
+                        reserve_cash = (reserve_cash_krw / usd_krw_rate)
+                    else:
+                        # 환율이 없으면 매수는 스킵되므로 reserve_cash는 0(또는 legacy)로 안전하게 둔다.
+                        reserve_cash = reserve_cash_usd_legacy if reserve_cash_usd_legacy > 0 else 0.0
+
+                log.info(f"[Engine] 환율: usd_krw_rate={usd_krw_rate} [{usd_krw_rate_source}], reserve_cash_usd≈${reserve_cash:.2f}")
+                try:
+                    history["snapshot"]["strategy"]["reserve_cash_usd"] = reserve_cash
+                    history["snapshot"]["fx"] = {
+                        "usd_krw_rate": usd_krw_rate,
+                        "source": usd_krw_rate_source,
+                        "error": usd_krw_rate_error,
+                        "allow_buy": allow_buy,
+                    }
+                except Exception:
+                    pass
+
                 if not allow_buy:
+                    log.warning(f"[Engine] USD/KRW 환율 자동조회 실패 → 매수는 취소(스킵)하고 매도 조건만 실행합니다. source={usd_krw_rate_source}, error={usd_krw_rate_error}")
                     log.info("[Engine] 매수 스킵: 환율 자동조회 실패로 매수 로직을 실행하지 않습니다.")
                     buy_list = []
                     # 매도는 이미 실행되었으므로 매수만 건너뛰고 종료
@@ -1390,7 +1862,7 @@ class TradingEngine:
                         code = (str(item) or '').strip().upper()
                         exchange = 'NAS'
                     if code:
-                        normalized_buy.append({"code": code, "exchange": exchange})
+                        normalized_buy.append({"code": sys.intern(code), "exchange": exchange})
 
                 if not normalized_buy:
                     log.info("[Engine] 매수 대상 종목이 없습니다.")
@@ -1402,99 +1874,95 @@ class TradingEngine:
                 # 중요: 이미 보유중인 종목이 섞여 있으면, 먼저 제외한 뒤 top_n을 다시 뽑아야
                 # 실제 매수 종목 수가 top_n에 가깝게 나온다.
                 # 키움과 동일하게: 이번 런에서 '매도 성공한 종목'은 재매수 허용
-                candidates = [
-                    x for x in normalized_buy
-                    if x.get("code") and (x.get("code") not in my_stocks or x.get("code") in sold_symbols)
-                ][:top_n]
-                # 제외 사유 기록(사용자 친화 UI용)
-                try:
-                    for x in normalized_buy:
-                        sym = x.get("code")
-                        if not sym:
-                            continue
-                        if sym in my_stocks and sym not in sold_symbols:
-                            history["excluded"]["buy"].append({"symbol": sym, "reason": "already_held"})
-                    # top_n 밖으로 밀린 종목
-                    kept = set([x.get("code") for x in candidates if x.get("code")])
-                    for x in normalized_buy:
-                        sym = x.get("code")
-                        if not sym or (sym in my_stocks and sym not in sold_symbols):
-                            continue
-                        if sym not in kept:
-                            history["excluded"]["buy"].append({"symbol": sym, "reason": "beyond_top_n"})
-                except Exception:
-                    pass
+                # (후보 선정과 제외 사유 기록을 한 번의 순회로 처리: normalized_buy는 code가 항상 채워져 있다)
+                candidates = []
+                kept = set()
+                excluded_held = []
+                excluded_beyond = []
+                for x in normalized_buy:
+                    sym = x["code"]
+                    if sym in my_stocks and sym not in sold_symbols:
+                        excluded_held.append({"symbol": sym, "reason": "already_held"})
+                    elif len(candidates) < top_n:
+                        candidates.append(x)
+                        kept.add(sym)
+                    elif sym not in kept:
+                        # top_n 밖으로 밀린 종목
+                        excluded_beyond.append({"symbol": sym, "reason": "beyond_top_n"})
+                # 제외 사유 기록(사용자 친화 UI용): 기존과 동일하게 보유 제외 → top_n 초과 순서
+                history["excluded"]["buy"].extend(excluded_held)
+                history["excluded"]["buy"].extend(excluded_beyond)
 
                 # autokiwoomstock처럼 "1회 예산 입력"은 사용하지 않고
                 # 계좌의 '총 주문가능금액(USD)' - reserve_cash(USD 환산) 를 이번 실행 예산으로 사용
                 #
                 # - 실전: 해외주식-035(해외증거금 통화별조회) USD의 itgr_ord_psbl_amt(통합주문가능금액) 우선
                 # - 모의: 해외주식-035 미지원 -> v1_008 output3.frcr_use_psbl_amt(외화사용가능금액)로 대체
+                # 우선순위대로 시도해 처음 양수가 나온 값을 사용. 조회 실패(예외)는 다음 순위로 넘어간다.
+                # v1_008(present)은 필요해질 때 1회만 조회(매도 후 재조회 결과가 있으면 그대로 사용)
+                ps_memo: dict[str, dict] = {}
+
+                def _present() -> dict:
+                    if "ps" not in ps_memo:
+                        ps_memo["ps"] = present_after_sell or self._get_present_balance(mode) or {}
+                    return ps_memo["ps"]
+
+                def _cash_035_itgr():
+                    if mode != "real":
+                        return None
+                    fm = self._cached_rpc(
+                        ("foreign_margin", mode),
+                        3.0,
+                        lambda: kis_order.get_foreign_margin(mode=mode, caller="ENGINE"),
+                    ) or {}
+                    usd = _by_ccy(fm.get("output") or []).get("USD")
+                    if not usd or usd.get("itgr_ord_psbl_amt") is None:
+                        return None
+                    return _to_float(usd.get("itgr_ord_psbl_amt"))
+
+                def _cash_008_out2_usd():
+                    usd_row = _by_ccy(_present().get("output2") or []).get("USD")
+                    if not usd_row:
+                        return None
+                    return _to_float(usd_row.get("frcr_drwg_psbl_amt_1") or usd_row.get("frcr_dncl_amt_2"))
+
+                def _cash_008_frcr_use():
+                    return _to_float((_present().get("output3") or {}).get("frcr_use_psbl_amt"))
+
+                def _cash_mock_est_available_krw():
+                    # 총자산(원화)에서 매입금액합계(원화)를 뺀 금액을 환율로 나눈 값(마이너스도 허용)
+                    # - pchs_amt_smtl 또는 pchs_amt_smtl_amt 사용 (v1_008 output3) - 모의투자 서버에서 실제 값 제공
+                    # - 환율은 매수 분기 진입 시 확보·검증(>0)한 값(여기까지 왔으면 allow_buy)
+                    out3 = _present().get("output3") or {}
+                    tot_asst_krw = _to_float(out3.get("tot_asst_amt"))
+                    pchs_amt_smtl_krw = _to_float(out3.get("pchs_amt_smtl") or out3.get("pchs_amt_smtl_amt"))
+                    return (tot_asst_krw - pchs_amt_smtl_krw) / usd_krw_rate
+
                 orderable_cash = 0.0
                 orderable_source = None
-                try:
-                    if mode == "real":
-                        fm = kis_order.get_foreign_margin(mode=mode, caller="ENGINE") or {}
-                        rows = fm.get("output") or []
-                        rows = rows if isinstance(rows, list) else [rows]
-                        usd = None
-                        for r in rows:
-                            if isinstance(r, dict) and (str(r.get("crcy_cd") or "").strip().upper() == "USD"):
-                                usd = r
-                                break
-                        if usd and usd.get("itgr_ord_psbl_amt") is not None:
-                            orderable_cash = float(str(usd.get("itgr_ord_psbl_amt") or 0).replace(",", ""))
-                            if orderable_cash > 0:
-                                orderable_source = "035_itgr"
-
-                    if orderable_cash <= 0:
-                        ps = (present_after_sell or kis_order.get_present_balance(
-                            natn_cd="000",
-                            tr_mket_cd="00",
-                            inqr_dvsn_cd="00",
-                            wcrc_frcr_dvsn_cd="02",
-                            caller="ENGINE",
-                            mode=mode
-                        ) or {})
-                        out2 = ps.get("output2") or []
-                        out2 = out2 if isinstance(out2, list) else [out2]
-                        usd_row = None
-                        for r in out2:
-                            if isinstance(r, dict) and (str(r.get("crcy_cd") or "").strip().upper() == "USD"):
-                                usd_row = r
-                                break
-                        if usd_row:
-                            v = usd_row.get("frcr_drwg_psbl_amt_1") or usd_row.get("frcr_dncl_amt_2") or 0
-                            orderable_cash = float(str(v or 0).replace(",", ""))
-                            if orderable_cash > 0:
-                                orderable_source = "008_out2_usd"
-                        if orderable_cash <= 0:
-                            out3 = ps.get("output3") or {}
-                            orderable_cash = float(str(out3.get("frcr_use_psbl_amt") or 0).replace(",", ""))
-                            if orderable_cash > 0:
-                                orderable_source = "008_frcr_use"
-                        # mock 마지막 fallback: 총자산(원화)에서 매입금액합계(원화)를 뺀 금액을 환율로 나눠서 주문가능 예산 계산
-                        if mode == "mock" and orderable_cash <= 0:
-                            try:
-                                # 이미 산출한 자동 환율(없으면 설정값 fallback)을 사용
-                                usd_krw_rate = float(str(usd_krw_rate or 1350.0).replace(",", ""))
-                                out3 = (ps.get("output3") or {}) if isinstance(ps, dict) else {}
-                                tot_asst_krw = float(str(out3.get("tot_asst_amt") or 0).replace(",", ""))
-                                # pchs_amt_smtl 또는 pchs_amt_smtl_amt 사용 (v1_008 output3) - 모의투자 서버에서 실제 값 제공
-                                pchs_amt_smtl_krw = float(str(out3.get("pchs_amt_smtl") or out3.get("pchs_amt_smtl_amt") or 0).replace(",", ""))
-                                # 총자산에서 매입금액합계를 뺀 금액이 실제 주문가능 예산 (마이너스도 허용)
-                                available_krw = tot_asst_krw - pchs_amt_smtl_krw
-                                if usd_krw_rate > 0:
-                                    orderable_cash = available_krw / usd_krw_rate
-                                    orderable_source = "mock_est_available_krw"
-                                else:
-                                    orderable_cash = 0.0
-                                    orderable_source = "mock_est_available_krw_zero"
-                            except Exception:
-                                pass
-                except Exception:
-                    orderable_cash = 0.0
-                    orderable_source = None
+                for label, fn in (
+                    ("035_itgr", _cash_035_itgr),
+                    ("008_out2_usd", _cash_008_out2_usd),
+                    ("008_frcr_use", _cash_008_frcr_use),
+                ):
+                    try:
+                        v = fn()
+                    except Exception:
+                        v = None
+                    if v is None:
+                        continue
+                    orderable_cash = v
+                    if v > 0:
+                        orderable_source = label
+                        break
+                else:
+                    # mock 마지막 fallback: 결과가 0 이하여도 그대로 예산으로 사용
+                    if mode == "mock":
+                        try:
+                            orderable_cash = _cash_mock_est_available_krw()
+                            orderable_source = "mock_est_available_krw"
+                        except Exception:
+                            pass
 
                 total_budget = orderable_cash - reserve_cash  # 마이너스도 허용 (매수 로직에서 0 이하 체크)
                 per_stock_budget = total_budget / len(candidates) if candidates else 0.0
@@ -1530,13 +1998,282 @@ class TradingEngine:
                     history["message"] = "buy_budget_insufficient"
                     return
 
+                # 후보별 현재가는 서로 독립적이므로 예산 확인이 끝나면 병렬 조회를 시작한다(조기 종료 시 호출 낭비 방지).
+                # - 조회마다 _kis_limiter를 통과시켜 매수 루프/주문과 같은 초당 한도를 공유한다(EGW00201 동시 재시도 방지).
+                # - 결과는 (조회 완료 시각, 시세)로 받아 매수 루프에서 오래된 값은 재조회한다(가격 힌트로만 사용).
+                # - 매수가능조회(v1_014)/주문은 앞선 주문으로 줄어든 예수금에 의존하므로 종목 순서대로 순차 유지
+                def _fetch_quote(ex: str, sym: str):
+                    self._kis_limiter.acquire()
+                    info = kis_quote.get_current_price(ex, sym, mode=mode, caller="ENGINE")
+                    return time_module.monotonic(), info
+
+                quote_keys = []
+                for item in candidates:
+                    symu = _norm_symbol(item["code"])
+                    if (symu in my_stocks) and (symu not in sold_symbols):
+                        continue
+                    key = (item["exchange"], item["code"])
+                    if key not in quote_keys:
+                        quote_keys.append(key)
+                quote_futs = {}
+                if quote_keys:
+                    _trace("buy.quote.prefetch", count=len(quote_keys))
+                    workers = max(1, min(_BUY_QUOTE_MAX_WORKERS, len(quote_keys)))
+                    quote_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="buy-quote")
+                    try:
+                        for ex, sym in quote_keys:
+                            quote_futs[(ex, sym)] = quote_pool.submit(_fetch_quote, ex, sym)
+                    finally:
+                        # 제출된 조회는 끝까지 수행하고 스레드는 자동 종료(여기서 기다리지 않음)
+                        quote_pool.shutdown(wait=False)
+
+                # 호가 단계 매수(실전): 실행마다 1회 정의하고 종목별 상태는 인자로 전달(종목 루프마다 클로저 재생성 방지)
+                def _buy_with_ask_ladder(
+                    symbol: str, exchange: str, qty: int, current_price: float, max_ps_qty: int | None
+                ) -> tuple[bool, str]:
+                    nonlocal buy_orders_sent
+                    # 직전 매수가능수량 조회 (가격, 수량): 진입 전 current_price 기준 조회 결과에서 시작
+                    last_ps_price, last_ps_qty = float(current_price), max_ps_qty
+                    # 1) 호가 조회
+                    ob = kis_quote.get_asking_price(exchange, symbol, mode=mode, caller="ENGINE")
+                    if not ob:
+                        log.warning(f"[Engine] {symbol} 호가 조회 실패 → 슬리피지 지정가로 폴백")
+                        _trace("buy.ladder.hoga_failed", symbol=symbol, exchange=exchange)
+                        return False, "ask_api_failed"
+                    asks = _extract_asks(ob)
+                    if not asks:
+                        log.warning(f"[Engine] {symbol} 호가 데이터 없음 → 슬리피지 지정가로 폴백")
+                        _trace("buy.ladder.hoga_empty", symbol=symbol, exchange=exchange)
+                        return False, "asks_empty"
+
+                    max_price = current_price * (1.0 + (limit_buy_max_premium_pct / 100.0)) if current_price > 0 else 0.0
+                    remaining = int(qty)
+                    used_levels = max(1, min(int(limit_buy_max_levels), len(asks)))
+                    _trace(
+                        "buy.ladder.start",
+                        symbol=symbol,
+                        exchange=exchange,
+                        qty=int(qty),
+                        current_price=float(current_price),
+                        max_price=float(max_price),
+                        max_premium_pct=float(limit_buy_max_premium_pct),
+                        levels=int(used_levels),
+                        step_wait_sec=float(limit_buy_step_wait_sec),
+                    )
+
+                    for level_idx in range(used_levels):
+                        ask_price = asks[level_idx]
+                        lvl = level_idx + 1
+                        _trace(
+                            _EV_LADDER_LEVEL_BEGIN,
+                            symbol=symbol,
+                            exchange=exchange,
+                            level=lvl,
+                            ask_price=float(ask_price),
+                            remaining=int(remaining),
+                            max_price=float(max_price),
+                        )
+                        if max_price > 0 and ask_price > max_price:
+                            log.warning(
+                                f"[Engine] 매수 가드 발동: {symbol} 매도{lvl}호가 {ask_price:.4f} > max {max_price:.4f} "
+                                f"(허용 +{limit_buy_max_premium_pct:.2f}%) → 매수 스킵"
+                            )
+                            _trace(
+                                _EV_LADDER_GUARD,
+                                symbol=symbol,
+                                exchange=exchange,
+                                level=lvl,
+                                ask_price=float(ask_price),
+                                max_price=float(max_price),
+                            )
+                            return False, "guard_triggered"
+
+                        # 가격이 바뀌면 매수가능수량도 바뀔 수 있어 재조회
+                        # - 직전 조회가와의 차이가 _LADDER_REQUERY_PCT 미만이면 재조회 대신
+                        #   직전 수량을 가격 비율로 보수 환산(내림)해 사용
+                        if (
+                            last_ps_qty is not None
+                            and last_ps_price > 0
+                            and abs(ask_price / last_ps_price - 1.0) < _LADDER_REQUERY_PCT
+                        ):
+                            max_ps_qty2 = int(last_ps_qty * min(1.0, last_ps_price / ask_price))
+                            _trace(
+                                "buy.buyable_ladder.reused",
+                                symbol=symbol,
+                                exchange=exchange,
+                                level=lvl,
+                                price=float(ask_price),
+                                base_price=float(last_ps_price),
+                                max_ps_qty=int(max_ps_qty2),
+                            )
+                        else:
+                            _set_step("buy.buyable_ladder", symbol=symbol, exchange=exchange, price=float(ask_price))
+                            ps2 = kis_order.get_buyable_amount(exchange=exchange, symbol=symbol, price=ask_price, mode=mode, caller="ENGINE")
+                            max_ps_qty2 = None
+                            try:
+                                if ps2 and ps2.get("ovrs_max_ord_psbl_qty"):
+                                    max_ps_qty2 = int(float(ps2["ovrs_max_ord_psbl_qty"]))
+                                elif ps2 and ps2.get("max_ord_psbl_qty"):
+                                    max_ps_qty2 = int(float(ps2["max_ord_psbl_qty"]))
+                                elif ps2 and ps2.get("ord_psbl_qty"):
+                                    max_ps_qty2 = int(float(ps2["ord_psbl_qty"]))
+                            except Exception:
+                                max_ps_qty2 = None
+                            if max_ps_qty2 is not None:
+                                last_ps_price, last_ps_qty = float(ask_price), max_ps_qty2
+                        if max_ps_qty2 is not None:
+                            remaining = min(remaining, max_ps_qty2)
+
+                        if remaining <= 0:
+                            log.info(f"[Engine] 매수가능수량 부족으로 매수 불가: {symbol} (매수가능={max_ps_qty2})")
+                            _trace(
+                                _EV_LADDER_QTY_INSUFFICIENT,
+                                symbol=symbol,
+                                exchange=exchange,
+                                level=lvl,
+                                ask_price=float(ask_price),
+                                max_ps_qty=int(max_ps_qty2) if max_ps_qty2 is not None else None,
+                            )
+                            return False, "qty_insufficient"
+
+                        log.info(f"[Engine] 지정가 매수 시도: {symbol}({exchange}) {remaining}주 @매도{lvl}호가({ask_price})")
+                        _trace(
+                            _EV_LADDER_SUBMIT,
+                            symbol=symbol,
+                            exchange=exchange,
+                            level=lvl,
+                            qty=int(remaining),
+                            price=float(ask_price),
+                        )
+                        out = kis_order.order(symbol, remaining, ask_price, 'buy', exchange=exchange, order_type='00', mode=mode, caller="ENGINE")
+                        odno = _odno(out)
+                        if out:
+                            buy_orders_sent += 1
+                        # ladder 주문 시도도 이력에 기록(상세 UI용)
+                        try:
+                            history["buy_attempts"].append(OrderAttempt(
+                                symbol=symbol,
+                                exchange=exchange,
+                                qty=int(remaining),
+                                price=float(ask_price),
+                                method="ask_ladder",
+                                level=lvl,
+                                ok=bool(out),
+                                order_no=odno,
+                            ))
+                        except Exception:
+                            pass
+                        if not odno:
+                            log.warning(f"[Engine] {symbol} 매수 주문 실패(주문번호 없음)")
+                            # 안전상 추가 주문을 진행하지 않는다(중복/과매수 방지).
+                            _trace(
+                                _EV_LADDER_NO_ORDER_NO,
+                                symbol=symbol,
+                                exchange=exchange,
+                                level=lvl,
+                            )
+                            return False, "order_no_missing"
+
+                        odno_s = str(odno)
+
+                        # 짧게 대기 후 미체결 잔량 확인
+                        time_module.sleep(max(0.2, limit_buy_step_wait_sec))
+                        unfilled_qty = _unfilled_qty_by_odno(exchange, mode).get(odno_s.strip(), 0)
+                        uqi = int(unfilled_qty)
+                        if unfilled_qty <= 0:
+                            try:
+                                # 매수 체결(또는 미체결 목록에서 제거됨) 시점 기준으로 보유일 갱신
+                                store.set_open_date(symbol=symbol, open_date=today, source="buy_exec")
+                            except Exception:
+                                pass
+                            log.info(f"[Engine] {symbol} 매수 체결(또는 미체결 목록에서 제거됨): odno={odno}")
+                            _trace(
+                                _EV_LADDER_FILLED,
+                                symbol=symbol,
+                                exchange=exchange,
+                                level=lvl,
+                                order_no=odno_s,
+                            )
+                            return True, "filled_or_removed"
+
+                        # 마지막 단계면 미체결을 남기고 종료(요청 정책)
+                        if level_idx >= (used_levels - 1):
+                            log.warning(
+                                f"[Engine] {symbol} 마지막 호가 단계 미체결 잔량 {unfilled_qty}주 → 취소하지 않고 종료 (odno={odno})"
+                            )
+                            _trace(
+                                _EV_LADDER_LAST_LEVEL_LEFT,
+                                symbol=symbol,
+                                exchange=exchange,
+                                level=lvl,
+                                order_no=odno_s,
+                                unfilled_qty=uqi,
+                            )
+                            return False, "unfilled_left_last_level"
+
+                        # 잔량 취소 후 다음 호가로 재시도(중복 미체결 방지)
+                        log.info(f"[Engine] {symbol} 미체결 잔량 {unfilled_qty}주 → 취소 후 다음 호가로 재시도 (odno={odno})")
+                        _trace(
+                            _EV_LADDER_UNFILLED,
+                            symbol=symbol,
+                            exchange=exchange,
+                            level=lvl,
+                            order_no=odno_s,
+                            unfilled_qty=uqi,
+                        )
+                        cncl = kis_order.revise_cancel_order(
+                            exchange=exchange,
+                            symbol=symbol,
+                            origin_order_no=odno_s,
+                            qty=uqi,
+                            price=0,
+                            action="cancel",
+                            mode=mode,
+                            caller="ENGINE",
+                        )
+                        _trace(_EV_LADDER_CANCEL, symbol=symbol, exchange=exchange, order_no=odno_s, unfilled_qty=uqi, ok=bool(cncl))
+                        if not cncl:
+                            log.warning(f"[Engine] {symbol} 잔량 취소 실패 → 중복 주문 방지 위해 재시도 중단 (odno={odno})")
+                            # 취소 실패 시 중복 주문 위험이 크므로 폴백 포함 추가 주문 금지
+                            _trace(
+                                _EV_LADDER_CANCEL_FAILED,
+                                symbol=symbol,
+                                exchange=exchange,
+                                level=lvl,
+                                order_no=odno_s,
+                                unfilled_qty=uqi,
+                            )
+                            return False, "cancel_failed"
+
+                        remaining = uqi
+                        _trace(
+                            _EV_LADDER_LEVEL_NEXT,
+                            symbol=symbol,
+                            exchange=exchange,
+                            next_level=lvl + 1,
+                            remaining=int(remaining),
+                        )
+                        # 다음 단계로 넘어가기 전 과도한 호출 방지(토큰 버킷: 필요한 만큼만 대기)
+                        self._kis_limiter.acquire()
+
+                    # 여기까지 왔으면 최대 레벨까지 시도했으나 잔량이 남은 케이스
+                    log.warning(f"[Engine] {symbol} 지정가 호가 상향 시도 후에도 미체결 잔량이 남아 매수 완료 실패(remaining={remaining})")
+                    # 부분체결 가능성이 있으므로 폴백 포함 추가 주문 금지
+                    _trace(
+                        "buy.ladder.unfilled_remaining",
+                        symbol=symbol,
+                        exchange=exchange,
+                        remaining=int(remaining),
+                    )
+                    return False, "unfilled_remaining"
+
                 for item in candidates:
                     symbol = item["code"]
                     exchange = item["exchange"]
 
                     # 이미 보유중이면 패스(방어 로직).
                     # 단, 이번 런에서 매도 성공한 종목은 키움 패턴과 동일하게 재매수 허용.
-                    symu = (symbol or "").strip().upper()
+                    symu = _norm_symbol(symbol)
                     if (symu in my_stocks) and (symu not in sold_symbols):
                         log.info(f"[Engine] 이미 보유중인 종목입니다: {symbol}")
                         history["skips"].append({
@@ -1547,12 +2284,20 @@ class TradingEngine:
                         })
                         continue
 
-                    # KIS 레이트리밋 방지용 기본 스로틀(키움식 운영 가드)
-                    time_module.sleep(0.25)
-                        
-                    # 현재가 조회 (거래소 정보 포함)
+                    # 현재가 (거래소 정보 포함): 선조회 결과가 충분히 최신일 때만 사용, 아니면 주문 직전 재조회
                     _set_step("buy.quote.current", symbol=symbol, exchange=exchange)
-                    price_info = kis_quote.get_current_price(exchange, symbol, mode=mode, caller="ENGINE")
+                    price_info = None
+                    quote_fut = quote_futs.get((exchange, symbol))
+                    if quote_fut is not None:
+                        try:
+                            fetched_at, price_info = quote_fut.result()
+                        except Exception:
+                            fetched_at, price_info = 0.0, None
+                        if price_info and (time_module.monotonic() - fetched_at) > _BUY_QUOTE_MAX_AGE_SEC:
+                            _trace("buy.quote.stale", symbol=symbol, exchange=exchange, age_sec=round(time_module.monotonic() - fetched_at, 3))
+                            price_info = None
+                    if not price_info:
+                        _, price_info = _fetch_quote(exchange, symbol)
                     if not price_info:
                         log.warning(f"[Engine] {symbol} 시세 조회 실패")
                         history["skips"].append({"side": "buy", "symbol": symbol, "reason": "quote_failed", "detail": {"exchange": exchange}})
@@ -1578,22 +2323,14 @@ class TradingEngine:
                         history["skips"].append({"side": "buy", "symbol": symbol, "reason": "price_zero", "detail": {"exchange": exchange}})
                         continue
 
-                    # 매수 방식(키움 참고):
-                    # - mock: 호가 API 미지원이므로 기존처럼 (현재가 + 슬리피지) 지정가
-                    # - real: 매도 1호가부터 단계적으로 지정가 매수(미체결이면 다음 호가), 가드(최대 허용 프리미엄%) 적용
-                    buy_order_method = (strategy.get("buy_order_method") or ("limit_ask_ladder" if mode == "real" else "limit_slippage")).strip()
-                    limit_buy_max_premium_pct = float(strategy.get("limit_buy_max_premium_pct", 1.0) or 1.0)
-                    limit_buy_max_levels = int(strategy.get("limit_buy_max_levels", 5) or 5)
-                    limit_buy_step_wait_sec = float(strategy.get("limit_buy_step_wait_sec", 1.0) or 1.0)
-
                     # 슬리피지 주문은 실제 주문 단가가 current_price보다 높아질 수 있어,
                     # v1_014(매수가능수량) 조회 및 예산 수량 산정도 "실제 주문가" 기준으로 보수화한다.
                     planned_buy_price = current_price
                     if not (mode == "real" and buy_order_method == "limit_ask_ladder"):
                         planned_buy_price = current_price * (1.0 + (slippage_pct / 100.0))
 
-                    # 연속 API 호출 간 간격 확보(EGW00201 완화)
-                    time_module.sleep(0.25)
+                    # 연속 API 호출 간 간격 확보(EGW00201 완화): 직전 호출 후 이미 충분히 지났으면 대기 없음
+                    self._kis_limiter.acquire()
                         
                     # 1) 종목당 예산 기준 수량
                     qty_by_budget = int(per_stock_budget // planned_buy_price) if planned_buy_price > 0 else 0
@@ -1631,307 +2368,54 @@ class TradingEngine:
                         history["skips"].append({"side": "buy", "symbol": symbol, "reason": "qty_insufficient", "detail": {"exchange": exchange, "qty_by_budget": qty_by_budget, "max_ps_qty": max_ps_qty}})
                         continue
 
-                    def _find_unfilled_qty_by_odno(odno: str) -> int:
-                        try:
-                            if not odno:
-                                return 0
-                            rows = kis_order.get_unfilled_orders(exchange=exchange, mode=mode, caller="ENGINE") or []
-                            rows = rows if isinstance(rows, list) else [rows]
-                            for r in rows:
-                                if not isinstance(r, dict):
-                                    continue
-                                if str(r.get("odno") or "").strip() == str(odno).strip():
-                                    try:
-                                        return int(float(str(r.get("nccs_qty") or 0).replace(",", "")))
-                                    except Exception:
-                                        return 0
-                            return 0
-                        except Exception:
-                            return 0
-
-                    def _extract_asks(ob: dict) -> list[float]:
-                        # 해외주식-033 output2는 array로 내려오지만 실질 payload는 1개 dict인 케이스가 흔함.
-                        out2 = ob.get("output2") if isinstance(ob, dict) else None
-                        d = None
-                        if isinstance(out2, list) and out2:
-                            d = out2[0] if isinstance(out2[0], dict) else None
-                        elif isinstance(out2, dict):
-                            d = out2
-                        if not d:
-                            return []
-                        asks = []
-                        for i in range(1, 11):
-                            k = f"pask{i}"
-                            v = d.get(k)
-                            try:
-                                p = float(str(v or 0).replace(",", ""))
-                            except Exception:
-                                p = 0.0
-                            if p and p > 0:
-                                asks.append(p)
-                        return asks
-
-                    def _buy_with_ask_ladder() -> tuple[bool, str]:
-                        # 1) 호가 조회
-                        ob = kis_quote.get_asking_price(exchange, symbol, mode=mode, caller="ENGINE")
-                        if not ob:
-                            log.warning(f"[Engine] {symbol} 호가 조회 실패 → 슬리피지 지정가로 폴백")
-                            _trace("buy.ladder.hoga_failed", symbol=symbol, exchange=exchange)
-                            return False, "ask_api_failed"
-                        asks = _extract_asks(ob)
-                        if not asks:
-                            log.warning(f"[Engine] {symbol} 호가 데이터 없음 → 슬리피지 지정가로 폴백")
-                            _trace("buy.ladder.hoga_empty", symbol=symbol, exchange=exchange)
-                            return False, "asks_empty"
-
-                        max_price = current_price * (1.0 + (limit_buy_max_premium_pct / 100.0)) if current_price > 0 else 0.0
-                        remaining = int(qty)
-                        used_levels = max(1, min(int(limit_buy_max_levels), len(asks)))
-                        _trace(
-                            "buy.ladder.start",
-                            symbol=symbol,
-                            exchange=exchange,
-                            qty=int(qty),
-                            current_price=float(current_price),
-                            max_price=float(max_price),
-                            max_premium_pct=float(limit_buy_max_premium_pct),
-                            levels=int(used_levels),
-                            step_wait_sec=float(limit_buy_step_wait_sec),
-                        )
-
-                        for level_idx in range(used_levels):
-                            ask_price = asks[level_idx]
-                            _trace(
-                                "buy.ladder.level.begin",
-                                symbol=symbol,
-                                exchange=exchange,
-                                level=int(level_idx + 1),
-                                ask_price=float(ask_price),
-                                remaining=int(remaining),
-                                max_price=float(max_price),
-                            )
-                            if max_price > 0 and ask_price > max_price:
-                                log.warning(
-                                    f"[Engine] 매수 가드 발동: {symbol} 매도{level_idx+1}호가 {ask_price:.4f} > max {max_price:.4f} "
-                                    f"(허용 +{limit_buy_max_premium_pct:.2f}%) → 매수 스킵"
-                                )
-                                _trace(
-                                    "buy.ladder.guard_triggered",
-                                    symbol=symbol,
-                                    exchange=exchange,
-                                    level=int(level_idx + 1),
-                                    ask_price=float(ask_price),
-                                    max_price=float(max_price),
-                                )
-                                return False, "guard_triggered"
-
-                            # 가격이 바뀌면 매수가능수량도 바뀔 수 있어 재조회
-                            _set_step("buy.buyable_ladder", symbol=symbol, exchange=exchange, price=float(ask_price))
-                            ps2 = kis_order.get_buyable_amount(exchange=exchange, symbol=symbol, price=ask_price, mode=mode, caller="ENGINE")
-                            max_ps_qty2 = None
-                            try:
-                                if ps2 and ps2.get("ovrs_max_ord_psbl_qty"):
-                                    max_ps_qty2 = int(float(ps2["ovrs_max_ord_psbl_qty"]))
-                                elif ps2 and ps2.get("max_ord_psbl_qty"):
-                                    max_ps_qty2 = int(float(ps2["max_ord_psbl_qty"]))
-                                elif ps2 and ps2.get("ord_psbl_qty"):
-                                    max_ps_qty2 = int(float(ps2["ord_psbl_qty"]))
-                            except Exception:
-                                max_ps_qty2 = None
-                            if max_ps_qty2 is not None:
-                                remaining = min(remaining, max_ps_qty2)
-
-                            if remaining <= 0:
-                                log.info(f"[Engine] 매수가능수량 부족으로 매수 불가: {symbol} (매수가능={max_ps_qty2})")
-                                _trace(
-                                    "buy.ladder.qty_insufficient",
-                                    symbol=symbol,
-                                    exchange=exchange,
-                                    level=int(level_idx + 1),
-                                    ask_price=float(ask_price),
-                                    max_ps_qty=int(max_ps_qty2) if max_ps_qty2 is not None else None,
-                                )
-                                return False, "qty_insufficient"
-
-                            log.info(f"[Engine] 지정가 매수 시도: {symbol}({exchange}) {remaining}주 @매도{level_idx+1}호가({ask_price})")
-                            _trace(
-                                "buy.ladder.order.submit",
-                                symbol=symbol,
-                                exchange=exchange,
-                                level=int(level_idx + 1),
-                                qty=int(remaining),
-                                price=float(ask_price),
-                            )
-                            out = kis_order.order(symbol, remaining, ask_price, 'buy', exchange=exchange, order_type='00', mode=mode, caller="ENGINE")
-                            odno = (out or {}).get("ODNO") or (out or {}).get("odno")
-                            # ladder 주문 시도도 이력에 기록(상세 UI용)
-                            try:
-                                history["buy_attempts"].append({
-                                    "symbol": symbol,
-                                    "exchange": exchange,
-                                    "qty": int(remaining),
-                                    "price": float(ask_price),
-                                    "method": "ask_ladder",
-                                    "level": int(level_idx + 1),
-                                    "ok": bool(out),
-                                    "order_no": odno,
-                                })
-                            except Exception:
-                                pass
-                            if not odno:
-                                log.warning(f"[Engine] {symbol} 매수 주문 실패(주문번호 없음)")
-                                # 안전상 추가 주문을 진행하지 않는다(중복/과매수 방지).
-                                _trace(
-                                    "buy.ladder.order.no_order_no",
-                                    symbol=symbol,
-                                    exchange=exchange,
-                                    level=int(level_idx + 1),
-                                )
-                                return False, "order_no_missing"
-
-                            # 짧게 대기 후 미체결 잔량 확인
-                            time_module.sleep(max(0.2, limit_buy_step_wait_sec))
-                            unfilled_qty = _find_unfilled_qty_by_odno(odno)
-                            if unfilled_qty <= 0:
-                                try:
-                                    # 매수 체결(또는 미체결 목록에서 제거됨) 시점 기준으로 보유일 갱신
-                                    store.set_open_date(symbol=symbol, open_date=datetime.now().strftime("%Y%m%d"), source="buy_exec")
-                                except Exception:
-                                    pass
-                                log.info(f"[Engine] {symbol} 매수 체결(또는 미체결 목록에서 제거됨): odno={odno}")
-                                _trace(
-                                    "buy.ladder.filled_or_removed",
-                                    symbol=symbol,
-                                    exchange=exchange,
-                                    level=int(level_idx + 1),
-                                    order_no=str(odno),
-                                )
-                                return True, "filled_or_removed"
-
-                            # 마지막 단계면 미체결을 남기고 종료(요청 정책)
-                            if level_idx >= (used_levels - 1):
-                                log.warning(
-                                    f"[Engine] {symbol} 마지막 호가 단계 미체결 잔량 {unfilled_qty}주 → 취소하지 않고 종료 (odno={odno})"
-                                )
-                                _trace(
-                                    "buy.ladder.unfilled_last_level_left",
-                                    symbol=symbol,
-                                    exchange=exchange,
-                                    level=int(level_idx + 1),
-                                    order_no=str(odno),
-                                    unfilled_qty=int(unfilled_qty),
-                                )
-                                return False, "unfilled_left_last_level"
-
-                            # 잔량 취소 후 다음 호가로 재시도(중복 미체결 방지)
-                            log.info(f"[Engine] {symbol} 미체결 잔량 {unfilled_qty}주 → 취소 후 다음 호가로 재시도 (odno={odno})")
-                            _trace(
-                                "buy.ladder.unfilled",
-                                symbol=symbol,
-                                exchange=exchange,
-                                level=int(level_idx + 1),
-                                order_no=str(odno),
-                                unfilled_qty=int(unfilled_qty),
-                            )
-                            cncl = kis_order.revise_cancel_order(
-                                exchange=exchange,
-                                symbol=symbol,
-                                origin_order_no=str(odno),
-                                qty=int(unfilled_qty),
-                                price=0,
-                                action="cancel",
-                                mode=mode,
-                                caller="ENGINE",
-                            )
-                            _trace("buy.ladder.cancel", symbol=symbol, exchange=exchange, order_no=str(odno), unfilled_qty=int(unfilled_qty), ok=bool(cncl))
-                            if not cncl:
-                                log.warning(f"[Engine] {symbol} 잔량 취소 실패 → 중복 주문 방지 위해 재시도 중단 (odno={odno})")
-                                # 취소 실패 시 중복 주문 위험이 크므로 폴백 포함 추가 주문 금지
-                                _trace(
-                                    "buy.ladder.cancel_failed",
-                                    symbol=symbol,
-                                    exchange=exchange,
-                                    level=int(level_idx + 1),
-                                    order_no=str(odno),
-                                    unfilled_qty=int(unfilled_qty),
-                                )
-                                return False, "cancel_failed"
-
-                            remaining = int(unfilled_qty)
-                            _trace(
-                                "buy.ladder.level.next",
-                                symbol=symbol,
-                                exchange=exchange,
-                                next_level=int(level_idx + 2),
-                                remaining=int(remaining),
-                            )
-                            # 다음 단계로 넘어가기 전 과도한 호출 방지
-                            time_module.sleep(0.4)
-
-                        # 여기까지 왔으면 최대 레벨까지 시도했으나 잔량이 남은 케이스
-                        log.warning(f"[Engine] {symbol} 지정가 호가 상향 시도 후에도 미체결 잔량이 남아 매수 완료 실패(remaining={remaining})")
-                        # 부분체결 가능성이 있으므로 폴백 포함 추가 주문 금지
-                        _trace(
-                            "buy.ladder.unfilled_remaining",
-                            symbol=symbol,
-                            exchange=exchange,
-                            remaining=int(remaining),
-                        )
-                        return False, "unfilled_remaining"
-
                     if qty > 0:
+                        # 매수 전 선취소: 동일 종목 미체결 주문이 있으면 취소하고 진행 (실전)
+                        _cancel_unfilled_for_symbol(exchange, symbol, side_filter="buy")
                         if mode == "real" and buy_order_method == "limit_ask_ladder":
-                            # 매수 전 선취소: 동일 종목 미체결 주문이 있으면 취소하고 진행 (실전)
-                            try:
-                                _cancel_unfilled_for_symbol(exchange, symbol, side_filter="buy")
-                            except Exception:
-                                pass
-                            ok, reason = _buy_with_ask_ladder()
+                            ok, reason = _buy_with_ask_ladder(symbol, exchange, qty, current_price, max_ps_qty)
                             if (not ok) and (reason in ("ask_api_failed", "asks_empty")):
                                 # 실전에서 "호가 조회 자체"가 불가한 환경이면 ladder를 시작할 수 없다.
                                 # 이 경우에만(=ladder 주문을 넣기 전) 기존 방식으로 1회 폴백한다.
                                 buy_price = current_price * (1.0 + (slippage_pct / 100.0))
                                 log.info(f"[Engine] ladder 불가({reason}) → 슬리피지 지정가 1회 폴백: {symbol} {qty}주 (@{buy_price})")
                                 out = kis_order.order(symbol, qty, buy_price, 'buy', exchange=exchange, order_type='00', mode=mode, caller="ENGINE")
-                                history["buy_attempts"].append({
-                                    "symbol": symbol,
-                                    "exchange": exchange,
-                                    "qty": qty,
-                                    "price": buy_price,
-                                    "method": "slippage_fallback",
-                                    "ok": bool(out),
-                                    "order_no": (out or {}).get("ODNO") or (out or {}).get("odno"),
-                                    "note": f"ladder_unavailable:{reason}",
-                                })
+                                history["buy_attempts"].append(OrderAttempt(
+                                    symbol=symbol,
+                                    exchange=exchange,
+                                    qty=qty,
+                                    price=buy_price,
+                                    method="slippage_fallback",
+                                    ok=bool(out),
+                                    order_no=_odno(out),
+                                    note=f"ladder_unavailable:{reason}",
+                                ))
+                                if out:
+                                    buy_orders_sent += 1
                             elif not ok:
                                 # 가드 발동/부분체결/취소 실패 등 "중복/과매수 위험" 케이스에서는 추가 주문을 금지한다.
                                 log.warning(f"[Engine] ladder 실패({reason}) → 안전상 추가 폴백 주문을 생략합니다.")
                                 history["skips"].append({"side": "buy", "symbol": symbol, "reason": f"ladder_failed_no_fallback:{reason}"})
                         else:
-                            # 매수 전 선취소: 동일 종목 미체결 주문이 있으면 취소하고 진행 (실전)
-                            try:
-                                _cancel_unfilled_for_symbol(exchange, symbol, side_filter="buy")
-                            except Exception:
-                                pass
                             buy_price = planned_buy_price
                             log.info(f"[Engine] 매수 주문 실행: {symbol}({exchange}) {qty}주 (@{buy_price})")
                             out = kis_order.order(symbol, qty, buy_price, 'buy', exchange=exchange, order_type='00', mode=mode, caller="ENGINE")
-                            history["buy_attempts"].append({
-                                "symbol": symbol,
-                                "exchange": exchange,
-                                "qty": qty,
-                                "price": buy_price,
-                                "method": "slippage",
-                                "ok": bool(out),
-                                "order_no": (out or {}).get("ODNO") or (out or {}).get("odno"),
-                            })
+                            history["buy_attempts"].append(OrderAttempt(
+                                symbol=symbol,
+                                exchange=exchange,
+                                qty=qty,
+                                price=buy_price,
+                                method="slippage",
+                                ok=bool(out),
+                                order_no=_odno(out),
+                            ))
+                            if out:
+                                buy_orders_sent += 1
                     # qty<=0 케이스는 상단에서 스킵 처리(중복 기록 방지)
 
             log.info("=== 자동매매 엔진 실행 완료 ===")
             # status 요약
-            buy_ok = any(bool(x.get("ok")) for x in (history.get("buy_attempts") or []))
-            sell_ok = any(bool(x.get("ok")) for x in (history.get("sell_attempts") or []))
-            if buy_ok or sell_ok:
+            # (ok 주문 수는 주문 시점에 집계됨 → 시도 목록 재순회 불필요)
+            if buy_orders_sent or sell_orders_sent:
                 history["status"] = "success"
             elif (history.get("buy_attempts") or history.get("sell_attempts")) or (history.get("skips") or history.get("errors")):
                 history["status"] = "partial"
@@ -1942,13 +2426,11 @@ class TradingEngine:
             # (스케줄 실행 기록은 위에서 선 마킹 처리)
 
         except Exception as e:
-            log = get_mode_logger(config_manager.get('common.mode', 'mock'), "ENGINE")
             try:
                 log.error(f"[Engine] 실행 중 오류 발생: {e} | step={last_step} | ctx={last_context}")
             except Exception:
                 log.error(f"[Engine] 실행 중 오류 발생: {e}")
             self.last_error = str(e)
-            import traceback
             log.error(traceback.format_exc())
             history["status"] = "error"
             try:
@@ -1958,12 +2440,17 @@ class TradingEngine:
             history["message"] = f"exception:{e}"
         finally:
             try:
-                history["finished_at"] = datetime.now().isoformat(timespec="seconds")
+                history["finished_at"] = _iso_now_second()
+                history["trace"] = trace_ring.to_list()
+                if trace_ring.dropped:
+                    history["trace_dropped"] = trace_ring.dropped
                 ExecutionHistoryStore(mode=mode).append(history)
             except Exception:
                 # 이력 저장 실패는 매매 실패로 간주하지 않는다.
                 pass
             set_engine_api_logging(mode, False)
+            # 정규 매매로 보유 종목이 바뀌었을 수 있으므로 장중 감시는 다음 틱에 잔고를 새로 조회
+            self._last_balance = None
             self.is_running = False
 
     def run(self):
@@ -2009,19 +2496,15 @@ class TradingEngine:
         """
         if mode is None:
             mode = config_manager.get('common.mode', 'mock')
-        auto_enabled = bool(config_manager.get(f"{mode}.auto_trading_enabled", False))
-        if not auto_enabled:
+        mode_cfg = _get_mode_config(mode, config_manager.revision)
+        if not mode_cfg.auto_enabled:
             return None
 
-        schedule_time = config_manager.get(f"{mode}.schedule_time", "00:00") or "00:00"
-        try:
-            hh, mm = str(schedule_time).split(":")
-            hh = int(hh); mm = int(mm)
-        except Exception:
-            hh, mm = 0, 0
+        schedule_time = mode_cfg.schedule_time
+        hh, mm = self._parse_schedule_time(schedule_time)
 
         now = datetime.now()
-        today = now.strftime("%Y%m%d")
+        today = _yyyymmdd(now)
         last_day = self._get_last_scheduled_run_day(mode)
 
         target = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
@@ -2033,6 +2516,29 @@ class TradingEngine:
                 target = target + timedelta(days=1)
         return target
 
+    def seconds_until_next_check(self, mode: str | None = None, max_wait: float = 300.0) -> float:
+        """
+        스케줄러 루프가 다음에 깨어날 때까지의 대기 시간(초)
+        - 장중 손절 감시 ON + 장중: 60초(기존 1분 주기)
+        - 그 외: 다음 자동매매 시각 / 장 시작 중 이른 쪽까지(최대 max_wait)
+        """
+        if mode is None:
+            mode = config_manager.get('common.mode', 'mock')
+        wait = float(max_wait)
+        try:
+            mode_cfg = _get_mode_config(mode, config_manager.revision)
+            if bool(mode_cfg.intraday.get("enabled", False)):
+                until_open = self.seconds_until_market_open()
+                if until_open <= 0:
+                    return min(wait, 60.0)
+                wait = min(wait, until_open)
+            target = self.get_next_scheduled_run_at(mode)
+            if target is not None:
+                wait = min(wait, (target - datetime.now()).total_seconds())
+        except Exception:
+            return 60.0
+        return max(1.0, wait)
+
     def stop_loss_watch(self):
         """
         장중 손절 감시 (1분 주기)
@@ -2042,23 +2548,12 @@ class TradingEngine:
         mode = config_manager.get('common.mode', 'mock')
         log = get_mode_logger(mode, "ENGINE")
         try:
-            intraday_cfg = config_manager.get(f"{mode}.intraday_stop_loss", {}) or {}
+            mode_cfg = _get_mode_config(mode, config_manager.revision)
+            intraday_cfg = mode_cfg.intraday
             intraday_enabled = bool(intraday_cfg.get("enabled", False))
             if not intraday_enabled:
                 return
 
-            if not self.is_market_open():
-                return
-
-            # 엔진이 돌고 있으면 중복 주문/충돌 방지
-            if self.is_running:
-                return
-
-            # 여기부터는 "실제 감시 로직 수행" (상태 갱신)
-            self.last_stop_watch_at = datetime.now()
-            self.last_stop_watch_error = None
-
-            strategy = config_manager.get(f'{mode}.strategy', {}) or {}
             # myKiwoom-main 호환: threshold_pct 사용. 기존 stop_loss_pct가 있으면 -abs로 마이그레이션 처리
             threshold_pct = intraday_cfg.get("threshold_pct", None)
             if threshold_pct is None and intraday_cfg.get("stop_loss_pct") is not None:
@@ -2070,21 +2565,62 @@ class TradingEngine:
                 threshold_pct = float(threshold_pct)
             except Exception:
                 threshold_pct = -7.0
+            # 임계치 0이면 어떤 종목도 매도 대상이 될 수 없음 → 장 상태/잔고 조회 자체를 생략
+            if threshold_pct == 0:
+                return
+
+            if not self.is_market_open():
+                return
+
+            # 엔진이 돌고 있으면 중복 주문/충돌 방지
+            if self.is_running:
+                return
+
+            # 여기부터는 "실제 감시 로직 수행" (상태 갱신)
+            self.last_stop_watch_at = datetime.now()
+            self.last_stop_watch_error = None
+
+            strategy = mode_cfg.strategy
             slippage_pct = float(strategy.get("slippage_pct", 0.5) or 0.5)
 
+            now_m = time_module.monotonic()  # 쿨다운/잔고 나이 기준(벽시계와 무관)
+            is_stop = threshold_pct < 0
+
+            # 0) 직전 잔고가 충분히 최신이고 모든 종목이 임계치에서 여유폭 이상 떨어져 있었다면 이번 틱은 생략
+            # - 조용한 장중에는 잔고 API 호출을 절반으로 줄여 정규 매매 경로의 초당 호출 한도를 아낀다.
+            # - 스냅샷은 생략 1회에 소비하므로 연속 생략은 없다(최악 감지 지연 2틱, 약 120초).
+            last = self._last_balance
+            if last is not None and last[1] == mode and last[2] == threshold_pct and (now_m - last[0]) < _STOP_WATCH_BALANCE_MAX_AGE_SEC:
+                if is_stop:
+                    far = all(r > threshold_pct + _STOP_WATCH_SKIP_MARGIN_PCT for r in last[3])
+                else:
+                    far = all(r < threshold_pct - _STOP_WATCH_SKIP_MARGIN_PCT for r in last[3])
+                if far:
+                    self._last_balance = None
+                    return
+
             balance_info = kis_order.get_balance(mode=mode, caller="ENGINE")
             if not balance_info:
+                self._last_balance = None
                 return
 
             output1 = balance_info.get('output1', []) or []
-            now = datetime.now()
-            cooldown_td = timedelta(minutes=5)  # 같은 종목 반복 주문 방지
 
-            for stock in output1:
-                symbol = (stock.get('ovrs_pdno') or '').strip().upper()
-                if not symbol:
-                    continue
+            # 1) 대상 선별(네트워크 호출 없음): 임계치 + 쿨다운 필터
+            # - 대부분의 보유종목은 임계치 미달이므로 수익률만으로 먼저 걸러내고(대상 없으면 즉시 종료),
+            #   통과한 소수 종목만 수량/종목코드/현재가를 파싱한다.
+            # 장중 감시 조건: threshold_pct가 음수면 손절, 양수면 익절(둘 다 매도)
+            rates = [_profit_rate(stock) for stock in output1]
+            self._last_balance = (now_m, mode, threshold_pct, tuple(rates))
+            if is_stop:
+                hits = [(stock, r) for stock, r in zip(output1, rates) if r <= threshold_pct]
+            else:
+                hits = [(stock, r) for stock, r in zip(output1, rates) if r >= threshold_pct]
+            if not hits:
+                return
 
+            eligible = []
+            for stock, profit_rate in hits:
                 try:
                     qty = int(float(stock.get('ord_psbl_qty') or 0))
                 except Exception:
@@ -2092,44 +2628,59 @@ class TradingEngine:
                 if qty <= 0:
                     continue
 
-                try:
-                    profit_rate = float(stock.get('evlu_pfls_rt') or 0)
-                except Exception:
-                    profit_rate = 0.0
-
-                # 장중 감시 조건: threshold_pct가 음수면 손절, 양수면 익절(둘 다 매도)
-                if threshold_pct < 0:
-                    if profit_rate > threshold_pct:
-                        continue
-                elif threshold_pct > 0:
-                    if profit_rate < threshold_pct:
-                        continue
-                else:
+                symbol = _norm_symbol(stock.get('ovrs_pdno'))
+                if not symbol:
                     continue
 
                 # 쿨다운 체크
-                last_sell = self._stop_loss_cooldown.get(symbol)
-                if last_sell and (now - last_sell) < cooldown_td:
+                if symbol in self._stop_loss_cooldown:
                     continue
 
                 exchange = stock.get("ovrs_excg_cd") or "NASD"
+                # 잔고 응답(v1_006)의 now_pric2를 폴백 지정가 기준으로 미리 보관(시세 재조회 RTT 절감)
+                balance_px = _to_float(stock.get("now_pric2"))
+                eligible.append((symbol, qty, exchange, profit_rate, balance_px))
 
+            if not eligible:
+                return
+            # 매도가 나가면 보유 구성이 바뀌므로 다음 틱은 반드시 재조회
+            self._last_balance = None
+
+            def _sell_one(symbol: str, qty: int, exchange: str, profit_rate: float, balance_px: float):
                 # 시장가(가격=0) 우선 시도, 실패 시 지정가 폴백
+                # 공유 주문 풀에서 병렬 제출되므로 KIS 호출마다 토큰 버킷 통과(_sell_intent와 동일 한도)
+                self._kis_limiter.acquire()
                 out = kis_order.order(symbol, qty, 0, 'sell', exchange=exchange, order_type='00', mode=mode, caller="ENGINE")
                 sell_price = 0.0
                 method = "market_0"
                 if not out:
-                    px = kis_quote.get_current_price(exchange, symbol, mode=mode, caller="ENGINE") or {}
-                    sell_price = float(px.get("last", 0) or 0)
+                    # 잔고 조회 시점의 현재가가 있으면 그대로 사용, 없을 때만 현재가 재조회
+                    sell_price = balance_px
                     if sell_price <= 0:
-                        continue
+                        self._kis_limiter.acquire()
+                        px = kis_quote.get_current_price(exchange, symbol, mode=mode, caller="ENGINE") or {}
+                        sell_price = float(px.get("last", 0) or 0)
+                    if sell_price <= 0:
+                        return symbol, None
                     sell_price = sell_price * (1.0 - (slippage_pct / 100.0))
+                    self._kis_limiter.acquire()
                     out = kis_order.order(symbol, qty, sell_price, 'sell', exchange=exchange, order_type='00', mode=mode, caller="ENGINE")
                     method = "limit_fallback"
 
                 log.info(f"[StopWatch] 장중 감시 매도: {symbol} qty={qty}, rate={profit_rate}%, threshold={threshold_pct}%, price={sell_price}, method={method}")
+                return symbol, out
+
+            # 2) 종목별 주문은 서로 독립이므로 소수 워커로 병렬 처리(1분 주기 내 완료 보장)
+            # - KIS 초당 제한(EGW00201)을 고려해 워커 수는 보수적으로 유지한다(상주 주문 풀 공유).
+            futures = [self._order_pool.submit(_sell_one, *c) for c in eligible]
+            for fut in as_completed(futures):
+                try:
+                    symbol, out = fut.result()
+                except Exception as e:
+                    log.error(f"[StopWatch] 종목 매도 처리 오류: {e}")
+                    continue
                 if out:
-                    self._stop_loss_cooldown[symbol] = now
+                    self._stop_loss_cooldown.mark(symbol, now_m)
 
         except Exception as e:
             self.last_stop_watch_error = str(e)
@@ -1,15 +1,216 @@
-import json
+import atexit
+import mmap
+import os
+import queue
+import threading
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from src.utils.json_io import dumps as _dumps, loads as _loads
+from src.utils.fs import replace_file
+
+# 전체 이력(jsonl)이 이 크기 이상이면 mmap으로 읽음(작은 파일은 일반 버퍼 읽기가 더 가벼움)
+_MMAP_MIN_BYTES = 64 * 1024
+
+# 목록 인덱스 파싱 결과 캐시: 파일 경로 -> ((mtime_ns, size), deque[최신이 왼쪽])
+# - 스토어 인스턴스는 호출마다 새로 만들어지므로 모듈 단위로 보관
+# - 다른 프로세스(웹/스케줄러)가 파일을 갱신하면 mtime/size가 달라져 다시 읽는다.
+# - append는 appendleft(O(1))로 반영하고, 읽기는 tuple 스냅샷을 순회한다(순회 중 변경 오류 방지).
+_INDEX_CACHE: dict[str, tuple[tuple[int, int], deque]] = {}
+
+# 목록 인덱스가 없을 때 백그라운드 생성 상태(프로세스 내 중복 생성/append와의 충돌 방지)
+# - _INDEX_BUILD_LOCK은 아래 두 dict/set 갱신만 보호하고, 인덱스 파일 쓰기는 경로별 잠금으로 직렬화
+#   (한 모드의 인덱스 생성이 다른 모드의 append를 막지 않도록)
+_INDEX_BUILD_LOCK = threading.Lock()
+_INDEX_BUILDING: set[str] = set()
+_INDEX_FILE_LOCKS: dict[str, threading.Lock] = {}
+
+
+def _index_file_lock(key: str) -> threading.Lock:
+    with _INDEX_BUILD_LOCK:
+        lock = _INDEX_FILE_LOCKS.get(key)
+        if lock is None:
+            lock = _INDEX_FILE_LOCKS[key] = threading.Lock()
+        return lock
+
+
+# 상세 파일(run_id.json) 비동기 기록
+# - append는 직렬화까지만 하고 파일 쓰기는 전용 스레드 1개가 처리(엔진 실행 경로에서 디스크 I/O 분리)
+# - 기록 전 조회(get)는 _DETAIL_PENDING의 bytes를 바로 사용, 프로세스 종료 시 남은 것은 atexit에서 기록
+_DETAIL_PENDING: dict[str, bytes] = {}
+_DETAIL_LOCK = threading.Lock()
+_DETAIL_QUEUE: queue.Queue = queue.Queue()
+_DETAIL_WRITER: threading.Thread | None = None
+
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    # 쓰기 스레드와 종료 시 flush가 겹쳐도 tmp가 충돌하지 않도록 스레드별 tmp 사용
+    tmp = path.with_suffix(path.suffix + f".{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        replace_file(tmp, path)
+    except Exception:
+        try:
+            if tmp.exists():
+                tmp.unlink()
+        except Exception:
+            pass
+
+
+def _write_pending_detail(key: str) -> None:
+    with _DETAIL_LOCK:
+        data = _DETAIL_PENDING.get(key)
+    if data is None:
+        return
+    _write_bytes_atomic(Path(key), data)
+    with _DETAIL_LOCK:
+        # 기록 중 같은 run_id가 다시 들어왔으면 그 내용은 남겨 둔다(다음 큐 항목이 기록)
+        if _DETAIL_PENDING.get(key) is data:
+            del _DETAIL_PENDING[key]
+
+
+def _detail_writer() -> None:
+    while True:
+        key = _DETAIL_QUEUE.get()
+        try:
+            _write_pending_detail(key)
+        except Exception:
+            pass
+        finally:
+            _DETAIL_QUEUE.task_done()
+
+
+def _flush_pending_details() -> None:
+    """아직 기록되지 않은 상세 파일을 현재 스레드에서 모두 기록(프로세스 종료 시)."""
+    with _DETAIL_LOCK:
+        keys = list(_DETAIL_PENDING)
+    for key in keys:
+        try:
+            _write_pending_detail(key)
+        except Exception:
+            pass
+
+
+atexit.register(_flush_pending_details)
+
+
+# jsonl/ndjson 줄 수 캐시: 파일 경로 -> ((mtime_ns, size), 줄 수)
+# - append마다 파일 전체를 읽어 줄 수를 세지 않도록, 직전 상태를 알고 있으면 +1만 한다.
+_LINE_COUNTS: dict[str, tuple[tuple[int, int], int]] = {}
+
+
+def _appended_line_count(path: Path, before: tuple[int, int] | None) -> int:
+    """방금 1줄을 append한 파일의 줄 수. before는 append 직전의 (mtime_ns, size)."""
+    key = str(path)
+    hit = _LINE_COUNTS.get(key)
+    if hit is not None and before is not None and hit[0] == before:
+        n = hit[1] + 1
+    else:
+        with open(path, "rb") as f:
+            n = f.read().count(b"\n")
+    after = _file_sig(path)
+    if after is not None:
+        _LINE_COUNTS[key] = (after, n)
+    return n
+
+
+def _compact_lines(path: Path, keep: int) -> None:
+    """마지막 keep줄만 남긴다(줄 원문 그대로 - 파싱/재직렬화 없음)."""
+    with open(path, "rb") as f:
+        lines = [ln for ln in f.read().split(b"\n") if ln.strip()]
+    kept = lines[-keep:] if keep > 0 else []
+    _write_bytes_atomic(path, b"".join(ln + b"\n" for ln in kept))
+    sig = _file_sig(path)
+    if sig is not None:
+        _LINE_COUNTS[str(path)] = (sig, len(kept))
+
+
+def _iter_lines_reversed(f):
+    """
+    파일 끝(가장 최근 줄)부터 한 줄씩. 큰 파일은 mmap에서 역방향 탐색해 필요한 만큼만 읽는다.
+    - Windows에서는 읽는 동안(mmap 포함) 다른 프로세스의 replace가 실패하므로 핸들은 순회 중에만 유지한다.
+      쓰기 쪽은 replace_file의 재시도로 이 구간을 기다린다.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if size <= 0:
+        return
+    if size < _MMAP_MIN_BYTES:
+        yield from reversed(f.read().split(b"\n"))
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = size
+        while end > 0:
+            start = mm.rfind(b"\n", 0, end)
+            yield mm[start + 1:end]
+            if start < 0:
+                break
+            end = start
+
+
+def _file_sig(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass(slots=True)
+class OrderAttempt:
+    """
+    매수/매도 주문 시도 1건(실행 이력의 buy_attempts/sell_attempts 항목).
+    - 실행 중에는 객체로 누적하고, 저장 시점(append)에만 dict로 변환한다.
+    - 선택 필드(None)는 dict 변환 시 생략하여 기존 이력 포맷과 동일하게 유지한다.
+    """
+
+    symbol: str
+    exchange: str
+    qty: int
+    price: float
+    method: str
+    ok: bool
+    order_no: str | None = None
+    note: str | None = None
+    level: int | None = None
+    reason: str | None = None
+    profit_rate: float | None = None
+    take_profit_pct: float | None = None
+    stop_loss_pct: float | None = None
+    holding_days: int | None = None
+    max_hold_days: int | None = None
+
+    _REQUIRED = ("symbol", "exchange", "qty", "price", "method", "ok", "order_no")
+    _OPTIONAL = ("note", "level", "reason", "profit_rate", "take_profit_pct", "stop_loss_pct", "holding_days", "max_hold_days")
+
+    def to_dict(self) -> dict[str, Any]:
+        d = {k: getattr(self, k) for k in self._REQUIRED}
+        for k in self._OPTIONAL:
+            v = getattr(self, k)
+            if v is not None:
+                d[k] = v
+        return d
+
+
+def _attempts_to_dicts(rows) -> list:
+    if not isinstance(rows, list):
+        return rows
+    return [r.to_dict() if isinstance(r, OrderAttempt) else r for r in rows]
+
 
 @dataclass
 class ExecutionHistoryStore:
     """
     자동매매 실행 이력(모드별) 저장소.
-    - data/auto_trading_history_{mode}.json
+    - data/auto_trading_history_{mode}.jsonl: 전체 이력(1줄=1회 실행, 오래된 것이 위). 추가는 끝에 1줄 append
+    - data/auto_trading_history_index_{mode}.ndjson: 목록용 요약(1줄=1회 실행, 오래된 것이 위). 추가는 끝에 1줄 append
+    - data/auto_trading_history_{mode}/{run_id}.json: 상세
+    - data/auto_trading_last_buy_{mode}.json: 종목별 최근 매수 성공일 {symbol: YYYYMMDD} (get_last_buy_date용)
+    - 구버전 data/auto_trading_history_{mode}.json(배열)은 최초 append 시 jsonl로 1회 변환
+    - 구버전 목록 인덱스(.json 배열)는 ndjson이 생길 때까지 읽기 전용으로 사용
 
     저장 단위: run_id 1개 = 자동매매 1회 실행(스케줄/수동/미리보기 실행 포함)
     """
@@ -21,27 +222,108 @@ class ExecutionHistoryStore:
         project_root = Path(__file__).resolve().parents[2]
         self._data_dir = project_root / "data"
         self._data_dir.mkdir(parents=True, exist_ok=True)
-        self._path = self._data_dir / f"auto_trading_history_{self.mode}.json"
-        self._index_path = self._data_dir / f"auto_trading_history_index_{self.mode}.json"
+        self._path = self._data_dir / f"auto_trading_history_{self.mode}.jsonl"
+        self._legacy_path = self._data_dir / f"auto_trading_history_{self.mode}.json"
+        self._index_path = self._data_dir / f"auto_trading_history_index_{self.mode}.ndjson"
+        self._legacy_index_path = self._data_dir / f"auto_trading_history_index_{self.mode}.json"
         self._detail_dir = self._data_dir / f"auto_trading_history_{self.mode}"
         self._detail_dir.mkdir(parents=True, exist_ok=True)
+        self._last_buy_path = self._data_dir / f"auto_trading_last_buy_{self.mode}.json"
+        self._last_buy_index: dict[str, str] | None = None  # 최초 사용 시 로드
+        self._schedule_index_build()
 
-    def _read_all(self) -> list[dict[str, Any]]:
+    def _schedule_index_build(self) -> None:
+        """
+        목록 인덱스가 없고 전체 이력만 있으면 백그라운드에서 1회 생성(키움 방식: 목록 요약만 유지).
+        - list()가 첫 호출에서 전체 이력을 읽느라 지연되지 않도록 요청 경로에서 분리
+        """
         try:
-            if not self._path.exists():
+            if self._index_path.exists() or self._legacy_index_path.exists():
+                return
+            if not (self._path.exists() or self._legacy_path.exists()):
+                return
+            key = str(self._index_path)
+            with _INDEX_BUILD_LOCK:
+                if key in _INDEX_BUILDING:
+                    return
+                _INDEX_BUILDING.add(key)
+            threading.Thread(target=self._ensure_index, name=f"history-index-{self.mode}", daemon=True).start()
+        except Exception:
+            _INDEX_BUILDING.discard(str(self._index_path))
+
+    def _ensure_index(self) -> None:
+        """전체 이력에서 목록 인덱스 생성(인덱스가 여전히 없을 때만)."""
+        key = str(self._index_path)
+        try:
+            if self._index_path.exists() or self._legacy_index_path.exists():
+                return
+            # 전체 이력 읽기/요약은 잠금 밖에서 수행(생성 중에도 엔진의 append가 대기하지 않음)
+            rows = self._read_all()
+            if not rows:
+                return
+            slim_rows = [self._build_slim(r) for r in rows[: int(self.max_entries)] if isinstance(r, dict)]
+            with _index_file_lock(key):
+                # 그 사이 append가 인덱스를 만들었다면(전체 이력 요약 포함) 덮어쓰지 않음
+                if self._index_path.exists() or self._legacy_index_path.exists():
+                    return
+                self._write_index(slim_rows)
+        except Exception:
+            pass
+        finally:
+            _INDEX_BUILDING.discard(key)
+
+    def _read_legacy(self) -> list[dict[str, Any]]:
+        try:
+            if not self._legacy_path.exists():
                 return []
-            with open(self._path, "r", encoding="utf-8") as f:
-                data = json.load(f) or []
+            with open(self._legacy_path, "rb") as f:
+                data = _loads(f.read()) or []
             return data if isinstance(data, list) else []
         except Exception:
             return []
 
+    def _read_all(self) -> list[dict[str, Any]]:
+        """전체 이력(최신이 위). jsonl이 없으면 구버전 통합 파일을 읽는다."""
+        try:
+            if not self._path.exists():
+                return self._read_legacy()
+            with open(self._path, "rb") as f:
+                if os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                    # 큰 파일은 mmap으로 페이지 캐시를 직접 읽어 버퍼 복사를 줄인다.
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        rows = self._parse_lines(iter(mm.readline, b""))
+                else:
+                    rows = self._parse_lines(f)
+            rows.reverse()
+            return rows
+        except Exception:
+            return []
+
+    @staticmethod
+    def _parse_lines(lines) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                r = _loads(line)
+            except Exception:
+                # 비정상 종료로 잘린 마지막 줄 등은 건너뜀
+                continue
+            if isinstance(r, dict):
+                rows.append(r)
+        return rows
+
     def _write_all(self, rows: list[dict[str, Any]]) -> None:
+        """rows(최신이 위)로 jsonl 전체를 다시 쓴다(구버전 변환/compact 전용)."""
         tmp = self._path.with_suffix(self._path.suffix + ".tmp")
         try:
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(rows, f, ensure_ascii=False, indent=2)
-            tmp.replace(self._path)  # Windows 포함 원자적 교체
+            with open(tmp, "wb") as f:
+                for r in reversed(rows):
+                    f.write(_dumps(r))
+                    f.write(b"\n")
+            replace_file(tmp, self._path)  # Windows 포함 원자적 교체
         except Exception:
             try:
                 if tmp.exists():
@@ -49,22 +331,230 @@ class ExecutionHistoryStore:
             except Exception:
                 pass
 
-    def _read_index(self) -> list[dict[str, Any]]:
+    def _append_line(self, item: dict[str, Any]) -> None:
+        # 구버전 통합 파일만 있으면 먼저 jsonl로 1회 변환(이전 이력 보존)
+        if (not self._path.exists()) and self._legacy_path.exists():
+            legacy = self._read_legacy()
+            if legacy:
+                self._write_all(legacy[: int(self.max_entries)])
+        try:
+            before = _file_sig(self._path)
+            line = _dumps(item) + b"\n"
+            with open(self._path, "ab") as f:
+                f.write(line)
+        except Exception:
+            return
+        # 줄 수가 max_entries의 2배를 넘으면 최근 max_entries줄만 남긴다(매 append 전체 재작성 방지)
+        try:
+            if _appended_line_count(self._path, before) > 2 * int(self.max_entries):
+                _compact_lines(self._path, int(self.max_entries))
+        except Exception:
+            pass
+
+    def _iter_index(self):
+        """
+        목록 인덱스를 최신부터 1행씩 반환.
+        - 캐시가 유효하면 캐시, 아니면 ndjson을 파일 끝부터 줄 단위로 파싱(호출부가 중간에 멈추면 나머지는 읽지 않음)
+        - 끝까지 읽은 경우에만 캐시에 저장
+        """
+        key = str(self._index_path)
+        sig = _file_sig(self._index_path)
+        if sig is None:
+            _INDEX_CACHE.pop(key, None)
+            yield from self._read_legacy_index()
+            return
+        hit = _INDEX_CACHE.get(key)
+        if hit is not None and hit[0] == sig:
+            yield from tuple(hit[1])
+            return
+        rows: list[dict[str, Any]] = []
+        try:
+            with open(self._index_path, "rb") as f:
+                for line in _iter_lines_reversed(f):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        r = _loads(line)
+                    except Exception:
+                        continue
+                    if isinstance(r, dict):
+                        rows.append(r)
+                        yield r
+        except Exception:
+            return
+        _INDEX_CACHE[key] = (sig, deque(rows))
+
+    def _read_legacy_index(self) -> list[dict[str, Any]]:
         try:
-            if not self._index_path.exists():
+            if not self._legacy_index_path.exists():
                 return []
-            with open(self._index_path, "r", encoding="utf-8") as f:
-                data = json.load(f) or []
+            with open(self._legacy_index_path, "rb") as f:
+                data = _loads(f.read()) or []
             return data if isinstance(data, list) else []
         except Exception:
             return []
 
+    def _read_index(self) -> list[dict[str, Any]]:
+        """목록 인덱스 전체(최신이 위)"""
+        return list(self._iter_index())
+
     def _write_index(self, rows: list[dict[str, Any]]) -> None:
+        """rows(최신이 위)로 인덱스 전체를 다시 쓴다(구버전 변환/compact/요약 보강 전용)."""
         tmp = self._index_path.with_suffix(self._index_path.suffix + ".tmp")
         try:
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(rows, f, ensure_ascii=False, indent=2)
-            tmp.replace(self._index_path)
+            with open(tmp, "wb") as f:
+                for r in reversed(rows):
+                    f.write(_dumps(r))
+                    f.write(b"\n")
+            replace_file(tmp, self._index_path)
+            # 방금 쓴 내용을 캐시해 다음 append/list에서 다시 파싱하지 않음
+            sig = _file_sig(self._index_path)
+            if sig is not None:
+                _INDEX_CACHE[str(self._index_path)] = (sig, deque(rows))
+        except Exception:
+            try:
+                if tmp.exists():
+                    tmp.unlink()
+            except Exception:
+                pass
+
+    def _append_index(self, slim: dict[str, Any]) -> None:
+        """요약 1줄을 인덱스 끝에 추가(전체 재작성 없음). 줄 수가 max_entries의 2배를 넘으면 compact."""
+        with _index_file_lock(str(self._index_path)):
+            self._append_index_locked(slim)
+
+    def _append_index_locked(self, slim: dict[str, Any]) -> None:
+        key = str(self._index_path)
+        before = _file_sig(self._index_path)
+        if before is None and self._legacy_index_path.exists():
+            # 구버전 인덱스(.json 배열)만 있으면 ndjson으로 1회 변환(이전 목록 보존)
+            self._write_index([slim, *self._read_legacy_index()][: int(self.max_entries)])
+            return
+        if before is None and (self._path.exists() or self._legacy_path.exists()):
+            # 백그라운드 생성 전에 append가 먼저 오면 여기서 전체 이력 요약까지 함께 생성(이전 목록 보존)
+            rows = [self._build_slim(r) for r in self._read_all()[: int(self.max_entries) - 1] if isinstance(r, dict)]
+            self._write_index([slim, *rows])
+            return
+        try:
+            with open(self._index_path, "ab") as f:
+                f.write(_dumps(slim) + b"\n")
+        except Exception:
+            return
+        hit = _INDEX_CACHE.get(key)
+        after = _file_sig(self._index_path)
+        if hit is not None and hit[0] == before and after is not None:
+            hit[1].appendleft(slim)
+            _INDEX_CACHE[key] = (after, hit[1])
+        else:
+            # 다른 프로세스가 먼저 갱신했거나 캐시가 없으면 다음 조회에서 다시 읽는다.
+            _INDEX_CACHE.pop(key, None)
+        if _appended_line_count(self._index_path, before) > 2 * int(self.max_entries):
+            # 줄 원문 그대로 최근 max_entries줄만 남기고, 캐시는 다음 조회에서 다시 채운다.
+            try:
+                _compact_lines(self._index_path, int(self.max_entries))
+            except Exception:
+                pass
+            _INDEX_CACHE.pop(key, None)
+
+    def _load_last_buy_index(self) -> dict[str, str]:
+        if self._last_buy_index is not None:
+            return self._last_buy_index
+        idx: dict[str, str] | None = None
+        try:
+            if self._last_buy_path.exists():
+                with open(self._last_buy_path, "rb") as f:
+                    data = _loads(f.read())
+                if isinstance(data, dict):
+                    idx = {str(k): str(v) for k, v in data.items() if k and v}
+        except Exception:
+            idx = None
+        if idx is None:
+            # 사이드카가 없으면(최초/구버전) 1회 생성
+            idx = self._bootstrap_last_buy_index()
+            self._write_last_buy_index(idx)
+        self._last_buy_index = idx
+        return idx
+
+    def _bootstrap_last_buy_index(self) -> dict[str, str]:
+        """
+        종목별 최근 매수일 사이드카 초기 생성.
+        - 목록 인덱스(최신이 위)의 buy_symbols로 만들고, 그 필드가 없는 구버전 요약은
+          매수 시도가 있는 실행만 상세 파일을 연다(전체 이력 파일을 통째로 읽지 않음).
+        - 목록 인덱스가 없으면 전체 이력에서 생성
+        """
+        idx: dict[str, str] = {}
+        slims = self._read_index()
+        if not slims:
+            for r in reversed(self._read_all()):  # 오래된 것부터 → 최신이 덮어씀
+                self._index_buys(idx, r)
+            return idx
+        upgraded: list[dict[str, Any]] = []
+        n_upgraded = 0
+        for slim in slims:  # 최신부터 → 처음 본 날짜 유지
+            if isinstance(slim, dict) and "buy_symbols" not in slim:
+                # 구버전 요약: 매수 시도가 있을 때만 상세를 1회 읽어 buy_symbols를 채운다(이후 재생성 시 상세 불필요)
+                syms: list[str] = []
+                if slim.get("buy_attempts_count"):
+                    detail = self._read_detail(str(slim.get("run_id") or ""))
+                    syms = self._ok_buy_symbols(detail) if detail else []
+                slim = {**slim, "buy_symbols": syms}
+                n_upgraded += 1
+            upgraded.append(slim)
+            if not isinstance(slim, dict):
+                continue
+            day = self._run_day(slim)
+            if not day:
+                continue
+            for sym in slim.get("buy_symbols") or []:
+                idx.setdefault(sym, day)
+        if n_upgraded:
+            self._write_index(upgraded)
+        return idx
+
+    @staticmethod
+    def _ok_buy_symbols(r: dict[str, Any]) -> list[str]:
+        """실행 1건의 매수 성공 종목(대문자, 중복 제거, 등장 순서 유지)"""
+        out: list[str] = []
+        for att in (r.get("buy_attempts") or []):
+            if not isinstance(att, dict) or not att.get("ok"):
+                continue
+            sym = (att.get("symbol") or "").strip().upper()
+            if sym and sym not in out:
+                out.append(sym)
+        return out
+
+    @staticmethod
+    def _run_day(r: dict[str, Any]) -> str | None:
+        ts = r.get("started_at") or r.get("finished_at")
+        if not ts:
+            return None
+        try:
+            return datetime.fromisoformat(str(ts)).strftime("%Y%m%d")
+        except Exception:
+            return None
+
+    def _index_buys(self, idx: dict[str, str], r: dict[str, Any]) -> bool:
+        """실행 1건의 매수 성공 종목을 idx에 반영. 변경이 있으면 True"""
+        if not isinstance(r, dict):
+            return False
+        day = self._run_day(r)
+        if not day:
+            return False
+        changed = False
+        for sym in self._ok_buy_symbols(r):
+            if idx.get(sym) != day:
+                idx[sym] = day
+                changed = True
+        return changed
+
+    def _write_last_buy_index(self, idx: dict[str, str]) -> None:
+        tmp = self._last_buy_path.with_suffix(self._last_buy_path.suffix + ".tmp")
+        try:
+            # 기계 판독 전용이므로 들여쓰기 없이 저장
+            with open(tmp, "wb") as f:
+                f.write(_dumps(idx))
+            replace_file(tmp, self._last_buy_path)
         except Exception:
             try:
                 if tmp.exists():
@@ -81,11 +571,15 @@ class ExecutionHistoryStore:
             rid = str(item.get("run_id") or "").strip()
             if not rid:
                 return
-            path = self._detail_path(rid)
-            tmp = path.with_suffix(path.suffix + ".tmp")
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(item, f, ensure_ascii=False, indent=2)
-            tmp.replace(path)
+            key = str(self._detail_path(rid))
+            data = _dumps(item, indent=True)
+            global _DETAIL_WRITER
+            with _DETAIL_LOCK:
+                _DETAIL_PENDING[key] = data
+                if _DETAIL_WRITER is None or not _DETAIL_WRITER.is_alive():
+                    _DETAIL_WRITER = threading.Thread(target=_detail_writer, name="history-detail-writer", daemon=True)
+                    _DETAIL_WRITER.start()
+            _DETAIL_QUEUE.put(key)
         except Exception:
             pass
 
@@ -110,50 +604,46 @@ class ExecutionHistoryStore:
             "sell_attempts_count": _cnt(item.get("sell_attempts")),
             "skips_count": _cnt(item.get("skips")),
             "errors_count": _cnt(item.get("errors")),
+            # 매수 성공 종목: 사이드카 재생성 시 상세 파일을 열지 않기 위해 요약에 포함
+            "buy_symbols": self._ok_buy_symbols(item),
         }
 
     def append(self, item: dict[str, Any]) -> None:
         if not isinstance(item, dict):
             return
+        # 주문 시도(OrderAttempt)는 저장 시점에 한 번만 dict로 변환
+        item = {
+            **item,
+            "buy_attempts": _attempts_to_dicts(item.get("buy_attempts") or []),
+            "sell_attempts": _attempts_to_dicts(item.get("sell_attempts") or []),
+        }
         # 상세 파일 저장 (run_id 기준)
         self._write_detail(item)
 
         # 목록 인덱스 저장 (요약)
         try:
-            index_rows = self._read_index()
-            index_rows.insert(0, self._build_slim(item))
-            if len(index_rows) > int(self.max_entries):
-                index_rows = index_rows[: int(self.max_entries)]
-            self._write_index(index_rows)
+            self._append_index(self._build_slim(item))
         except Exception:
             pass
 
-        # 하위 호환: 기존 통합 파일도 유지
-        rows = self._read_all()
-        rows.insert(0, item)  # 최신이 위
-        if len(rows) > int(self.max_entries):
-            rows = rows[: int(self.max_entries)]
-        self._write_all(rows)
+        # 전체 이력: 기존 통합 파일을 매번 읽고 다시 쓰지 않고 1줄 append
+        self._append_line(item)
 
-    def list(self, days: int = 7) -> list[dict[str, Any]]:
-        rows = self._read_index()
-        if not rows:
-            rows = self._read_all()
-            if rows:
-                # 인덱스가 없으면 1회 생성 (키움 방식: 목록 요약만 유지)
-                try:
-                    slim_rows = [self._build_slim(r) for r in rows if isinstance(r, dict)]
-                    self._write_index(slim_rows[: int(self.max_entries)])
-                    rows = slim_rows
-                except Exception:
-                    pass
-        if not rows:
-            return []
+        # 종목별 최근 매수일 사이드카 갱신(매수 성공이 있을 때만)
         try:
-            cutoff = datetime.now() - timedelta(days=int(days))
+            idx = self._load_last_buy_index()
+            if self._index_buys(idx, item):
+                self._write_last_buy_index(idx)
         except Exception:
-            cutoff = datetime.now() - timedelta(days=7)
+            pass
 
+    @staticmethod
+    def _take_recent(rows, cutoff: datetime) -> list[dict[str, Any]]:
+        """
+        최신이 위인 rows에서 cutoff 이후 항목만. 기간 밖 항목을 만나면 이후는 더 오래됐으므로 중단.
+        - 엔진이 기록하는 시각(YYYY-MM-DDTHH:MM:SS)은 문자열 비교로 판정(datetime 생성 없음)
+        """
+        cutoff_iso = cutoff.isoformat(timespec="seconds")
         out: list[dict[str, Any]] = []
         for r in rows:
             try:
@@ -161,26 +651,50 @@ class ExecutionHistoryStore:
                 if not ts:
                     out.append(r)
                     continue
-                dt = datetime.fromisoformat(str(ts))
-                if dt >= cutoff:
-                    out.append(r)
+                ts = str(ts)
+                if len(ts) >= 19 and ts[10] == "T":
+                    if ts[:19] < cutoff_iso:
+                        break
+                elif datetime.fromisoformat(ts) < cutoff:
+                    break
+                out.append(r)
             except Exception:
                 out.append(r)
         return out
 
-    def get(self, run_id: str) -> dict[str, Any] | None:
-        rid = (run_id or "").strip()
-        if not rid:
-            return None
+    def list(self, days: int = 7) -> list[dict[str, Any]]:
+        try:
+            cutoff = datetime.now() - timedelta(days=int(days))
+        except Exception:
+            cutoff = datetime.now() - timedelta(days=7)
+
+        # 인덱스가 아직 없으면(백그라운드 생성 중) 빈 목록 - 다음 조회에서 반영
+        return self._take_recent(self._iter_index(), cutoff)
+
+    def _read_detail(self, rid: str) -> dict[str, Any] | None:
         try:
             path = self._detail_path(rid)
+            with _DETAIL_LOCK:
+                pending = _DETAIL_PENDING.get(str(path))
+            if pending is not None:
+                data = _loads(pending)
+                return data if isinstance(data, dict) else None
             if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(path, "rb") as f:
+                    data = _loads(f.read())
                 if isinstance(data, dict):
                     return data
         except Exception:
             pass
+        return None
+
+    def get(self, run_id: str) -> dict[str, Any] | None:
+        rid = (run_id or "").strip()
+        if not rid:
+            return None
+        data = self._read_detail(rid)
+        if data is not None:
+            return data
 
         for r in self._read_all():
             try:
@@ -195,50 +709,23 @@ class ExecutionHistoryStore:
     def get_last_buy_date(self, symbol: str, days: int | None = None) -> str | None:
         """
         자동매매 이력에서 종목별 '가장 최근 매수 성공일(YYYYMMDD)'을 반환.
-        - rows는 최신이 위라서 첫 매칭을 반환한다.
+        - 전체 이력을 훑지 않고 사이드카 인덱스(auto_trading_last_buy_{mode}.json)에서 조회한다.
+        - days가 주어지면 그 기간(일 단위) 안의 매수일만 반환한다.
         """
         sym = (symbol or "").strip().upper()
         if not sym:
             return None
-        rows = self._read_all()
-        if not rows:
+        try:
+            day = self._load_last_buy_index().get(sym)
+        except Exception:
+            return None
+        if not day:
             return None
         if days is not None:
             try:
-                cutoff = datetime.now() - timedelta(days=int(days))
+                cutoff = (datetime.now() - timedelta(days=int(days))).strftime("%Y%m%d")
+                if day < cutoff:
+                    return None
             except Exception:
-                cutoff = None
-        else:
-            cutoff = None
-
-        def _to_yyyymmdd(ts: str | None) -> str | None:
-            if not ts:
-                return None
-            try:
-                dt = datetime.fromisoformat(str(ts))
-                return dt.strftime("%Y%m%d")
-            except Exception:
-                return None
-
-        for r in rows:
-            try:
-                ts = r.get("started_at") or r.get("finished_at")
-                if cutoff and ts:
-                    try:
-                        dt = datetime.fromisoformat(str(ts))
-                        if dt < cutoff:
-                            continue
-                    except Exception:
-                        pass
-                for att in (r.get("buy_attempts") or []):
-                    if not isinstance(att, dict):
-                        continue
-                    if not att.get("ok"):
-                        continue
-                    s = (att.get("symbol") or "").strip().upper()
-                    if s == sym:
-                        return _to_yyyymmdd(ts)
-            except Exception:
-                continue
-        return None
-
+                pass
+        return day
@@ -20,6 +20,19 @@ from src.engine.engine import trading_engine
 from src.engine.scheduler_state_store import SchedulerStateStore
 from src.utils.logger import get_mode_logger
 
+# 장중 손절 감시/자동매매 시각이 없을 때 최대 대기(초). 하트비트가 너무 오래 멈추지 않도록 상한을 둔다.
+_IDLE_MAX_WAIT_SEC = 300.0
+# 대기 중 설정 파일 변경 확인 주기(초)
+_CONFIG_POLL_SEC = 60.0
+
+
+def _config_sig():
+    try:
+        st = os.stat(config_manager.CONFIG_FILE)
+        return (st.st_mtime_ns, st.st_size)
+    except Exception:
+        return None
+
 
 class _ModeScheduler:
     def __init__(self, mode: str):
@@ -97,17 +110,36 @@ class _ModeScheduler:
 
 def _scheduler_loop(mode: str):
     mode = (mode or "mock").strip().lower()
+    # 로거/상태 저장소/엔진 메서드는 프로세스당 1회만 만든다(루프 안에서 다시 만들지 말 것).
+    # - heartbeat의 '내용이 같으면 쓰기 생략'은 SchedulerStateStore 인스턴스 단위로 동작한다.
     log = get_mode_logger(mode)
     state = SchedulerStateStore(mode=mode)
+    heartbeat = state.heartbeat
+    stop_loss_watch = trading_engine.stop_loss_watch
+    run_engine = trading_engine.run
+    pid = os.getpid()
 
     is_executing = False
     last_error = None
+    # 마지막으로 로드한 설정 파일의 (mtime_ns, size). 프로세스 시작 시 1회는 반드시 로드
+    config_sig = None
+    # 종료 신호 시 대기를 즉시 깨우기 위한 이벤트
+    wake_event = threading.Event()
+
+    def _on_run_start():
+        # 엔진이 실제 1회 실행을 시작할 때만 '실행 중' 표시(스케줄 시각이 아닌 틱에는 기록 없음)
+        nonlocal is_executing
+        is_executing = True
+        heartbeat(pid=pid, is_running=True, is_executing=True, last_error=last_error)
+
+    trading_engine.on_run_start = _on_run_start
 
     def _sig_handler(signum, frame):
         nonlocal last_error
         last_error = f"signal:{signum}"
+        wake_event.set()
         try:
-            state.heartbeat(pid=os.getpid(), is_running=False, is_executing=is_executing, last_error=last_error)
+            heartbeat(pid=pid, is_running=False, is_executing=is_executing, last_error=last_error)
         except Exception:
             pass
         raise SystemExit(0)
@@ -121,9 +153,9 @@ def _scheduler_loop(mode: str):
 
     started_at = datetime.now().isoformat(timespec="seconds")
     restart_count = 0
-    log.info(f"[Scheduler] 프로세스 시작: pid={os.getpid()}, mode={mode}")
-    state.heartbeat(
-        pid=os.getpid(),
+    log.info(f"[Scheduler] 프로세스 시작: pid={pid}, mode={mode}")
+    heartbeat(
+        pid=pid,
         is_running=True,
         is_executing=False,
         last_error=None,
@@ -136,8 +168,11 @@ def _scheduler_loop(mode: str):
     while True:
         loop_started = datetime.now()
         try:
-            # 1) 설정 reload (웹에서 저장해도 반영)
-            config_manager.load_config()
+            # 1) 설정 reload (웹에서 저장해도 반영) - 파일이 바뀌었을 때만 다시 파싱
+            sig = _config_sig()
+            if sig is None or sig != config_sig:
+                config_manager.load_config()
+                config_sig = sig
             # 2) 런타임 모드 주입 (파일에는 쓰지 않음) - mode=None 기본 동작이 안전해짐
             try:
                 config_manager._config.setdefault("common", {})
@@ -145,44 +180,23 @@ def _scheduler_loop(mode: str):
             except Exception:
                 pass
 
-            is_executing = False
-            state.heartbeat(
-                pid=os.getpid(),
-                is_running=True,
-                is_executing=False,
-                last_error=last_error,
-                extra={
-                    "started_at": loop_started.isoformat(timespec="seconds"),
-                    "engine_last_run_at": trading_engine.last_run_at.isoformat() if trading_engine.last_run_at else None,
-                    "engine_last_error": trading_engine.last_error,
-                    "stop_watch_last_run_at": trading_engine.last_stop_watch_at.isoformat() if trading_engine.last_stop_watch_at else None,
-                    "stop_watch_last_error": trading_engine.last_stop_watch_error,
-                    "process_started_at": started_at,
-                    "restart_count": restart_count,
-                },
-            )
-
             # 3) 장중 손절 감시(모드별) - intraday_stop_loss.enabled 기반, 자동매매와 별개
-            trading_engine.stop_loss_watch()
+            stop_loss_watch()
 
             # 4) 자동매매(모드별) - auto_trading_enabled + schedule_time + 하루 1회 조건은 엔진 내부에서 처리
-            is_executing = True
-            state.heartbeat(
-                pid=os.getpid(),
-                is_running=True,
-                is_executing=True,
-                last_error=last_error,
-            )
-            trading_engine.run()
+            # - is_executing=True 하트비트는 엔진이 실제로 실행을 시작할 때만(on_run_start) 기록
+            is_executing = False
+            run_engine()
             is_executing = False
 
-            # 실행 후 상태 갱신
-            state.heartbeat(
-                pid=os.getpid(),
+            # 루프 1회 상태 기록(1회). 내용이 그대로면 heartbeat 내부에서 주기적으로만 파일을 교체한다.
+            heartbeat(
+                pid=pid,
                 is_running=True,
                 is_executing=False,
                 last_error=last_error,
                 extra={
+                    "started_at": loop_started.isoformat(timespec="seconds"),
                     "engine_last_run_at": trading_engine.last_run_at.isoformat() if trading_engine.last_run_at else None,
                     "engine_last_error": trading_engine.last_error,
                     "stop_watch_last_run_at": trading_engine.last_stop_watch_at.isoformat() if trading_engine.last_stop_watch_at else None,
@@ -201,14 +215,29 @@ def _scheduler_loop(mode: str):
             except Exception:
                 pass
             try:
-                state.heartbeat(pid=os.getpid(), is_running=True, is_executing=is_executing, last_error=last_error)
+                heartbeat(pid=pid, is_running=True, is_executing=is_executing, last_error=last_error)
             except Exception:
                 pass
 
-        # 1분 주기(키움 샘플과 동일). 실행 시간이 길어지면 그만큼 다음 체크가 늦어질 수 있음.
-        time.sleep(60)
+        # 다음 체크 시각까지 대기: 장중 손절 감시 중이면 1분(키움 샘플과 동일), 아니면 다음 자동매매 시각/장 시작까지.
+        # 대기 중에도 설정 파일이 바뀌면(웹 저장) 즉시 깨어나 새 설정으로 다시 계산한다.
+        try:
+            delay = trading_engine.seconds_until_next_check(mode, max_wait=_IDLE_MAX_WAIT_SEC)
+        except Exception:
+            delay = 60.0
+        deadline = time.monotonic() + delay
+        while not wake_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if wake_event.wait(timeout=min(remaining, _CONFIG_POLL_SEC)):
+                break
+            if _config_sig() != config_sig:
+                break
+        if wake_event.is_set():
+            break
 
-    log.info(f"[Scheduler] 프로세스 종료: pid={os.getpid()}, mode={mode}")
+    log.info(f"[Scheduler] 프로세스 종료: pid={pid}, mode={mode}")
 
 
 class MultiProcessScheduler:
@@ -249,6 +278,8 @@ class MultiProcessScheduler:
         self._watchdog_stop.clear()
 
         def _loop():
+            # 모드별 상태 저장소는 루프 밖에서 1회만 생성
+            stores = {ms.mode: SchedulerStateStore(mode=ms.mode) for ms in (self.mock, self.real)}
             # 운영 안정성: 죽으면 자동 재시작 + 백오프
             while not self._watchdog_stop.is_set():
                 for ms in (self.mock, self.real):
@@ -263,7 +294,7 @@ class MultiProcessScheduler:
                             continue
 
                         # 상태 파일에 restart 시도 기록(웹에서 확인 가능)
-                        st = SchedulerStateStore(mode=ms.mode)
+                        st = stores[ms.mode]
                         prev = st.read() or {}
                         rc = int(prev.get("restart_count") or 0) + 1
                         st.heartbeat(
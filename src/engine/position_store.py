@@ -1,7 +1,73 @@
-import json
 import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from datetime import datetime
 
+from src.utils.json_io import dumps as _dumps, loads as _loads
+from src.utils.fs import replace_file
+
+# 파싱 결과 캐시: 파일 경로 -> ((mtime_ns, size), data)
+# - 웹/엔진은 조회할 때마다 PositionStore를 새로 만들므로 모듈 단위로 보관
+# - 다른 프로세스가 파일을 교체하면 mtime/size가 달라져 다시 읽는다.
+# - 인스턴스는 self.data를 직접 수정하므로 캐시 원본은 건네지 않고 복사본을 준다.
+_LOAD_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+# 오늘 날짜(YYYYMMDD) 캐시: (epoch 분, 문자열) - 날짜 경계가 분 단위이므로 같은 분 안에서는 재사용
+_TODAY_CACHE: tuple[int, str] = (-1, "")
+
+
+def _file_sig(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except Exception:
+        return None
+
+
+@dataclass(slots=True)
+class Position:
+    """
+    보유 종목 1건(positions 항목).
+    - 메모리에서는 slots 객체로 들고 있고, 파일 저장 시점에만 dict로 변환한다.
+    """
+
+    open_date: str | None = None
+    open_date_source: str | None = None
+    qty: int = 0
+    exchange: str | None = None
+
+    @classmethod
+    def from_dict(cls, d) -> "Position":
+        if not isinstance(d, dict):
+            return cls()
+        try:
+            qty = int(d.get("qty") or 0)
+        except Exception:
+            qty = 0
+        return cls(d.get("open_date"), d.get("open_date_source"), qty, d.get("exchange"))
+
+    def to_dict(self) -> dict:
+        return {
+            "open_date": self.open_date,
+            "open_date_source": self.open_date_source,
+            "qty": self.qty,
+            "exchange": self.exchange,
+        }
+
+
+# 조회용 빈 항목(없는 종목 조회 시 기본값 반환용 - 수정하지 말 것)
+_EMPTY_POSITION = Position()
+
+
+def _copy_state(data: dict) -> dict:
+    """meta(missing_counts 포함)와 Position까지 복사(값은 문자열/숫자라 2단계 복사로 충분)"""
+    meta = dict(data.get("meta") or {})
+    meta["missing_counts"] = dict(meta.get("missing_counts") or {})
+    positions = {sym: replace(pos) for sym, pos in (data.get("positions") or {}).items()}
+    return {"meta": meta, "positions": positions}
+
 
 class PositionStore:
     """
@@ -20,42 +86,118 @@ class PositionStore:
         #   "meta": {"api_sync_day": "YYYYMMDD"},
         #   "positions": { "TSLA": {"open_date": "YYYYMMDD", "open_date_source": "detect|api", "qty": 1, "exchange": "NASD"} }
         # }
-        self.data = {"meta": {}, "positions": {}}
+        # 메모리에서는 positions 값이 Position 객체(저장 시 dict로 변환)
+        self._set_data({"meta": {}, "positions": {}})
+        # batch() 중에는 저장을 미루고 종료 시 1회만 기록
+        self._batch_depth = 0
+        self._dirty = False
         self._load()
 
     def _load(self):
         os.makedirs(self.data_dir, exist_ok=True)
-        if not os.path.exists(self.path):
+        sig = _file_sig(self.path)
+        if sig is None:
             self._save()
             return
+        hit = _LOAD_CACHE.get(self.path)
+        if hit is not None and hit[0] == sig:
+            self._set_data(_copy_state(hit[1]))
+            return
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                loaded = json.load(f) or {}
+            with open(self.path, "rb") as f:
+                loaded = _loads(f.read()) or {}
             if isinstance(loaded, dict) and "positions" in loaded:
                 # meta는 옵션 (하위호환)
                 meta = loaded.get("meta") or {}
                 meta.setdefault("missing_counts", {})
-                self.data = {"meta": meta, "positions": loaded.get("positions") or {}}
+                positions = {sym: Position.from_dict(pos) for sym, pos in (loaded.get("positions") or {}).items()}
+                self._set_data({"meta": meta, "positions": positions})
+                _LOAD_CACHE[self.path] = (sig, _copy_state(self.data))
         except Exception:
             # 손상 파일이면 초기화
-            self.data = {"meta": {}, "positions": {}}
+            self._set_data({"meta": {}, "positions": {}})
             self._save()
 
+    def _set_data(self, data: dict) -> None:
+        """self.data 교체 + 자주 쓰는 하위 dict 별칭(조회/갱신마다 self.data를 다시 찾지 않음)"""
+        self.data = data
+        self._positions: dict[str, Position] = data.setdefault("positions", {})
+        self._meta: dict = data.setdefault("meta", {})
+
+    def _to_json(self) -> dict:
+        return {
+            "meta": self._meta,
+            "positions": {sym: pos.to_dict() for sym, pos in self._positions.items()},
+        }
+
     def _save(self):
+        if self._batch_depth > 0:
+            self._dirty = True
+            return
+        self._write()
+
+    def _write(self):
         os.makedirs(self.data_dir, exist_ok=True)
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        # 임시 파일에 쓴 뒤 교체(쓰기 도중 종료돼도 기존 파일이 잘리지 않음, Windows 포함 원자적 교체)
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_dumps(self._to_json(), indent=True))
+                # 교체 전에 디스크까지 기록(전원 차단 시 빈 파일로 교체되는 것 방지 - 보유 시작일은 다시 만들 수 없음)
+                f.flush()
+                os.fsync(f.fileno())
+            replace_file(tmp, self.path)
+        except Exception:
+            _LOAD_CACHE.pop(self.path, None)
+            try:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            except Exception:
+                pass
+            raise
+        self._dirty = False
+        # 방금 쓴 내용을 캐시해 다음 인스턴스가 다시 파싱하지 않음
+        sig = _file_sig(self.path)
+        if sig is not None:
+            _LOAD_CACHE[self.path] = (sig, _copy_state(self.data))
+
+    @contextmanager
+    def batch(self):
+        """
+        여러 종목 갱신(upsert/mark_missing/set_open_date 등)을 묶어 파일 저장을 1회로 줄인다.
+        - 중첩 가능: 가장 바깥 batch 종료 시 변경이 있었으면 저장
+        - 블록 내 예외가 나도 그때까지의 변경은 저장한다(기존 즉시 저장과 동일한 결과).
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """미뤄둔 변경이 있으면 지금 저장(batch 밖에서 직접 호출해도 됨)."""
+        if self._dirty:
+            self._write()
 
     @staticmethod
     def _today_yyyymmdd() -> str:
-        return datetime.now().strftime("%Y%m%d")
+        global _TODAY_CACHE
+        minute = int(time.time() // 60)
+        cached = _TODAY_CACHE
+        if cached[0] == minute:
+            return cached[1]
+        today = datetime.now().strftime("%Y%m%d")
+        _TODAY_CACHE = (minute, today)
+        return today
 
     def upsert(self, symbol: str, qty: int, exchange: str | None = None):
         symbol = (symbol or "").strip().upper()
         if not symbol:
             return
 
-        positions = self.data.setdefault("positions", {})
+        positions = self._positions
 
         if qty <= 0:
             if symbol in positions:
@@ -64,13 +206,9 @@ class PositionStore:
             self._save()
             return
 
-        if symbol not in positions:
-            positions[symbol] = {
-                "open_date": self._today_yyyymmdd(),
-                "open_date_source": "detect",
-                "qty": int(qty),
-                "exchange": exchange,
-            }
+        pos = positions.get(symbol)
+        if pos is None:
+            positions[symbol] = Position(self._today_yyyymmdd(), "detect", int(qty), exchange)
             self.clear_missing(symbol)
             self._save()
             return
@@ -78,58 +216,72 @@ class PositionStore:
         # 수량 증가(추가매수) 시 보유 시작일 갱신:
         # - 기존 방식: 오늘로 리셋(보수적)
         # - 단, API로 확정된 open_date(api)는 유지한다(최초 매수일 기반 보유기간 표시/강제매도 목적)
-        prev_qty = int(positions[symbol].get("qty", 0) or 0)
-        if int(qty) > prev_qty:
-            if (positions[symbol].get("open_date_source") or "detect") != "api":
-                positions[symbol]["open_date"] = self._today_yyyymmdd()
-                positions[symbol]["open_date_source"] = "detect"
-
-        positions[symbol]["qty"] = int(qty)
-        if exchange:
-            positions[symbol]["exchange"] = exchange
+        qty = int(qty)
+        changed = False
+        if qty > pos.qty:
+            if (pos.open_date_source or "detect") != "api":
+                pos.open_date = self._today_yyyymmdd()
+                pos.open_date_source = "detect"
+            changed = True
+        elif qty != pos.qty:
+            changed = True
+
+        pos.qty = qty
+        if exchange and pos.exchange != exchange:
+            pos.exchange = exchange
+            changed = True
         self.clear_missing(symbol)
-        self._save()
+        # 잔고 동기화에서 대부분의 종목은 그대로이므로 실제 변경이 있을 때만 저장 표시
+        if changed:
+            self._save()
 
     def get_open_date(self, symbol: str) -> str | None:
         symbol = (symbol or "").strip().upper()
-        return (self.data.get("positions", {}).get(symbol) or {}).get("open_date")
+        return self._positions.get(symbol, _EMPTY_POSITION).open_date
 
     def get_open_date_source(self, symbol: str) -> str | None:
         symbol = (symbol or "").strip().upper()
-        return (self.data.get("positions", {}).get(symbol) or {}).get("open_date_source")
+        return self._positions.get(symbol, _EMPTY_POSITION).open_date_source
+
+    def get_open_date_sources(self) -> dict[str, str | None]:
+        """전체 보유 종목의 open_date_source를 한 번에 반환 (종목별 조회 반복 방지)"""
+        return {sym: pos.open_date_source for sym, pos in self._positions.items()}
 
     def set_open_date(self, symbol: str, open_date: str, source: str = "api") -> None:
+        """
+        보유 시작일 기록.
+        - open_date: YYYYMMDD 문자열(호출부에서 _as_yyyymmdd 등으로 정규화된 값)
+        - source: 소문자 출처("api", "buy_exec" 등)
+        """
         symbol = (symbol or "").strip().upper()
         if not symbol:
             return
-        if not open_date or len(str(open_date)) != 8:
+        if not open_date or len(open_date) != 8:
             return
-        positions = self.data.setdefault("positions", {})
-        pos = positions.setdefault(symbol, {})
-        cur_source = str(pos.get("open_date_source") or "detect").strip().lower()
-        new_source = str(source or "api").strip().lower()
+        positions = self._positions
+        pos = positions.get(symbol)
+        if pos is None:
+            pos = positions[symbol] = Position()
+        cur_date = pos.open_date or ""
 
         # api가 제공하는 open_date는 신뢰도가 높지만,
         # 이미 더 최신 날짜가 기록된 경우(전량 매도 후 재매수 등)는 과거로 되돌리지 않는다.
-        if new_source == "api" and cur_source != "api":
-            new_date = str(open_date)
-            cur_date = str(pos.get("open_date") or "")
-            if (not cur_date) or (len(cur_date) != 8) or (new_date >= cur_date):
-                pos["open_date"] = new_date
-                pos["open_date_source"] = "api"
+        if source == "api" and (pos.open_date_source or "detect") != "api":
+            if len(cur_date) != 8 or open_date >= cur_date:
+                pos.open_date = open_date
+                pos.open_date_source = "api"
                 self._save()
             return
 
         # "가장 최근 매수일" 기준: 더 최신 날짜일 때만 갱신(과거로 되돌아가는 것 방지)
-        new_date = str(open_date)
-        cur_date = str(pos.get("open_date") or "")
-        if (not cur_date) or (len(cur_date) != 8) or (new_date >= cur_date):
-            pos["open_date"] = new_date
-            pos["open_date_source"] = new_source
-        self._save()
+        if len(cur_date) != 8 or open_date >= cur_date:
+            if pos.open_date != open_date or pos.open_date_source != source:
+                pos.open_date = open_date
+                pos.open_date_source = source
+                self._save()
 
     def _missing_counts(self) -> dict:
-        meta = self.data.setdefault("meta", {})
+        meta = self._meta
         mc = meta.setdefault("missing_counts", {})
         if not isinstance(mc, dict):
             meta["missing_counts"] = {}
@@ -162,42 +314,48 @@ class PositionStore:
         return int(mc.get(symbol, 0) or 0)
 
     def get_api_sync_day(self) -> str | None:
-        return (self.data.get("meta") or {}).get("api_sync_day")
+        return self._meta.get("api_sync_day")
 
     def set_api_sync_day(self, day: str) -> None:
-        self.data.setdefault("meta", {})
-        self.data["meta"]["api_sync_day"] = day
+        meta = self._meta
+        if meta.get("api_sync_day") == day:
+            return
+        meta["api_sync_day"] = day
         self._save()
 
     def get_api_retry_at(self) -> str | None:
-        return (self.data.get("meta") or {}).get("api_retry_at")
+        return self._meta.get("api_retry_at")
 
     def set_api_retry_at(self, dt_iso: str) -> None:
-        self.data.setdefault("meta", {})
-        self.data["meta"]["api_retry_at"] = dt_iso
+        meta = self._meta
+        if meta.get("api_retry_at") == dt_iso:
+            return
+        meta["api_retry_at"] = dt_iso
         self._save()
 
     def clear_api_retry(self) -> None:
-        meta = self.data.setdefault("meta", {})
-        if "api_retry_at" in meta:
-            del meta["api_retry_at"]
-        if "api_last_error" in meta:
-            del meta["api_last_error"]
+        meta = self._meta
+        if "api_retry_at" not in meta and "api_last_error" not in meta:
+            return
+        meta.pop("api_retry_at", None)
+        meta.pop("api_last_error", None)
         self._save()
 
     def set_api_last_error(self, msg: str | None) -> None:
-        self.data.setdefault("meta", {})
+        meta = self._meta
+        if meta.get("api_last_error") == (msg or None):
+            return
         if msg:
-            self.data["meta"]["api_last_error"] = msg
+            meta["api_last_error"] = msg
         else:
-            self.data["meta"].pop("api_last_error", None)
+            meta.pop("api_last_error", None)
         self._save()
 
     def get_exchange(self, symbol: str) -> str | None:
         symbol = (symbol or "").strip().upper()
-        return (self.data.get("positions", {}).get(symbol) or {}).get("exchange")
+        return self._positions.get(symbol, _EMPTY_POSITION).exchange
 
     def all_symbols(self):
-        return list((self.data.get("positions", {}) or {}).keys())
+        return list(self._positions)
 
 
@@ -1,8 +1,10 @@
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from src.utils.fs import replace_file
+from src.utils.json_io import dumps as _dumps, loads as _loads
+
 
 @dataclass
 class RunStateStore:
@@ -25,8 +27,8 @@ class RunStateStore:
         try:
             if not self._path.exists():
                 return None
-            with open(self._path, "r", encoding="utf-8") as f:
-                data = json.load(f) or {}
+            with open(self._path, "rb") as f:
+                data = _loads(f.read()) or {}
             day = data.get("last_scheduled_run_day")
             if isinstance(day, str) and len(day) == 8 and day.isdigit():
                 return day
@@ -41,10 +43,10 @@ class RunStateStore:
         payload = {"last_scheduled_run_day": day}
         tmp = self._path.with_suffix(self._path.suffix + ".tmp")
         try:
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
+            with open(tmp, "wb") as f:
+                f.write(_dumps(payload, indent=True))
             # Windows 포함 원자적 교체
-            tmp.replace(self._path)
+            replace_file(tmp, self._path)
         except Exception:
             try:
                 if tmp.exists():
@@ -1,9 +1,17 @@
-import json
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from src.utils.fs import replace_file
+from src.utils.json_io import dumps as _dumps, loads as _loads
+
+# 내용이 같은 하트비트는 이 간격(초)마다 한 번만 다시 쓴다(last_check_at 갱신용).
+_HEARTBEAT_REFRESH_SEC = 60.0
+# 루프 1회마다 바뀌는 값: 변경 여부 판정(해시)에서 제외
+_HEARTBEAT_VOLATILE_KEYS = ("last_check_at", "started_at")
+
 
 @dataclass
 class SchedulerStateStore:
@@ -20,13 +28,18 @@ class SchedulerStateStore:
         self._data_dir = project_root / "data"
         self._data_dir.mkdir(parents=True, exist_ok=True)
         self._path = self._data_dir / f"scheduler_state_{self.mode}.json"
+        # 하트비트 누적 상태(extra 없이 호출해도 이전 값 유지)와
+        # 마지막으로 기록한 내용(루프마다 바뀌는 값 제외)의 해시/기록 시각(monotonic)
+        self._hb_state: dict[str, Any] = {}
+        self._last_hb_hash: int | None = None
+        self._last_hb_at = 0.0
 
     def read(self) -> dict[str, Any]:
         try:
             if not self._path.exists():
                 return {}
-            with open(self._path, "r", encoding="utf-8") as f:
-                data = json.load(f) or {}
+            with open(self._path, "rb") as f:
+                data = _loads(f.read()) or {}
             return data if isinstance(data, dict) else {}
         except Exception:
             return {}
@@ -36,9 +49,10 @@ class SchedulerStateStore:
             return
         tmp = self._path.with_suffix(self._path.suffix + ".tmp")
         try:
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
-            tmp.replace(self._path)  # Windows 포함 원자적 교체
+            # 하트비트는 자주 기록되므로 들여쓰기 없이(웹 프로세스만 읽음)
+            with open(tmp, "wb") as f:
+                f.write(_dumps(payload))
+            replace_file(tmp, self._path)  # Windows 포함 원자적 교체
         except Exception:
             try:
                 if tmp.exists():
@@ -56,15 +70,28 @@ class SchedulerStateStore:
         extra: dict[str, Any] | None = None,
     ) -> None:
         now = datetime.now().isoformat(timespec="seconds")
-        payload: dict[str, Any] = {
-            "mode": self.mode,
-            "pid": int(pid),
-            "last_check_at": now,
-            "is_running": bool(is_running),
-            "is_executing": bool(is_executing),
-            "last_error": (str(last_error) if last_error else None),
-        }
+        payload = self._hb_state
+        payload.update(
+            mode=self.mode,
+            pid=int(pid),
+            last_check_at=now,
+            is_running=bool(is_running),
+            is_executing=bool(is_executing),
+            last_error=(str(last_error) if last_error else None),
+        )
         if extra and isinstance(extra, dict):
             payload.update(extra)
+
+        # 상태가 그대로면(시각 값만 바뀜) _HEARTBEAT_REFRESH_SEC마다 한 번만 기록
+        try:
+            body = {k: v for k, v in payload.items() if k not in _HEARTBEAT_VOLATILE_KEYS}
+            h = hash(_dumps(body))
+        except Exception:
+            h = None
+        now_m = time.monotonic()
+        if h is not None and h == self._last_hb_hash and (now_m - self._last_hb_at) < _HEARTBEAT_REFRESH_SEC:
+            return
         self.write(payload)
+        self._last_hb_hash = h
+        self._last_hb_at = now_m
 
@@ -0,0 +1,18 @@
+import os
+import time
+
+# Windows: 다른 프로세스가 대상 파일을 읽는 중(일반 open/mmap 포함)이면 os.replace가 PermissionError로 실패할 수 있다.
+# 파이썬 open()은 FILE_SHARE_DELETE 없이 열기 때문에, 읽기 핸들이 닫힐 때까지 짧게 재시도한다.
+_REPLACE_RETRIES = 5
+
+
+def replace_file(src, dst) -> None:
+    """src -> dst 원자적 교체(os.replace). 공유 위반(PermissionError)이면 10ms부터 지수 백오프로 재시도."""
+    for i in range(_REPLACE_RETRIES):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if i == _REPLACE_RETRIES - 1:
+                raise
+            time.sleep(0.01 * (1 << i))
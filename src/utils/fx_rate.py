@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
@@ -15,36 +17,44 @@ class FxRateResult:
     error: Optional[str] = None
 
 
-# 프로세스 메모리 캐시(서버 재시작 시 초기화)
-_CACHE: dict[str, Tuple[FxRateResult, datetime]] = {}
+# 프로세스 메모리 캐시(서버 재시작 시 초기화): key -> (결과, 만료 시각(time.monotonic 기준))
+# - 벽시계(datetime.now) 대신 monotonic을 써서 조회마다 datetime 생성이 없고 시계 변경에도 영향 없음
+_CACHE: dict[str, Tuple[FxRateResult, float]] = {}
 _CACHE_TTL_SEC = 600  # 10분
 
+# KIS(v1_008) 환율 조회 실패 시 잠시 KIS를 건너뛰고 바로 FDR로: mode -> 재시도 가능 시각(time.monotonic 기준)
+_KIS_FAIL_CACHE: dict[str, float] = {}
+_KIS_FAIL_TTL_SEC = 60
+
 
 def _cache_get(key: str) -> Optional[FxRateResult]:
     item = _CACHE.get(key)
     if not item:
         return None
     val, expires_at = item
-    if datetime.now() >= expires_at:
+    if time.monotonic() >= expires_at:
         _CACHE.pop(key, None)
         return None
     return val
 
 
 def _cache_set(key: str, val: FxRateResult) -> None:
-    _CACHE[key] = (val, datetime.now() + timedelta(seconds=_CACHE_TTL_SEC))
+    _CACHE[key] = (val, time.monotonic() + _CACHE_TTL_SEC)
 
 
 def _to_float(v) -> float:
+    # 숫자/일반 숫자 문자열은 float() 1회, 빈 값은 예외 없이 0.0, 콤마 제거는 실패 시에만
+    if v is None or v == "":
+        return 0.0
+    if isinstance(v, (int, float)):
+        return float(v)
     try:
-        if v is None:
-            return 0.0
-        s = str(v).replace(",", "").strip()
-        if s == "":
+        return float(v)
+    except (TypeError, ValueError):
+        try:
+            return float(str(v).replace(",", "").strip() or 0)
+        except Exception:
             return 0.0
-        return float(s)
-    except Exception:
-        return 0.0
 
 
 def _extract_usd_krw_from_present(present: dict) -> FxRateResult:
@@ -76,25 +86,56 @@ def _extract_usd_krw_from_present(present: dict) -> FxRateResult:
     return FxRateResult(rate=None, source="kis_v1_008_unavailable", fetched_at=datetime.now().isoformat())
 
 
+# FinanceDataReader 모듈 핸들(선택 의존성, 최초 사용 시 1회 import)
+# - 미설치면 ImportError도 기억해 매 호출마다 sys.path를 다시 탐색하지 않는다.
+_FDR_MODULE = None
+_FDR_IMPORT_ERROR: Optional[Exception] = None
+_FDR_LOCK = threading.Lock()
+
+
+def _get_fdr():
+    global _FDR_MODULE, _FDR_IMPORT_ERROR
+    if _FDR_MODULE is not None:
+        return _FDR_MODULE
+    if _FDR_IMPORT_ERROR is not None:
+        raise _FDR_IMPORT_ERROR
+    with _FDR_LOCK:
+        if _FDR_MODULE is None and _FDR_IMPORT_ERROR is None:
+            try:
+                import FinanceDataReader as fdr
+
+                _FDR_MODULE = fdr
+            except ImportError as e:
+                _FDR_IMPORT_ERROR = e
+    if _FDR_MODULE is None:
+        raise _FDR_IMPORT_ERROR
+    return _FDR_MODULE
+
+
 def _fetch_usd_krw_from_fdr() -> FxRateResult:
     """
     FinanceDataReader로 USD/KRW 환율(당일/최근)을 조회.
     - 키움증권 자동매매 분석 프로젝트에서 쓰는 방식과 동일: fdr.DataReader('USD/KRW', start, end)['Close'].
     """
     try:
-        import FinanceDataReader as fdr
-
-        end = datetime.now().strftime("%Y-%m-%d")
-        start = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-        df = fdr.DataReader("USD/KRW", start, end)
+        fdr = _get_fdr()
+        now = datetime.now()
+        end = now.strftime("%Y-%m-%d")
+        # 당일 1일치만 먼저 조회하고, 비어 있으면(주말/휴일/고시 전) 기존 7일 구간으로 다시 조회
+        df = None
+        for lookback_days in (0, 7):
+            start = (now - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+            df = fdr.DataReader("USD/KRW", start, end)
+            if df is not None and not getattr(df, "empty", True):
+                break
         if df is None or getattr(df, "empty", True):
             return FxRateResult(rate=None, source="fdr_usdkrw_empty", fetched_at=datetime.now().isoformat())
-        # 최근 종가(또는 마지막 행의 Close) 사용
-        try:
-            last = float(df["Close"].iloc[-1])
-        except Exception:
+        # 최근 종가(또는 마지막 행의 마지막 값) 사용
+        if "Close" in df.columns:
+            last = float(df["Close"].iat[-1])
+        else:
             # 컬럼명이 다르면 마지막 값 폴백
-            last = float(df.iloc[-1].values[-1])
+            last = float(df.iat[-1, -1])
         if last > 0:
             return FxRateResult(rate=last, source="fdr_usdkrw", fetched_at=datetime.now().isoformat())
         return FxRateResult(rate=None, source="fdr_usdkrw_invalid", fetched_at=datetime.now().isoformat())
@@ -118,24 +159,31 @@ def get_usd_krw_rate(
     if cached:
         return cached
 
-    # 1) KIS
-    try:
-        if kis_present is None:
-            from src.api.order import kis_order
-
-            kis_present = kis_order.get_present_balance(
-                natn_cd="000",
-                tr_mket_cd="00",
-                inqr_dvsn_cd="00",
-                wcrc_frcr_dvsn_cd="02",
-                mode=mode,
-            ) or {}
-        r1 = _extract_usd_krw_from_present(kis_present)
-        if r1.rate and r1.rate > 0:
-            _cache_set(cache_key, r1)
-            return r1
-    except Exception as e:
-        logger.warning(f"[FX] KIS 환율 추출 실패(무시하고 FDR 폴백): {e}")
+    # 1) KIS (호출부가 v1_008 응답을 넘겨주지 않았고 최근에 실패했으면 네트워크 호출 없이 바로 FDR로)
+    r1 = None
+    skip_kis = kis_present is None and _KIS_FAIL_CACHE.get(mode, 0.0) > time.monotonic()
+    if not skip_kis:
+        fetched = kis_present is None
+        try:
+            if fetched:
+                from src.api.order import kis_order
+
+                kis_present = kis_order.get_present_balance(
+                    natn_cd="000",
+                    tr_mket_cd="00",
+                    inqr_dvsn_cd="00",
+                    wcrc_frcr_dvsn_cd="02",
+                    mode=mode,
+                ) or {}
+            r1 = _extract_usd_krw_from_present(kis_present)
+            if r1.rate and r1.rate > 0:
+                _KIS_FAIL_CACHE.pop(mode, None)
+                _cache_set(cache_key, r1)
+                return r1
+        except Exception as e:
+            logger.warning(f"[FX] KIS 환율 추출 실패(무시하고 FDR 폴백): {e}")
+        if fetched:
+            _KIS_FAIL_CACHE[mode] = time.monotonic() + _KIS_FAIL_TTL_SEC
 
     # 2) FinanceDataReader
     r2 = _fetch_usd_krw_from_fdr()
@@ -144,7 +192,7 @@ def get_usd_krw_rate(
         return r2
 
     # 실패: 캐시하지 않고 그대로 반환(잠시 후 재시도 가능)
-    return FxRateResult(rate=None, source=f"{r1.source if 'r1' in locals() else 'kis_unknown'}+{r2.source}", fetched_at=datetime.now().isoformat(), error=(r2.error or (r1.error if 'r1' in locals() else None)))
+    return FxRateResult(rate=None, source=f"{r1.source if r1 is not None else ('kis_skipped' if skip_kis else 'kis_unknown')}+{r2.source}", fetched_at=datetime.now().isoformat(), error=(r2.error or (r1.error if r1 is not None else None)))
 
 
 def get_cached_usd_krw_rate(cache_key: str = "usd_krw") -> Optional[FxRateResult]:
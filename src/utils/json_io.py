@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    # 선택 의존성: 로컬 저장소(이력/보유기간) 직렬화/파싱 가속. 미설치 시 표준 json 사용(출력 포맷 동일)
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """obj -> UTF-8 JSON bytes (indent=True면 2칸 들여쓰기, 한글은 이스케이프하지 않음)"""
+    if _orjson is not None:
+        opt = _orjson.OPT_NON_STR_KEYS
+        if indent:
+            opt |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, option=opt)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
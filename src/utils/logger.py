@@ -1,15 +1,32 @@
+import atexit
 import json
 import logging
 import os
 import sys
+import threading
 from datetime import datetime
 
 _LOGGER_CACHE = {}
 _ENGINE_API_LOGGING_ENABLED = {}
 
+# 프로젝트 루트/로그 디렉터리는 프로세스 동안 변하지 않으므로 import 시 1회만 계산
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_LOG_DIR = os.path.join(_PROJECT_ROOT, "logs")
+# 이미 확인/생성한 디렉터리(호출마다 stat 하지 않음)
+_ENSURED_DIRS = set()
+
+# 엔진 API 로그(jsonl) 파일 핸들: mode -> (YYYYMMDD, file)
+# - 호출마다 open/close 하지 않고 큰 버퍼로 열어 둔 뒤, 로깅 OFF 전환/날짜 변경/프로세스 종료 시 flush
+_ENGINE_API_FILES = {}
+_ENGINE_API_LOCK = threading.Lock()
+_ENGINE_API_BUFFER = 128 * 1024
+
 def _ensure_dir(path: str):
+    if path in _ENSURED_DIRS:
+        return
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
+    _ENSURED_DIRS.add(path)
 
 def setup_logger(name=None, log_file: str | None = None):
     """로거 설정 및 반환
@@ -17,16 +34,12 @@ def setup_logger(name=None, log_file: str | None = None):
     - log_file 지정 시 해당 파일로 기록
     - 미지정 시 logs/system_YYYYMMDD.log
     """
-    # 프로젝트 루트 경로 찾기 (현재 파일 기준 상위 3단계)
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    LOG_DIR = os.path.join(PROJECT_ROOT, 'logs')
-    
-    _ensure_dir(LOG_DIR)
+    _ensure_dir(_LOG_DIR)
         
     # 로그 파일명 (날짜별)
     today = datetime.now().strftime("%Y%m%d")
     if log_file is None:
-        log_file = os.path.join(LOG_DIR, f"system_{today}.log")
+        log_file = os.path.join(_LOG_DIR, f"system_{today}.log")
     
     # 로거 생성
     logger = logging.getLogger(name if name else 'myKis')
@@ -73,13 +86,17 @@ def get_mode_logger(mode: str, source: str | None = None):
     mode = (mode or "unknown").strip().lower()
     cache_key = f"myKis.{mode}"
     if cache_key in _LOGGER_CACHE:
-        base = _LOGGER_CACHE[cache_key]
-        if source:
-            return _PrefixAdapter(base, {"prefix": f"[{mode.upper()}][{source.upper()}]"})
-        return base
+        if not source:
+            return _LOGGER_CACHE[cache_key]
+        # prefix 어댑터도 (mode, source)별로 재사용(호출마다 새로 만들지 않음)
+        adapter_key = f"{cache_key}|{source.upper()}"
+        adapter = _LOGGER_CACHE.get(adapter_key)
+        if adapter is None:
+            adapter = _PrefixAdapter(_LOGGER_CACHE[cache_key], {"prefix": f"[{mode.upper()}][{source.upper()}]"})
+            _LOGGER_CACHE[adapter_key] = adapter
+        return adapter
 
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    mode_dir = os.path.join(PROJECT_ROOT, "logs", mode)
+    mode_dir = os.path.join(_LOG_DIR, mode)
     _ensure_dir(mode_dir)
     today = datetime.now().strftime("%Y%m%d")
     log_file = os.path.join(mode_dir, f"system_{today}.log")
@@ -103,13 +120,19 @@ def log_engine_api(mode: str, payload: dict):
         mode = (mode or "unknown").strip().lower()
         if not _ENGINE_API_LOGGING_ENABLED.get(mode, False):
             return
-        PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        log_dir = os.path.join(PROJECT_ROOT, "logs", "api", mode)
-        _ensure_dir(log_dir)
+        line = json.dumps(payload or {}, ensure_ascii=False, default=str) + "\n"
         today = datetime.now().strftime("%Y%m%d")
-        log_file = os.path.join(log_dir, f"engine_{today}.jsonl")
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload or {}, ensure_ascii=False, default=str) + "\n")
+        with _ENGINE_API_LOCK:
+            cur = _ENGINE_API_FILES.get(mode)
+            if cur is None or cur[0] != today:
+                if cur is not None:
+                    cur[1].close()
+                log_dir = os.path.join(_LOG_DIR, "api", mode)
+                _ensure_dir(log_dir)
+                log_file = os.path.join(log_dir, f"engine_{today}.jsonl")
+                cur = (today, open(log_file, "a", encoding="utf-8", buffering=_ENGINE_API_BUFFER))
+                _ENGINE_API_FILES[mode] = cur
+            cur[1].write(line)
     except Exception:
         # 로깅 실패는 매매 실패로 간주하지 않음
         pass
@@ -122,6 +145,28 @@ def set_engine_api_logging(mode: str, enabled: bool) -> None:
     try:
         m = (mode or "unknown").strip().lower()
         _ENGINE_API_LOGGING_ENABLED[m] = bool(enabled)
+        if not enabled:
+            # 실행 구간이 끝나면 버퍼에 남은 기록을 파일로 내보낸다.
+            _flush_engine_api_files(m)
     except Exception:
         pass
 
+
+def _flush_engine_api_files(mode: str | None = None, close: bool = False) -> None:
+    with _ENGINE_API_LOCK:
+        for m in list(_ENGINE_API_FILES):
+            if mode is not None and m != mode:
+                continue
+            f = _ENGINE_API_FILES[m][1]
+            try:
+                if close:
+                    f.close()
+                    del _ENGINE_API_FILES[m]
+                else:
+                    f.flush()
+            except Exception:
+                pass
+
+
+atexit.register(_flush_engine_api_files, None, True)
+
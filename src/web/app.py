@@ -65,11 +65,13 @@ def _start_scheduler_console_reporter():
 
         # 최초 1회는 기준만 잡고 로그를 찍지 않는다(프로세스가 이미 실행 중인 경우 스팸 방지).
         initialized = {"mock": False, "real": False}
+        # 모드별 상태 저장소는 루프 밖에서 1회만 생성
+        stores = {m: SchedulerStateStore(mode=m) for m in ("mock", "real")}
 
         while True:
             try:
                 for m in ("mock", "real"):
-                    st = SchedulerStateStore(mode=m).read() or {}
+                    st = stores[m].read() or {}
                     pid = st.get("pid")
                     is_exec = bool(st.get("is_executing", False))
                     eng_last = st.get("engine_last_run_at")
@@ -727,23 +729,25 @@ def get_status():
         history_store = ExecutionHistoryStore(mode=mode)
         today = datetime.now().strftime("%Y%m%d")
         held_symbols = []
-        for s in stocks:
-            try:
-                sym = (s.get("ovrs_pdno") or "").strip().upper()
-                qty = int(float(s.get("ovrs_cblc_qty", 0) or 0))
-                exch = (s.get("ovrs_excg_cd") or "").strip().upper() or "NASD"
-                if sym and qty > 0:
-                    held_symbols.append(sym)
-                    store.upsert(symbol=sym, qty=qty, exchange=exch)
-            except Exception:
-                continue
+        # 종목별 갱신은 batch로 묶어 파일 저장을 1회로 줄인다.
+        with store.batch():
+            for s in stocks:
+                try:
+                    sym = (s.get("ovrs_pdno") or "").strip().upper()
+                    qty = int(float(s.get("ovrs_cblc_qty", 0) or 0))
+                    exch = (s.get("ovrs_excg_cd") or "").strip().upper() or "NASD"
+                    if sym and qty > 0:
+                        held_symbols.append(sym)
+                        store.upsert(symbol=sym, qty=qty, exchange=exch)
+                except Exception:
+                    continue
 
-        # 잔고에 없는 종목은 store에서도 정리(일시 누락 유예)
-        for sym in store.all_symbols():
-            if sym not in held_symbols:
-                miss = store.mark_missing(sym)
-                if miss >= 2:
-                    store.upsert(symbol=sym, qty=0)
+            # 잔고에 없는 종목은 store에서도 정리(일시 누락 유예)
+            for sym in store.all_symbols():
+                if sym not in held_symbols:
+                    miss = store.mark_missing(sym)
+                    if miss >= 2:
+                        store.upsert(symbol=sym, qty=0)
 
         if mode != "mock":
             # api_sync_day가 오늘이어도, open_date가 detect(임시값)로 남아있으면 다시 동기화한다.
@@ -864,61 +868,65 @@ def get_status():
 
                 if hist is not None:
                     updated_any = False
-                    for sym, d in last_buy_date.items():
-                        store.set_open_date(symbol=sym, open_date=d, source="api")
-                        updated_any = True
+                    with store.batch():
+                        for sym, d in last_buy_date.items():
+                            store.set_open_date(symbol=sym, open_date=d, source="api")
+                            updated_any = True
+                        # 동기화가 실제로 성공(업데이트 발생)했을 때만 api_sync_day 갱신
+                        if updated_any:
+                            store.set_api_sync_day(today)
+                        store.clear_api_retry()
                     last_buy_date_map = last_buy_date
                     if last_buy_date:
                         cache_dates.update(last_buy_date)
                         _write_last_buy_cache(cache_dates)
-                    # 동기화가 실제로 성공(업데이트 발생)했을 때만 api_sync_day 갱신
-                    if updated_any:
-                        store.set_api_sync_day(today)
-                    store.clear_api_retry()
                     # 일부 종목 누락 시 개별 조회로 보강 (페이지 제한/정렬 문제 대응)
                     missing = set(held_symbols) - set(last_buy_date.keys())
                     if missing:
-                        for sym in sorted(missing):
-                            fetched = None
-                            for lookback_days in (60, 30, 14):
-                                end = today
-                                start = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y%m%d")
-                                h2 = kis_order.get_order_history(
-                                    start_date=start,
-                                    end_date=end,
-                                    pdno=sym,
-                                    sll_buy_dvsn="02",
-                                    ccld_nccs_dvsn="01",
-                                    mode=mode,
-                                )
-                                if h2 is None:
-                                    continue
-                                r2 = h2.get("output") or h2.get("output1") or []
-                                r2 = r2 if isinstance(r2, list) else [r2]
-                                for rr in r2:
-                                    if not isinstance(rr, dict):
-                                        continue
-                                    d2 = _as_yyyymmdd(
-                                        rr.get("ccld_dt")
-                                        or rr.get("CCLD_DT")
-                                        or rr.get("ord_dt")
-                                        or rr.get("ORD_DT")
-                                        or rr.get("trad_day")
-                                        or rr.get("TRAD_DAY")
+                        # 종목별 보강 결과는 루프 종료 시 1회 저장
+                        with store.batch():
+                            for sym in sorted(missing):
+                                fetched = None
+                                for lookback_days in (60, 30, 14):
+                                    end = today
+                                    start = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y%m%d")
+                                    h2 = kis_order.get_order_history(
+                                        start_date=start,
+                                        end_date=end,
+                                        pdno=sym,
+                                        sll_buy_dvsn="02",
+                                        ccld_nccs_dvsn="01",
+                                        mode=mode,
                                     )
-                                    if d2 and ((fetched is None) or (d2 > fetched)):
-                                        fetched = d2
+                                    if h2 is None:
+                                        continue
+                                    r2 = h2.get("output") or h2.get("output1") or []
+                                    r2 = r2 if isinstance(r2, list) else [r2]
+                                    for rr in r2:
+                                        if not isinstance(rr, dict):
+                                            continue
+                                        d2 = _as_yyyymmdd(
+                                            rr.get("ccld_dt")
+                                            or rr.get("CCLD_DT")
+                                            or rr.get("ord_dt")
+                                            or rr.get("ORD_DT")
+                                            or rr.get("trad_day")
+                                            or rr.get("TRAD_DAY")
+                                        )
+                                        if d2 and ((fetched is None) or (d2 > fetched)):
+                                            fetched = d2
+                                    if fetched:
+                                        break
                                 if fetched:
-                                    break
-                            if fetched:
-                                store.set_open_date(symbol=sym, open_date=fetched, source="api")
-                                last_buy_date_map[sym] = fetched
-                                cache_dates[sym] = fetched
+                                    store.set_open_date(symbol=sym, open_date=fetched, source="api")
+                                    last_buy_date_map[sym] = fetched
+                                    cache_dates[sym] = fetched
                         if missing:
                             _write_last_buy_cache(cache_dates)
                 else:
-                    store.set_api_last_error("v1_007_failed")
-                    store.set_api_retry_at((datetime.now() + timedelta(minutes=20)).isoformat(timespec="seconds"))
+                    with store.batch():
+                        store.set_api_last_error("v1_007_failed")
+                        store.set_api_retry_at((datetime.now() + timedelta(minutes=20)).isoformat(timespec="seconds"))
         if (mode != "mock") and (not last_buy_date_map) and cache_dates:
             last_buy_date_map = cache_dates
 
@@ -1933,6 +1941,7 @@ def api_trade_preview():
             "status": "running",  # running|ready|error
             "analysis": None,
             "error": None,
+            "cancel_event": threading.Event(),  # /cancel 요청 시 분석 결과 폴링 중단
         }
 
         # 실시간 분석 실행은 오래 걸릴 수 있으므로 백그라운드에서 수행
@@ -1950,7 +1959,11 @@ def api_trade_preview():
                 except Exception:
                     pass
 
-                analysis = trading_engine.get_analysis_data()  # 실시간 분석(폴링)
+                cancel_event = item.get("cancel_event")
+                analysis = trading_engine.get_analysis_data(cancel_event=cancel_event)  # 실시간 분석(폴링)
+                if cancel_event is not None and cancel_event.is_set():
+                    # 취소된 미리보기는 이미 폐기됨
+                    return
 
                 # autokiwoomstock UX처럼: 미리보기에서 바로 이해할 수 있는 "뷰 데이터"를 생성
                 try:
@@ -2013,6 +2026,20 @@ def api_trade_preview_status(preview_id):
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+@app.route('/api/trade/preview/<preview_id>/cancel', methods=['POST'])
+def api_trade_preview_cancel(preview_id):
+    """미리보기 취소: 진행 중인 분석 결과 폴링을 중단하고 미리보기를 폐기"""
+    try:
+        item = _TRADE_PREVIEWS.pop(preview_id, None)
+        if not item:
+            return jsonify({"success": False, "message": "preview_not_found"})
+        cancel_event = item.get("cancel_event")
+        if cancel_event is not None:
+            cancel_event.set()
+        return jsonify({"success": True, "preview_id": preview_id})
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
 @app.route('/api/trade/execute', methods=['POST'])
 def api_trade_execute():
     """